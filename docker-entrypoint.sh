@@ -36,6 +36,11 @@ timeout 180s python3 scripts/fetch_all_stocks.py --search "삼성" --limit 1 --c
     echo "⚠️ 캐시 생성 실패 또는 타임아웃 (API에서 재시도됩니다)"
 }
 
+# 관심종목 시세 백그라운드 갱신 (장중 공유 캐시 미리 채움)
+echo "🔁 관심종목 시세 갱신 프로세스 시작..."
+mkdir -p /app/logs
+python3 scripts/quote_refresher.py >> /app/logs/quote_refresher.log 2>&1 &
+
 # 애플리케이션 시작
 echo "🚀 Stock Watchlist 애플리케이션 시작..."
 exec npm start
\ No newline at end of file
@@ -0,0 +1,24 @@
+-- CreateTable
+CREATE TABLE "public"."price_alerts" (
+    "id" TEXT NOT NULL,
+    "userId" TEXT NOT NULL,
+    "symbol" TEXT NOT NULL,
+    "direction" TEXT NOT NULL,
+    "threshold" DOUBLE PRECISION NOT NULL,
+    "armed" BOOLEAN NOT NULL DEFAULT true,
+    "triggeredAt" TIMESTAMP(3),
+    "triggeredPrice" DOUBLE PRECISION,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "price_alerts_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE INDEX "price_alerts_symbol_idx" ON "public"."price_alerts"("symbol");
+
+-- CreateIndex
+CREATE INDEX "price_alerts_updatedAt_idx" ON "public"."price_alerts"("updatedAt");
+
+-- AddForeignKey
+ALTER TABLE "public"."price_alerts" ADD CONSTRAINT "price_alerts_userId_fkey" FOREIGN KEY ("userId") REFERENCES "public"."users"("id") ON DELETE CASCADE ON UPDATE CASCADE;
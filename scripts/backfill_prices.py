@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+일별 시세 이력(stock_prices) 적재
+거래일마다 PyKRX 전체 종목 일괄 조회(또는 저장된 스냅샷)로 시세를 받아
+COPY FROM STDIN 으로 임시 테이블에 넣고 ON CONFLICT 로 본 테이블에 반영합니다.
+하루치씩 처리하므로 여러 해를 적재해도 메모리 사용량은 하루치 수준입니다.
+
+실행 예:
+  python3 scripts/backfill_prices.py --years 3     # 최근 3년 백필
+  python3 scripts/backfill_prices.py               # 마지막 적재일 이후 거래일만 추가
+"""
+
+import io
+import sys
+import json
+import argparse
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from market_hours import KST, MARKET_CLOSE
+from trading_calendar import (last_final_trading_day, previous_trading_day, trading_days_between,
+                              recent_trading_days)
+from market_snapshot import load_snapshot, fetch_market_snapshot, is_final
+from database import get_connection
+
+# 한 번의 COPY 로 보내는 최대 행 수
+BATCH_ROWS = 50000
+
+# stock_prices.volume 은 INTEGER 컬럼
+INT32_MAX = 2 ** 31 - 1
+
+STAGING_TABLE = 'stock_prices_staging'
+
+
+def price_timestamp(day):
+    """
+    거래일의 시세 시각 (장 마감, UTC naive - Prisma DateTime 저장 방식)
+    """
+    moment = datetime.strptime(day, '%Y%m%d').replace(
+        hour=MARKET_CLOSE.hour, minute=MARKET_CLOSE.minute, tzinfo=KST
+    )
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def load_day(day):
+    """
+    거래일 시세 컬럼. 종가 확정 후 저장된 스냅샷이 있으면 사용하고, 없거나 장중 스냅샷이면 OHLCV 만 일괄 조회합니다.
+    """
+    columns = load_snapshot(day)
+    if columns is None or not is_final(columns):
+        columns = fetch_market_snapshot(day, include_cap=False)
+        if not is_final(columns):
+            raise Exception(f"{day} 종가가 아직 확정되지 않았거나 일부 시장 조회에 실패했습니다.")
+    order = np.argsort(columns['symbol'])
+    return {name: columns[name][order] for name in ('symbol', 'close', 'volume', 'change_pct')}
+
+
+def day_rows(day, columns, previous=None):
+    """
+    하루치 시세를 COPY 텍스트 행으로 만듭니다.
+
+    등락은 직전 거래일 종가 기준이며, 직전 거래일 데이터가 없는 종목은 등락률로 역산합니다.
+    """
+    symbols = columns['symbol']
+    close = columns['close'].astype(np.float64)
+    change_pct = columns['change_pct'].astype(np.float64)
+
+    prev_close = np.full(len(symbols), np.nan)
+    if previous is not None and len(previous['symbol']):
+        pos = np.minimum(np.searchsorted(previous['symbol'], symbols), len(previous['symbol']) - 1)
+        found = previous['symbol'][pos] == symbols
+        prev_close[found] = previous['close'][pos[found]]
+    prev_close[~(prev_close > 0)] = np.nan
+
+    with np.errstate(all='ignore'):
+        derived = np.round(close / (1 + change_pct / 100))
+        prev_close = np.where(np.isnan(prev_close), derived, prev_close)
+        change = np.nan_to_num(close - prev_close)
+        change_pct = np.where(prev_close > 0, np.round(change / prev_close * 100, 2), np.nan_to_num(change_pct))
+
+    # 거래정지 종목(종가 0)은 적재하지 않음
+    valid = close > 0
+    volume = np.minimum(columns['volume'], INT32_MAX)
+    timestamp = price_timestamp(day).strftime('%Y-%m-%d %H:%M:%S')
+
+    for symbol, price, amount, pct, vol in zip(
+        symbols[valid].tolist(), close[valid].tolist(), change[valid].tolist(),
+        change_pct[valid].tolist(), volume[valid].tolist()
+    ):
+        # 재실행 시 같은 행이 되도록 id 를 종목+거래일로 고정
+        yield f"{symbol}-{day}\t{symbol}\t{price}\t{amount}\t{pct}\t{vol}\t{timestamp}\n"
+
+
+def copy_batch(conn, buffer):
+    """
+    버퍼의 행을 임시 테이블로 COPY 한 뒤 stock_prices 에 병합합니다.
+
+    Returns:
+        int: 반영된 행 수
+    """
+    buffer.seek(0)
+    with conn.cursor() as cursor:
+        cursor.execute(f'TRUNCATE {STAGING_TABLE}')
+        cursor.copy_expert(
+            f'COPY {STAGING_TABLE} (id, symbol, price, "changeAmount", "changePercent", volume, "timestamp") '
+            'FROM STDIN', buffer
+        )
+        cursor.execute(
+            f'INSERT INTO stock_prices (id, symbol, price, "changeAmount", "changePercent", volume, "timestamp") '
+            f'SELECT DISTINCT ON (symbol, "timestamp") id, symbol, price, "changeAmount", "changePercent", volume, "timestamp" '
+            f'FROM {STAGING_TABLE} '
+            'ON CONFLICT (symbol, "timestamp") DO UPDATE SET '
+            'price = EXCLUDED.price, "changeAmount" = EXCLUDED."changeAmount", '
+            '"changePercent" = EXCLUDED."changePercent", volume = EXCLUDED.volume'
+        )
+        count = cursor.rowcount
+    conn.commit()
+    return count
+
+
+def latest_loaded_day(conn):
+    """
+    stock_prices 에 적재된 마지막 거래일 (없으면 None)
+    """
+    with conn.cursor() as cursor:
+        cursor.execute('SELECT MAX("timestamp") FROM stock_prices')
+        latest = cursor.fetchone()[0]
+    if latest is None:
+        return None
+    return latest.replace(tzinfo=timezone.utc).astimezone(KST).strftime('%Y%m%d')
+
+
+def backfill(days, conn):
+    """
+    거래일 목록(오래된 순)을 하루씩 받아 BATCH_ROWS 단위로 적재합니다.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} '
+            '(LIKE stock_prices INCLUDING DEFAULTS)'
+        )
+
+    # 첫 거래일 등락 계산용 직전 거래일 종가
+    previous = None
+    try:
+        previous = load_day(previous_trading_day(days[0]))
+    except Exception as e:
+        print(f"직전 거래일 시세 없음, 등락률로 계산: {e}", file=sys.stderr)
+
+    buffer = io.StringIO()
+    pending = loaded = 0
+    skipped = []
+    for day in days:
+        try:
+            columns = load_day(day)
+        except Exception as e:
+            print(f"{day} 시세 조회 실패: {e}", file=sys.stderr)
+            skipped.append(day)
+            previous = None
+            continue
+
+        for row in day_rows(day, columns, previous):
+            buffer.write(row)
+            pending += 1
+        previous = columns
+
+        if pending >= BATCH_ROWS:
+            loaded += copy_batch(conn, buffer)
+            buffer = io.StringIO()
+            pending = 0
+            print(f"{day} 까지 {loaded:,}행 적재", file=sys.stderr)
+
+    if pending:
+        loaded += copy_batch(conn, buffer)
+
+    return {'rows': loaded, 'skipped': skipped}
+
+
+def resolve_days(conn, start=None, end=None, years=None):
+    """
+    적재할 거래일 목록. 기간 지정이 없으면 마지막 적재일부터 종가가 확정된 최근 거래일까지.
+
+    마지막 적재일도 다시 적재하므로, 그날 확정 전 시세가 들어갔더라도 ON CONFLICT 로 덮어씁니다.
+    """
+    final = last_final_trading_day()
+    end = min(end, final) if end else final
+    if start:
+        return trading_days_between(start, end)
+    if years:
+        start = (datetime.strptime(end, '%Y%m%d') - timedelta(days=365 * years)).strftime('%Y%m%d')
+        return trading_days_between(start, end)
+
+    latest = latest_loaded_day(conn)
+    if latest is None:
+        return recent_trading_days(1, end)
+    return [day for day in trading_days_between(latest, end) if day >= latest]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill or append daily prices into the stock_prices table')
+    parser.add_argument('--start', type=str, help='First trading date to load (YYYYMMDD)')
+    parser.add_argument('--end', type=str, help='Last trading date to load (YYYYMMDD), defaults to the last trading day')
+    parser.add_argument('--years', type=int, help='Load this many years back from --end')
+    args = parser.parse_args()
+
+    try:
+        conn = get_connection()
+        try:
+            days = resolve_days(conn, args.start, args.end, args.years)
+            stats = backfill(days, conn) if days else {'rows': 0, 'skipped': []}
+        finally:
+            conn.close()
+        result = {
+            'success': True,
+            'trading_days': len(days),
+            'first': days[0] if days else None,
+            'last': days[-1] if days else None,
+            **stats,
+            'timestamp': datetime.now().isoformat()
+        }
+    except Exception as e:
+        result = {'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if not result['success']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+검색/시세 스크립트 시작 시간 측정
+캐시로 응답하는 경로를 새 프로세스로 여러 번 실행해 첫 출력까지의 시간을 재고,
+-X importtime 으로 모듈별 import 시간을 모아 가장 무거운 항목을 보여줍니다.
+캐시 적중 경로에서 pykrx/pandas 가 불러와지면 실패로 표시합니다.
+
+실행 예:
+  python3 scripts/benchmark_startup.py --query 삼성전자
+  python3 scripts/benchmark_startup.py --symbol 005930 --runs 20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from datetime import datetime
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPTS_DIR)
+
+# 캐시 적중 검색의 시작 시간 목표 (밀리초, 중앙값 기준)
+STARTUP_BUDGET_MS = 60
+
+# 캐시 적중 경로에서 불러오면 안 되는 모듈
+HEAVY_MODULES = ('pykrx', 'pandas')
+
+
+def time_to_first_byte(command):
+    """
+    명령을 실행해 표준 출력 첫 바이트까지 걸린 시간(밀리초)
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=PROJECT_ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    process.stdout.read(1)
+    elapsed = (time.perf_counter() - started) * 1000
+    process.stdout.read()
+    process.wait()
+    return elapsed
+
+
+def import_report(command, top=15):
+    """
+    -X importtime 출력에서 누적 시간이 큰 최상위 import 와 무거운 모듈 로딩 여부를 구합니다.
+
+    Returns:
+        dict: {'total_ms', 'top': [{'module', 'cumulative_ms'}, ...], 'heavy': [모듈, ...]}
+    """
+    command = [command[0], '-X', 'importtime'] + command[1:]
+    completed = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True)
+
+    entries = []
+    heavy = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        module = name.rstrip()
+        depth = len(module) - len(module.lstrip())
+        module = module.strip()
+        if module.split('.')[0] in HEAVY_MODULES:
+            heavy.add(module.split('.')[0])
+        # 최상위 import (들여쓰기 1칸)만 합산
+        if depth <= 1:
+            entries.append({'module': module, 'cumulative_ms': round(int(cumulative_us) / 1000, 2)})
+
+    entries.sort(key=lambda entry: entry['cumulative_ms'], reverse=True)
+    return {
+        'total_ms': round(sum(entry['cumulative_ms'] for entry in entries), 2),
+        'top': entries[:top],
+        'heavy': sorted(heavy),
+    }
+
+
+def benchmark(command, runs):
+    timings = sorted(time_to_first_byte(command) for _ in range(runs))
+    return {
+        'command': ' '.join(command[1:]),
+        'runs': runs,
+        'median_ms': round(statistics.median(timings), 1),
+        'p90_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.9))], 1),
+        'min_ms': round(timings[0], 1),
+        'imports': import_report(command),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold-start latency and import time of the cached search and quote paths')
+    parser.add_argument('--query', '-q', type=str, default='삼성전자', help='Search query answered from the universe cache')
+    parser.add_argument('--symbol', '-s', type=str, help='Also measure a cached quote lookup for this symbol')
+    parser.add_argument('--cache', '-c', type=str, help='Universe cache file passed to fetch_all_stocks.py')
+    parser.add_argument('--runs', '-n', type=int, default=10, help='Process launches per command')
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET_MS, help='Median startup budget in milliseconds')
+    args = parser.parse_args()
+
+    commands = [[sys.executable, os.path.join(SCRIPTS_DIR, 'fetch_all_stocks.py'), '--search', args.query, '--limit', '10']]
+    if args.cache:
+        commands[0] += ['--cache', os.path.abspath(args.cache)]
+    if args.symbol:
+        commands.append([sys.executable, os.path.join(SCRIPTS_DIR, 'fetch_stock_data.py'), '--symbol', args.symbol])
+
+    results = [benchmark(command, max(1, args.runs)) for command in commands]
+    search = results[0]
+    within_budget = search['median_ms'] <= args.budget and not any(result['imports']['heavy'] for result in results)
+
+    print(json.dumps({
+        'success': within_budget,
+        'budget_ms': args.budget,
+        'results': results,
+        'timestamp': datetime.now().isoformat()
+    }, ensure_ascii=False, indent=2))
+    if not within_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
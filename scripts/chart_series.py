@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+차트용 가격 시계열
+1M/3M/1Y/5Y 구간의 종가/거래량을 반환하고, 목표 점 개수를 넘으면
+LTTB(Largest-Triangle-Three-Buckets)로 모양을 유지한 채 줄입니다.
+
+일봉은 사전 계산 행렬(precompute_stats.py)을 우선 사용하고,
+긴 구간은 PyKRX에서 한 번에 받아 일/주/월봉으로 묶어 공유 캐시에 저장합니다.
+"""
+
+import sys
+import json
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from shared_cache import get_shared_cache
+from market_hours import bar_expires_at
+from trading_calendar import last_trading_day, trading_day_window
+from precompute_stats import load_history
+from symbol_index import lookup_symbol
+
+CHART_NAMESPACE = 'chart_bars'
+
+# 확정된 봉은 바뀌지 않으므로 길게 보관
+FINAL_TTL = timedelta(days=7)
+
+# 구간: (거래일 수, 기본 봉 단위)
+RANGES = {
+    '1M': (21, 'D'),
+    '3M': (63, 'D'),
+    '1Y': (252, 'D'),
+    '5Y': (1260, 'W'),
+}
+INTERVALS = ('D', 'W', 'M')
+
+# 업스트림에서 한 번에 받아 캐시해 두는 최대 구간 (거래일)
+FULL_SPAN = RANGES['5Y'][0]
+
+DEFAULT_POINTS = 300
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링.
+
+    Args:
+        x, y (ndarray): 정렬된 좌표
+        threshold (int): 남길 점 개수 (3 이상)
+
+    Returns:
+        ndarray: 선택된 점의 인덱스 (오름차순, 첫/마지막 점 포함)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # 첫/마지막 점을 제외한 나머지를 threshold-2 개 버킷으로 나눔
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # 다음 버킷의 평균점 (마지막 버킷은 마지막 점)
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        # 직전 선택점, 후보점, 다음 버킷 평균점이 이루는 삼각형 넓이가 최대인 점
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def resample(bars, interval):
+    """
+    일봉 {'dates', 'close', 'volume'} 을 주봉('W') 또는 월봉('M')으로 묶습니다.
+
+    각 봉의 날짜/종가는 구간 마지막 거래일 값, 거래량은 구간 합계입니다.
+    """
+    if interval == 'D' or not bars['dates']:
+        return bars
+
+    days = np.array([datetime.strptime(day, '%Y%m%d') for day in bars['dates']], dtype='datetime64[D]')
+    if interval == 'W':
+        # 1970-01-01 은 목요일: 월요일 시작 주 번호
+        keys = (days.astype(np.int64) + 3) // 7
+    else:
+        keys = days.astype('datetime64[M]').astype(np.int64)
+
+    starts = np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1))
+    ends = np.append(starts[1:], len(keys)) - 1
+    dates = np.array(bars['dates'])
+    close = np.array(bars['close'], dtype=np.float64)
+    volume = np.array(bars['volume'], dtype=np.float64)
+    return {
+        'dates': dates[ends].tolist(),
+        'close': close[ends].tolist(),
+        'volume': np.add.reduceat(volume, starts).astype(np.int64).tolist(),
+    }
+
+
+def bars_from_history(symbol, count):
+    """
+    사전 계산 행렬에서 최근 count 거래일 일봉을 읽습니다. 행렬에 없거나 짧으면 None.
+    """
+    history = load_history()
+    if history is None or len(history['days']) < count:
+        return None
+    position = int(np.searchsorted(history['symbols'], symbol))
+    if position >= len(history['symbols']) or history['symbols'][position] != symbol:
+        return None
+
+    close = np.asarray(history['close'][position, -count:], dtype=np.float64)
+    volume = np.asarray(history['volume'][position, -count:], dtype=np.float64)
+    valid = ~np.isnan(close)
+    return {
+        'date': history['date'],
+        'dates': np.asarray(history['days'][-count:])[valid].tolist(),
+        'close': close[valid].tolist(),
+        'volume': np.nan_to_num(volume[valid]).astype(np.int64).tolist(),
+    }
+
+
+def fetch_daily_upstream(symbol, end):
+    """
+    PyKRX에서 FULL_SPAN 거래일 일봉을 한 번에 받습니다.
+    """
+    from pykrx import stock
+
+    start, _ = trading_day_window(FULL_SPAN, end)
+    indexed = lookup_symbol(symbol)
+    if indexed and indexed['type'] == 'ETF':
+        df = stock.get_etf_ohlcv_by_date(start, end, symbol)
+    else:
+        df = stock.get_market_ohlcv_by_date(start, end, symbol)
+    if df is None or df.empty:
+        raise Exception(f"종목 {symbol}의 주가 데이터를 찾을 수 없습니다.")
+
+    df = df[df['종가'] > 0]
+    return {
+        'dates': df.index.strftime('%Y%m%d').tolist(),
+        'close': df['종가'].astype(float).tolist(),
+        'volume': df['거래량'].astype('int64').tolist(),
+    }
+
+
+def load_bars(symbol, interval, end):
+    """
+    FULL_SPAN 구간의 일/주/월봉. 캐시에 없으면 일봉을 한 번 받아 세 단위 모두 저장합니다.
+    """
+    cache = get_shared_cache()
+    key = f"{symbol}:{interval}:{end}"
+    try:
+        cached = cache.get(CHART_NAMESPACE, key)
+    except Exception as e:
+        print(f"차트 캐시 조회 실패: {e}", file=sys.stderr)
+        cached = None
+    if cached is not None:
+        return cached
+
+    daily = fetch_daily_upstream(symbol, end)
+    series = {unit: resample(daily, unit) for unit in INTERVALS}
+    try:
+        cache.set_many(
+            CHART_NAMESPACE,
+            {f"{symbol}:{unit}:{end}": bars for unit, bars in series.items()},
+            bar_expires_at(end, FINAL_TTL)
+        )
+    except Exception as e:
+        print(f"차트 캐시 저장 실패: {e}", file=sys.stderr)
+    return series[interval]
+
+
+def downsample(bars, points):
+    """
+    종가 모양은 LTTB 로 유지하고, 거래량은 선택된 점 사이 구간 합계로 보존합니다.
+    """
+    count = len(bars['dates'])
+    if count <= points:
+        return bars
+
+    index = lttb(np.arange(count), bars['close'], points)
+    volume = np.array(bars['volume'], dtype=np.int64)
+    starts = np.concatenate(([0], index[:-1] + 1))
+    return {
+        'dates': np.array(bars['dates'])[index].tolist(),
+        'close': np.array(bars['close'], dtype=np.float64)[index].tolist(),
+        'volume': np.add.reduceat(volume, starts).tolist(),
+    }
+
+
+def get_chart_series(symbol, range_key='1Y', interval=None, points=DEFAULT_POINTS):
+    """
+    차트용 시계열을 반환합니다.
+
+    Args:
+        symbol (str): 종목코드
+        range_key (str): '1M', '3M', '1Y', '5Y'
+        interval (str): 'D', 'W', 'M' (기본: 구간별 기본 단위)
+        points (int): 최대 점 개수 (초과하면 LTTB 다운샘플링)
+
+    Returns:
+        dict: {'symbol', 'range', 'interval', 'date', 'total', 'dates', 'close', 'volume'}
+    """
+    if range_key not in RANGES:
+        raise ValueError(f"지원하지 않는 구간입니다: {range_key}")
+    count, default_interval = RANGES[range_key]
+    interval = interval or default_interval
+    if interval not in INTERVALS:
+        raise ValueError(f"지원하지 않는 봉 단위입니다: {interval}")
+
+    # 1년 이내 일봉은 사전 계산 행렬에서 바로 읽음
+    bars = bars_from_history(symbol, count) if interval == 'D' else None
+    if bars is not None:
+        date = bars.pop('date')
+    else:
+        date = last_trading_day()
+        bars = load_bars(symbol, interval, date)
+        if bars['dates']:
+            start, _ = trading_day_window(count, date)
+            first = int(np.searchsorted(np.array(bars['dates']), start))
+            bars = {name: values[first:] for name, values in bars.items()}
+
+    total = len(bars['dates'])
+    bars = downsample(bars, max(int(points), 3))
+    return {
+        'symbol': symbol,
+        'range': range_key,
+        'interval': interval,
+        'date': date,
+        'total': total,
+        **bars
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chart-ready close/volume series with LTTB downsampling')
+    parser.add_argument('--symbol', '-s', type=str, required=True, help='Stock symbol (e.g., 005930)')
+    parser.add_argument('--range', '-r', type=str, default='1Y', choices=list(RANGES), help='Range')
+    parser.add_argument('--interval', '-i', type=str, choices=list(INTERVALS), help='Bar interval')
+    parser.add_argument('--points', '-p', type=int, default=DEFAULT_POINTS, help='Maximum number of points')
+    args = parser.parse_args()
+
+    try:
+        series = get_chart_series(args.symbol, args.range, args.interval, args.points)
+        output = {'success': True, 'data': series, 'timestamp': datetime.now().isoformat()}
+    except Exception as e:
+        output = {'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}
+    print(json.dumps(output, ensure_ascii=False))
+    if not output['success']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
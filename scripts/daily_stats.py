@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+일별 종목 통계 조회
+precompute_stats.py 가 미리 계산해 둔 52주 최고/최저, 평균 거래량 등을
+공유 캐시에서 종목코드로 바로 읽습니다. (NumPy/PyKRX 불필요)
+"""
+
+import sys
+
+from shared_cache import get_shared_cache
+
+DAILY_STATS_NAMESPACE = 'daily_stats'
+
+# 52주 = 252거래일, 거래량 평균 = 최근 30일(약 21거래일)
+YEAR_TRADING_DAYS = 252
+VOLUME_TRADING_DAYS = 21
+
+
+def get_daily_stats(symbol):
+    """
+    종목의 최신 일별 통계를 반환합니다. 없으면 None.
+    """
+    try:
+        return get_shared_cache().get(DAILY_STATS_NAMESPACE, symbol)
+    except Exception as e:
+        print(f"일별 통계 조회 실패: {e}", file=sys.stderr)
+        return None
+
+
+def get_daily_stats_many(symbols):
+    """
+    여러 종목의 일별 통계를 {종목코드: 통계} 로 반환합니다.
+    """
+    try:
+        return get_shared_cache().get_many(DAILY_STATS_NAMESPACE, symbols)
+    except Exception as e:
+        print(f"일별 통계 조회 실패: {e}", file=sys.stderr)
+        return {}
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL 연결 (Prisma 와 같은 DATABASE_URL 사용)
+"""
+
+import os
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv('.env.local')
+except ImportError:
+    pass
+
+# Prisma 전용 URL 파라미터 (libpq 가 모르는 옵션)
+PRISMA_ONLY_PARAMS = ('schema', 'connection_limit', 'pool_timeout', 'pgbouncer', 'socket_timeout')
+
+
+def get_database_url():
+    """
+    DATABASE_URL 에서 Prisma 전용 파라미터를 제거한 libpq 용 URL
+    """
+    url = os.getenv('DATABASE_URL')
+    if not url:
+        raise Exception('DATABASE_URL 환경변수가 필요합니다.')
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key not in PRISMA_ONLY_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def get_connection():
+    """
+    psycopg2 연결을 엽니다.
+    """
+    import psycopg2
+    return psycopg2.connect(get_database_url())
+
+
+def get_watched_symbols(conn):
+    """
+    모든 사용자의 관심종목을 종목별 관심 사용자 수와 함께 반환합니다.
+
+    Returns:
+        list: [(종목코드, 관심 사용자 수), ...] 사용자 수 내림차순
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(
+            'SELECT symbol, COUNT(*) AS watchers FROM watchlists '
+            'GROUP BY symbol ORDER BY watchers DESC, symbol'
+        )
+        return [(symbol, int(watchers)) for symbol, watchers in cursor.fetchall()]
+
+
+def get_user_watchlist(conn, user):
+    """
+    사용자 한 명의 관심종목을 화면 순서대로 반환합니다.
+
+    Args:
+        user (str): 사용자 ID 또는 이메일
+
+    Returns:
+        list: [(종목코드, 종목명), ...] order 오름차순
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(
+            'SELECT w.symbol, w.name FROM watchlists w JOIN users u ON u.id = w."userId" '
+            'WHERE u.id = %s OR u.email = %s ORDER BY w."order", w."createdAt"',
+            (user, user)
+        )
+        return cursor.fetchall()
@@ -4,137 +4,163 @@ PyKRX를 활용한 완전한 한국 주식 검색 시스템
 모든 KOSPI, KOSDAQ 종목 (2,700개+) 지원
 """
 
-from pykrx import stock
 import json
+import os
 import sys
 import argparse
+import heapq
+import fcntl
+from bisect import bisect_right
+import subprocess
 from datetime import datetime, timedelta
 import re
 
-def get_all_korean_stocks():
+from trading_calendar import last_trading_day
+from symbol_index import STOCK_MARKETS, build_symbol_index, is_index_stale
+from universe_cache import (UNIVERSE_MARKETS, BuildJournal, write_shards, write_group_index, load_universe,
+                            manifest_timestamps, manifest_retry_after, parse_timestamp)
+import search_index
+from search_index import (SEARCH_INDEX_PATH, SEARCH_RANKS_PATH, build_search_index, key_search, fuzzy_search,
+                          load_search_ranks)
+from shared_cache import CACHE_DIR
+
+# 이 기간이 지난 캐시는 그대로 응답하면서 백그라운드에서 다시 만듦 (일)
+UNIVERSE_MAX_AGE_DAYS = 7
+
+# 전체 종목 재생성 잠금 (한 번에 하나만 실행) 과 백그라운드 실행 로그
+REBUILD_LOCK_PATH = os.path.join(CACHE_DIR, 'universe_rebuild.lock')
+REBUILD_LOG_PATH = os.path.join(CACHE_DIR, 'universe_rebuild.log')
+
+# 수집 중간 결과 기록 (거래일별, 중단 후 다시 실행하면 이어서 수집)
+BUILD_JOURNAL_DIR = os.path.join(CACHE_DIR, 'universe_journal')
+
+# 배치 모드에서 캐시/인덱스 파일 변경을 확인하는 간격 (초)
+RELOAD_CHECK_INTERVAL = 5
+
+# 조회에 실패한 선택 시장을 다시 시도하기까지 기다리는 시간 (시간)
+FAILED_MARKET_RETRY_HOURS = 6
+
+# 배치 모드에서 시장별 캐시 기간 경과를 다시 확인하는 간격 (초)
+STALE_CHECK_INTERVAL = 60
+
+# 배치 요청 한 건의 최대 결과 수
+MAX_BATCH_LIMIT = 100
+
+# 시장별 종목 목록/이름 조회 함수 (pykrx.stock 속성명)와 실패해도 계속 진행할지 여부
+LISTING_SOURCES = {
+    'KOSPI': ('get_market_ticker_list', 'get_market_ticker_name', False),
+    'KOSDAQ': ('get_market_ticker_list', 'get_market_ticker_name', False),
+    'KONEX': ('get_market_ticker_list', 'get_market_ticker_name', True),
+    'ETF': ('get_etf_ticker_list', 'get_etf_ticker_name', True),
+    'ETN': ('get_etn_ticker_list', 'get_etn_ticker_name', True),
+    'INDEX': ('get_index_ticker_list', 'get_index_ticker_name', True),
+}
+
+def fetch_market_sectors(stock, market, date):
     """
-    전체 한국 상장 종목을 가져옵니다.
-    
-    Returns:
-        dict: 전체 종목 정보
+    주식 시장의 종목별 KRX 업종명을 한 번에 가져옵니다. 실패하면 빈 dict (업종 없이 진행)
     """
     try:
-        print("PyKRX를 통해 전체 종목 정보를 가져오는 중...", file=sys.stderr)
-        
-        # 오늘 날짜로 종목 리스트 가져오기
-        today = datetime.now().strftime('%Y%m%d')
-        
-        # KOSPI 종목
-        kospi_tickers = stock.get_market_ticker_list(today, market='KOSPI')
-        print(f"KOSPI 종목: {len(kospi_tickers)}개", file=sys.stderr)
-        
-        # KOSDAQ 종목
-        kosdaq_tickers = stock.get_market_ticker_list(today, market='KOSDAQ')
-        print(f"KOSDAQ 종목: {len(kosdaq_tickers)}개", file=sys.stderr)
-        
-        # KONEX 종목
-        konex_tickers = []
+        df = stock.get_market_sector_classifications(date, market)
+        return dict(zip(df.index.astype(str), df['업종명'].astype(str)))
+    except Exception as e:
+        print(f"{market} 업종 조회 실패: {e}", file=sys.stderr)
+        return {}
+
+def fetch_market_listing(stock, market, date, journal=None):
+    """
+    한 시장의 종목 목록과 이름을 가져와 종목 정보 리스트로 만듭니다.
+    journal 에 이미 기록된 종목은 이름을 다시 조회하지 않고, 새로 조회한 종목은 기록합니다.
+    """
+    list_name, name_name, _ = LISTING_SOURCES[market]
+    if market in STOCK_MARKETS:
+        tickers = getattr(stock, list_name)(date, market=market)
+    elif market == 'INDEX':
+        tickers = getattr(stock, list_name)()
+    else:
+        tickers = getattr(stock, list_name)(date)
+    print(f"{market} 종목: {len(tickers)}개", file=sys.stderr)
+    sectors = fetch_market_sectors(stock, market, date) if market in STOCK_MARKETS else {}
+
+    get_name = getattr(stock, name_name)
+    stocks = []
+    resumed = 0
+    for ticker in tickers:
+        if journal is not None:
+            recorded, name = journal.get(market, ticker)
+            if recorded:
+                resumed += 1
+                if name:
+                    stocks.append(create_stock_info(ticker, name, market, sectors.get(ticker)))
+                continue
         try:
-            konex_tickers = stock.get_market_ticker_list(today, market='KONEX')
-            print(f"KONEX 종목: {len(konex_tickers)}개", file=sys.stderr)
+            name = get_name(ticker)
         except:
-            pass
+            # 조회 실패는 기록하지 않음 (다음 실행에서 다시 시도)
+            continue
+        name = name if name and name != 'N/A' else None
+        if journal is not None:
+            journal.record(market, ticker, name)
+        if name:
+            stocks.append(create_stock_info(ticker, name, market, sectors.get(ticker)))
+    if resumed:
+        print(f"{market} 이전 수집 기록에서 {resumed}개 재사용", file=sys.stderr)
+    return stocks
+
+def get_all_korean_stocks(markets=None):
+    """
+    한국 상장 종목을 시장별로 가져옵니다.
+    이름을 확인한 종목은 바로 BUILD_JOURNAL_DIR 에 기록하므로, 중간에 실패해도
+    같은 거래일에 다시 실행하면 기록된 종목은 건너뛰고 이어서 수집합니다.
+
+    Args:
+        markets (list): 가져올 시장 (기본: UNIVERSE_MARKETS 전체)
+
+    Returns:
+        dict: {'success', 'timestamp', 'trading_date', 'markets': {시장: [종목 정보, ...]}, 'failed': [시장, ...],
+               'data': 전체 리스트, ...}
+              조회에 실패한 선택 시장(KONEX/ETF/ETN/INDEX)은 markets 에서 빠지고 failed 에 담깁니다.
+    """
+    try:
+        # pykrx(pandas 포함)는 로딩이 무거워 캐시로 검색하는 경로에서는 불러오지 않음
+        from pykrx import stock
+
+        print("PyKRX를 통해 전체 종목 정보를 가져오는 중...", file=sys.stderr)
         
-        # ETF 전체 (1,020개)
-        etf_tickers = []
-        try:
-            etf_tickers = stock.get_etf_ticker_list(today)
-            print(f"ETF 종목: {len(etf_tickers)}개", file=sys.stderr)
-        except:
-            print("ETF 조회 실패", file=sys.stderr)
+        # 최근 거래일 기준으로 종목 리스트 가져오기 (주말/휴장일에도 빈 목록이 나오지 않도록)
+        today = last_trading_day()
         
-        # ETN 전체 (390개)
-        etn_tickers = []
-        try:
-            etn_tickers = stock.get_etn_ticker_list(today)
-            print(f"ETN 종목: {len(etn_tickers)}개", file=sys.stderr)
-        except:
-            print("ETN 조회 실패", file=sys.stderr)
+        # 같은 거래일에 중단된 수집이 있으면 이어서 진행
+        journal = BuildJournal(BUILD_JOURNAL_DIR, today)
+        if journal.load():
+            print(f"{today} 수집 기록 {len(journal.resolved)}개에서 이어서 수집", file=sys.stderr)
         
-        # 지수 전체 (49개)
-        index_tickers = []
+        by_market = {}
+        failed = []
         try:
-            index_tickers = stock.get_index_ticker_list()
-            print(f"지수: {len(index_tickers)}개", file=sys.stderr)
-        except:
-            print("지수 조회 실패", file=sys.stderr)
-        
-        # 전체 종목 정보 생성
-        all_stocks = []
-        
-        # KOSPI 종목 처리
-        for ticker in kospi_tickers:
-            try:
-                name = stock.get_market_ticker_name(ticker)
-                if name and name != 'N/A':
-                    stock_info = create_stock_info(ticker, name, 'KOSPI')
-                    all_stocks.append(stock_info)
-            except:
-                continue
-                
-        # KOSDAQ 종목 처리
-        for ticker in kosdaq_tickers:
-            try:
-                name = stock.get_market_ticker_name(ticker)
-                if name and name != 'N/A':
-                    stock_info = create_stock_info(ticker, name, 'KOSDAQ')
-                    all_stocks.append(stock_info)
-            except:
-                continue
-        
-        # KONEX 종목 처리
-        for ticker in konex_tickers:
-            try:
-                name = stock.get_market_ticker_name(ticker)
-                if name and name != 'N/A':
-                    stock_info = create_stock_info(ticker, name, 'KONEX')
-                    all_stocks.append(stock_info)
-            except:
-                continue
-        
-        # ETF 전체 처리
-        for ticker in etf_tickers:
-            try:
-                name = stock.get_etf_ticker_name(ticker)
-                if name and name != 'N/A':
-                    stock_info = create_stock_info(ticker, name, 'ETF')
-                    all_stocks.append(stock_info)
-            except:
-                continue
-        
-        # ETN 전체 처리
-        for ticker in etn_tickers:
-            try:
-                name = stock.get_etn_ticker_name(ticker)
-                if name and name != 'N/A':
-                    stock_info = create_stock_info(ticker, name, 'ETN')
-                    all_stocks.append(stock_info)
-            except:
-                continue
-        
-        # 지수 처리
-        for ticker in index_tickers:
-            try:
-                name = stock.get_index_ticker_name(ticker)
-                if name and name != 'N/A':
-                    stock_info = create_stock_info(ticker, name, 'INDEX')
-                    all_stocks.append(stock_info)
-            except:
-                continue
+            for market in markets or UNIVERSE_MARKETS:
+                try:
+                    by_market[market] = fetch_market_listing(stock, market, today, journal)
+                except Exception as e:
+                    if not LISTING_SOURCES[market][2]:
+                        raise
+                    print(f"{market} 조회 실패: {e}", file=sys.stderr)
+                    failed.append(market)
+        finally:
+            journal.close()
         
+        all_stocks = [item for stocks in by_market.values() for item in stocks]
         print(f"총 {len(all_stocks)}개 종목 수집 완료", file=sys.stderr)
         
         return {
             'success': True,
             'timestamp': datetime.now().isoformat(),
+            'trading_date': today,
             'total_count': len(all_stocks),
-            'kospi_count': len(kospi_tickers),
-            'kosdaq_count': len(kosdaq_tickers),
+            'kospi_count': len(by_market.get('KOSPI', [])),
+            'kosdaq_count': len(by_market.get('KOSDAQ', [])),
+            'markets': by_market,
+            'failed': failed,
             'data': all_stocks
         }
         
@@ -145,9 +171,12 @@ def get_all_korean_stocks():
             'timestamp': datetime.now().isoformat()
         }
 
-def create_stock_info(ticker, name, market):
+def create_stock_info(ticker, name, market, sector=None):
     """
     종목 정보 객체 생성
+
+    Args:
+        sector (str): KRX 업종명 (주식만, 없으면 생략)
     """
     # 검색용 키워드 생성
     search_keywords = [name]
@@ -155,6 +184,10 @@ def create_stock_info(ticker, name, market):
     # 자주 사용되는 키워드 추출
     keywords = []
     
+    # 섹터/테마/그룹 집계용 분류 (group_index.py)
+    themes = []
+    groups = []
+    
     # ETF/ETN 특별 처리
     if market in ['ETF', 'ETN']:
         # ETF/ETN 브랜드명 추가
@@ -172,7 +205,7 @@ def create_stock_info(ticker, name, market):
             keywords.extend(['bnk', 'BNK'])
             
         # ETF/ETN 섹터/테마 키워드 추가
-        themes = {
+        etf_themes = {
             '반도체': ['반도체', 'semiconductor', '칩', 'chip'],
             '자동차': ['자동차', 'auto', 'automotive', '전기차'],
             '2차전지': ['2차전지', '배터리', 'battery', '전기차'],
@@ -192,9 +225,10 @@ def create_stock_info(ticker, name, market):
             '채권': ['채권', 'bond', 'treasury']
         }
         
-        for theme, theme_keywords in themes.items():
+        for theme, theme_keywords in etf_themes.items():
             if theme in name:
                 keywords.extend(theme_keywords)
+                themes.append(theme)
     
     # 지수 특별 처리
     elif market == 'INDEX':
@@ -228,24 +262,33 @@ def create_stock_info(ticker, name, market):
     for group_name, group_keywords in major_groups.items():
         if group_name in name:
             keywords.extend(group_keywords)
+            groups.append(group_name)
     
     # 업종별 키워드
     if any(word in name for word in ['바이오', '제약', '약품']):
         keywords.extend(['바이오', 'bio'])
+        themes.append('바이오')
     if any(word in name for word in ['게임', '엔터']):
         keywords.extend(['게임', 'game'])
+        themes.append('게임')
     if any(word in name for word in ['화학', '케미칼']):
         keywords.extend(['화학', 'chemical'])
+        themes.append('화학')
     if any(word in name for word in ['건설', '건설']):
         keywords.extend(['건설', 'construction'])
+        themes.append('건설')
     if any(word in name for word in ['전자', '반도체']):
         keywords.extend(['전자', 'electronics'])
+        themes.append('전자')
     if any(word in name for word in ['은행', '금융', '보험']):
         keywords.extend(['금융', 'finance', '은행', '보험'])
+        themes.append('금융')
     if any(word in name for word in ['통신', '텔레콤']):
         keywords.extend(['통신', 'telecom'])
+        themes.append('통신')
     if any(word in name for word in ['자동차', '모비스']):
         keywords.extend(['자동차', 'auto'])
+        themes.append('자동차')
     
     search_keywords.extend(keywords)
     
@@ -258,157 +301,523 @@ def create_stock_info(ticker, name, market):
     # 중복 제거
     search_keywords = list(set(search_keywords))
     
-    return {
+    stock_info = {
         'symbol': ticker,
         'name': name,
         'market': market,
         'search_keywords': search_keywords
     }
+    if sector:
+        stock_info['sector'] = sector
+    if themes:
+        stock_info['themes'] = list(dict.fromkeys(themes))
+    if groups:
+        stock_info['groups'] = groups
+    return stock_info
+
+def normalize_text(text):
+    return text.lower().replace(' ', '')
+
+def score_stock(query, normalized_query, entry):
+    """
+    종목 하나의 검색 점수 (0 이면 불일치)
+
+    Args:
+        entry (tuple): rank_universe() 의 (종목코드, 정규화된 이름, 정규화된 키워드 집합, 키워드 연결 문자열, 종목 정보)
+    """
+    symbol, normalized_name, keywords, keyword_text, _ = entry
+    score = 0
+
+    # 1. Symbol Match
+    if query == symbol:
+        return 100
+    elif query in symbol:
+        score = 90
+
+    # 2. Name Match
+    if normalized_query == normalized_name:
+        score = max(score, 85)
+    elif normalized_name.startswith(normalized_query):
+        score = max(score, 80)
+    elif normalized_query in normalized_name:
+        score = max(score, 70)
+
+    # 3. Keyword Match
+    if score < 75:
+        if normalized_query in keywords:
+            score = 75
+        elif normalized_query in keyword_text:
+            score = max(score, 65)
 
-def search_stocks(query, stocks_data, limit=20):
-    if not query or not stocks_data:
+    return score
+
+def _haystack(parts):
+    """
+    문자열들을 '\\0' 으로 이어 붙인 문자열과 각 문자열의 시작 위치
+    """
+    starts = []
+    offset = 0
+    for part in parts:
+        starts.append(offset)
+        offset += len(part) + 1
+    return '\0'.join(parts), starts
+
+def _find_positions(haystack, needle):
+    """
+    needle 을 포함하는 항목의 순위 집합 (str.find 로 C 수준에서 훑음)
+    """
+    text, starts = haystack
+    found = set()
+    index = text.find(needle)
+    while index != -1:
+        position = bisect_right(starts, index) - 1
+        found.add(position)
+        # 같은 항목 안의 다음 일치는 건너뜀
+        index = text.find(needle, starts[position + 1]) if position + 1 < len(starts) else -1
+    return found
+
+# {id(종목 리스트): (종목 리스트, 검색 구조)} - 전체 및 시장별 리스트를 함께 보관
+_ranked_universes = {}
+MAX_RANKED_UNIVERSES = 16
+
+def rank_universe(stocks_data):
+    """
+    종목 리스트를 인기 점수 내림차순으로 정렬하고 검색용 구조를 미리 만들어 둡니다.
+    (종목코드 중복 제거, 같은 리스트는 재사용)
+
+    Returns:
+        dict: {'entries': 검색 항목 리스트, 'positions': {종목코드: 순위},
+               'terms': {정규화된 이름/키워드: 순위 집합}, 'symbol_text'/'name_text'/'keyword_text': 연결 문자열}
+    """
+    cached = _ranked_universes.get(id(stocks_data))
+    if cached is not None and cached[0] is stocks_data:
+        return cached[1]
+
+    ranks = load_search_ranks()
+    unique = {}
+    for stock_info in stocks_data:
+        unique.setdefault(stock_info['symbol'], stock_info)
+
+    entries = []
+    terms = {}
+    for position, stock_info in enumerate(sorted(unique.values(), key=lambda item: -ranks.get(item['symbol'], 0.0))):
+        name = normalize_text(stock_info['name'])
+        keywords = [normalize_text(keyword) for keyword in stock_info.get('search_keywords', [])]
+        # 키워드 경계를 넘는 부분 일치가 생기지 않도록 질의에 나올 수 없는 문자로 연결
+        entries.append((stock_info['symbol'], name, frozenset(keywords), '\0'.join(keywords), stock_info))
+        for term in [name] + keywords:
+            terms.setdefault(term, set()).add(position)
+
+    universe = {
+        'entries': entries,
+        'positions': {entry[0]: position for position, entry in enumerate(entries)},
+        'terms': terms,
+        'symbol_text': _haystack([entry[0] for entry in entries]),
+        'name_text': _haystack([entry[1] for entry in entries]),
+        'keyword_text': _haystack([entry[3] for entry in entries]),
+    }
+    if len(_ranked_universes) >= MAX_RANKED_UNIVERSES:
+        _ranked_universes.clear()
+    _ranked_universes[id(stocks_data)] = (stocks_data, universe)
+    return universe
+
+def search_stocks(query, stocks_data, limit=20, market=None):
+    """
+    점수(일치 유형) 내림차순, 같은 점수는 인기 점수 순으로 상위 limit 개를 반환합니다.
+
+    종목코드/이름/키워드를 각각 이어 붙인 문자열에서 질의가 들어 있는 종목만 후보로 뽑고,
+    후보를 인기 순으로 보면서 크기 limit 의 힙만 유지합니다. 정확 일치를 먼저 넣어 두므로
+    남은 후보가 얻을 수 있는 최고 점수 이상인 결과가 limit 개 모이면 바로 멈춥니다.
+
+    Args:
+        market (str): 지정하면 해당 시장 종목만
+    """
+    if not query or not stocks_data or limit <= 0:
         return []
 
-    query = query.lower().strip()
+    query = query.lower().strip().replace('\0', '')
     normalized_query = query.replace(' ', '')
+    if not normalized_query:
+        return []
+    universe = rank_universe(stocks_data)
+    entries = universe['entries']
+
+    heap = []
+    def offer(position):
+        entry = entries[position]
+        if market and entry[4]['market'] != market:
+            return
+        score = score_stock(query, normalized_query, entry)
+        if score == 0:
+            return
+        item = (score, -position)
+        if len(heap) < limit:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    # 정확 일치(종목코드/이름/키워드)는 순위와 관계없이 먼저 반영
+    exact = set(universe['terms'].get(normalized_query, ()))
+    if query in universe['positions']:
+        exact.add(universe['positions'][query])
+    for position in exact:
+        offer(position)
+
+    symbol_hits = _find_positions(universe['symbol_text'], query)
+    candidates = (symbol_hits | _find_positions(universe['name_text'], normalized_query)
+                  | _find_positions(universe['keyword_text'], normalized_query)) - exact
+    ceiling = 90 if symbol_hits - exact else 80
+    for position in sorted(candidates):
+        if len(heap) == limit and heap[0][0] >= ceiling:
+            break
+        offer(position)
+
     results = []
+    for _, negative_position in sorted(heap, reverse=True):
+        stock_info = entries[-negative_position][4]
+        results.append({
+            'symbol': stock_info['symbol'],
+            'name': stock_info['name'],
+            'market': stock_info['market']
+        })
+    return results
 
-    for stock_info in stocks_data:
-        score = 0
-        match_type = None
-
-        # 1. Symbol Match
-        if query == stock_info['symbol']:
-            score = 100
-            match_type = 'symbol_exact'
-        elif query in stock_info['symbol']:
-            score = max(score, 90)
-            match_type = 'symbol_partial'
-
-        # 2. Name Match
-        normalized_name = stock_info['name'].lower().replace(' ', '')
-        if normalized_query == normalized_name:
-            score = max(score, 85)
-            match_type = 'name_exact'
-        elif normalized_name.startswith(normalized_query):
-            score = max(score, 80)
-            match_type = 'name_start'
-        elif normalized_query in normalized_name:
-            score = max(score, 70)
-            match_type = 'name_partial'
-
-        # 3. Keyword Match
-        for keyword in stock_info.get('search_keywords', []):
-            normalized_keyword = keyword.lower().replace(' ', '')
-            if normalized_query == normalized_keyword:
-                score = max(score, 75)
-                match_type = 'keyword_exact'
-                break 
-            elif normalized_query in normalized_keyword:
-                score = max(score, 65)
-                match_type = 'keyword_partial'
-        
-        if score > 0:
-            results.append({
-                'symbol': stock_info['symbol'],
-                'name': stock_info['name'],
-                'market': stock_info['market'],
-                'score': score,
-                'match_type': match_type
-            })
-
-    # Sort and filter for uniqueness
-    results.sort(key=lambda x: x['score'], reverse=True)
+def find_stocks(query, stocks_data, limit=20, market=None):
+    """
+    정확/부분 일치 검색 후 결과가 limit 보다 적으면
+    초성/로마자 키 검색, 그다음 오타 허용 검색으로 채웁니다.
+    """
+    results = search_stocks(query, stocks_data, limit, market)
+    for tier in (key_search, fuzzy_search):
+        if len(results) >= limit:
+            break
+        found = {result['symbol'] for result in results}
+        results.extend(tier(query, limit - len(results), exclude=found, market=market))
+    return results
+
+def rebuild_universe_cache(cache_file, markets=None):
+    """
+    종목을 새로 가져와 시장별 캐시와 종목/검색 인덱스를 갱신합니다.
+
+    Args:
+        markets (list): 다시 가져올 시장 (기본: 전체). 나머지 시장 캐시는 그대로 유지
+
+    Returns:
+        dict: {'success', 'timestamp', 'data': 전체 종목 리스트, 'markets': 갱신한 시장 목록} 또는 실패 정보
+    """
+    result = get_all_korean_stocks(markets)
+    if not result['success']:
+        return result
+    
+    # 시장별 캐시 저장 (임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 파일을 봄)
+    try:
+        # 실패한 선택 시장은 기록해 두고 FAILED_MARKET_RETRY_HOURS 동안 재생성 대상에서 뺌
+        retry_after = (datetime.now() + timedelta(hours=FAILED_MARKET_RETRY_HOURS)).isoformat()
+        manifest = write_shards(cache_file, result['markets'], result['timestamp'],
+                                {market: retry_after for market in result['failed']})
+        print(f"종목 데이터를 {cache_file}에 캐시했습니다. (시장: {', '.join(result['markets'])})", file=sys.stderr)
+        # 캐시에 반영한 시장의 중간 기록만 지움 (저장에 실패하면 남겨 두고 다음 실행에서 재사용,
+        # 다른 시장 기록은 중단된 전체 수집이 이어서 쓸 수 있도록 유지)
+        BuildJournal(BUILD_JOURNAL_DIR, result['trading_date']).discard(result['markets'])
+    except Exception as e:
+        print(f"캐시 저장 실패: {e}", file=sys.stderr)
+        manifest = None
+    
+    # 인덱스는 전체 시장 기준으로 생성
+    stocks_data = result['data']
+    if markets and manifest is not None:
+        stocks_data, _ = load_universe(cache_file)
     
-    unique_results = []
-    seen_symbols = set()
-    for result in results:
-        if result['symbol'] not in seen_symbols:
-            unique_results.append(result)
-            seen_symbols.add(result['symbol'])
+    # 섹터/테마/그룹 역색인 (그룹별 등락 집계용)
+    if manifest is not None:
+        try:
+            index = write_group_index(cache_file, stocks_data, result['timestamp'])
+            print("분류 역색인 생성: " + ', '.join(f"{kind} {len(groups)}개" for kind, groups in index.items()),
+                  file=sys.stderr)
+        except Exception as e:
+            print(f"분류 역색인 생성 실패: {e}", file=sys.stderr)
+    
+    # 종목코드 -> (종목명, 상품유형, 시장) 인덱스 함께 생성
+    try:
+        count = build_symbol_index(stocks_data)
+        print(f"종목 인덱스 {count}개 생성", file=sys.stderr)
+    except Exception as e:
+        print(f"종목 인덱스 생성 실패: {e}", file=sys.stderr)
+    
+    # 오타 허용 검색 인덱스
+    try:
+        count = build_search_index(stocks_data)
+        print(f"검색 인덱스 단어 {count}개 생성", file=sys.stderr)
+    except Exception as e:
+        print(f"검색 인덱스 생성 실패: {e}", file=sys.stderr)
+    
+    return {
+        'success': True,
+        'timestamp': result['timestamp'],
+        'total_count': len(stocks_data),
+        'markets': sorted(result['markets']),
+        'data': stocks_data
+    }
+
+def rebuild_universe_locked(cache_file, markets=None, wait=True):
+    """
+    잠금을 잡고 종목 캐시를 재생성합니다.
+
+    다른 프로세스가 이미 재생성 중이면 wait=False 일 때는 바로 None 을 반환하고,
+    wait=True 일 때는 끝나기를 기다린 뒤 그 결과(새 캐시 파일)를 읽어 반환합니다.
+    """
+    os.makedirs(os.path.dirname(REBUILD_LOCK_PATH), exist_ok=True)
+    started = datetime.now().timestamp()
+    fd = os.open(REBUILD_LOCK_PATH, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            if not wait:
+                return None
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                if os.path.getmtime(cache_file) >= started:
+                    stocks_data, _ = load_universe(cache_file)
+                    if stocks_data:
+                        return {'success': True, 'total_count': len(stocks_data), 'data': stocks_data}
+            except OSError:
+                pass
+        return rebuild_universe_cache(cache_file, markets)
+    finally:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+def start_background_rebuild(cache_file, markets=None):
+    """
+    종목 캐시 재생성을 분리된 프로세스로 시작합니다. (이미 실행 중이면 시작하지 않음)
+
+    Args:
+        markets (list): 다시 가져올 시장 (기본: 전체)
+
+    Returns:
+        bool: 새로 시작했는지 여부
+    """
+    os.makedirs(os.path.dirname(REBUILD_LOCK_PATH), exist_ok=True)
+    fd = os.open(REBUILD_LOCK_PATH, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    except BlockingIOError:
+        return False
+    finally:
+        os.close(fd)
+
+    command = [sys.executable, os.path.abspath(__file__), '--refresh', '--background',
+               '--cache', os.path.abspath(cache_file)]
+    for market in markets or ():
+        command += ['--market', market]
+
+    # 잠금 확인과 시작 사이에 다른 요청이 먼저 시작했더라도 자식 프로세스가 잠금을 못 잡고 바로 끝남
+    with open(REBUILD_LOG_PATH, 'a', encoding='utf-8') as log:
+        subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True)
+    print(f"종목 백그라운드 재생성 시작 (시장: {', '.join(markets) if markets else '전체'})", file=sys.stderr)
+    return True
+
+def stale_markets(timestamps, markets=None, retry_after=None):
+    """
+    {시장: timestamp} 에서 기간이 지났거나 없는 시장 목록
+
+    retry_after({시장: datetime})에 있는 시장은 그 시각 전까지 제외합니다.
+    (조회에 실패한 선택 시장 때문에 요청마다 재생성을 시작하지 않도록)
+    """
+    now = datetime.now()
+    stale = []
+    for market in markets or UNIVERSE_MARKETS:
+        if retry_after and market in retry_after and now < retry_after[market]:
+            continue
+        cache_time = parse_timestamp(timestamps.get(market, ''))
+        if cache_time is None or (now - cache_time).days > UNIVERSE_MAX_AGE_DAYS:
+            stale.append(market)
+    return stale
+
+def revalidate_universe(cache_file, stale):
+    """
+    기간이 지난 시장의 백그라운드 재생성을 시작합니다. (이미 진행 중이면 아무것도 하지 않음)
+    """
+    if not stale:
+        return
+    try:
+        # 모든 시장이 대상이면 시장을 나누지 않고 전체 재생성
+        start_background_rebuild(cache_file, None if set(stale) >= set(UNIVERSE_MARKETS) else stale)
+    except Exception as e:
+        print(f"백그라운드 재생성 시작 실패: {e}", file=sys.stderr)
+
+def load_universe_cache(cache_file, markets=None):
+    """
+    종목 캐시에서 지정한 시장(기본: 전체)을 읽습니다. 기간이 지났어도 데이터는 반환합니다.
+
+    Returns:
+        tuple: (종목 리스트 또는 None, 기간이 지났거나 없는 시장 목록)
+    """
+    stocks_data, timestamps = load_universe(cache_file, markets)
+    if not stocks_data:
+        return None, list(markets or UNIVERSE_MARKETS)
+
+    stale = stale_markets(timestamps, markets, manifest_retry_after(cache_file))
+    oldest = min(timestamps.values()) if timestamps else ''
+    print(f"캐시에서 {len(stocks_data)}개 종목 로드 (캐시 날짜: {oldest[:10]}"
+          f"{', 기간 경과: ' + ', '.join(stale) if stale else ''})", file=sys.stderr)
+    return stocks_data, stale
+
+def open_universe(cache_file, markets=None):
+    """
+    검색에 쓸 종목(기본: 전체 시장)을 준비합니다.
+
+    기간이 지났거나 없는 시장은 기다리지 않고 백그라운드 재생성을 시작한 뒤 있는 그대로 쓰고,
+    전체 시장을 읽었을 때 캐시가 인덱스보다 새로우면 인덱스를 다시 만듭니다.
+
+    Returns:
+        tuple: (종목 리스트, 재생성 중 여부)
+    """
+    stocks_data, stale = load_universe_cache(cache_file, markets)
+    revalidate_universe(cache_file, stale)
+
+    # 캐시 파일이 종목 인덱스보다 새로우면 인덱스 재생성 (일부 시장만 읽었으면 생략)
+    if stocks_data is not None and not markets:
+        if is_index_stale(cache_file):
+            try:
+                build_symbol_index(stocks_data)
+            except Exception as e:
+                print(f"종목 인덱스 생성 실패: {e}", file=sys.stderr)
+        if is_index_stale(cache_file, SEARCH_INDEX_PATH):
+            try:
+                build_search_index(stocks_data)
+            except Exception as e:
+                print(f"검색 인덱스 생성 실패: {e}", file=sys.stderr)
 
-    for result in unique_results:
-        del result['score']
-        del result['match_type']
+    # 처음 실행이라 캐시가 아예 없으면 빈 목록 (재생성이 끝나면 채워짐)
+    return stocks_data or [], bool(stale)
+
+def _file_versions(*paths):
+    versions = []
+    for path in paths:
+        try:
+            versions.append(os.path.getmtime(path))
+        except OSError:
+            versions.append(None)
+    return tuple(versions)
+
+def split_by_market(stocks_data):
+    shards = {}
+    for stock_info in stocks_data:
+        shards.setdefault(stock_info['market'], []).append(stock_info)
+    return shards
+
+def serve_batch(cache_file, input_stream, output_stream):
+    """
+    한 줄에 하나씩 들어오는 NDJSON 검색 요청에 NDJSON 으로 응답합니다.
 
-    return unique_results[:limit]
+    요청: {"id": ..., "q": "삼성", "limit": 20, "market": "KOSPI"}
+    응답: {"id": ..., "success": true, "results": [...], "stale": false}
+
+    전체 종목과 인덱스는 한 번만 읽고, 다른 프로세스가 캐시/인덱스/인기 점수를 새로 만들면
+    RELOAD_CHECK_INTERVAL 마다 확인해 다시 읽습니다. 파일이 그대로여도 STALE_CHECK_INTERVAL 마다
+    시장별 캐시 기간을 다시 확인해, 지난 시장은 백그라운드 재생성을 시작합니다.
+    """
+    watched = (os.path.abspath(cache_file), SEARCH_INDEX_PATH, SEARCH_RANKS_PATH)
+    stocks_data, stale = open_universe(cache_file)
+    shards = split_by_market(stocks_data)
+    versions = _file_versions(*watched)
+    checked_at = stale_checked_at = datetime.now().timestamp()
+
+    for line in input_stream:
+        line = line.strip()
+        if not line:
+            continue
+
+        now = datetime.now().timestamp()
+        if now - checked_at >= RELOAD_CHECK_INTERVAL:
+            checked_at = now
+            current = _file_versions(*watched)
+            if current != versions:
+                search_index.reload()
+                stocks_data, stale = open_universe(cache_file)
+                shards = split_by_market(stocks_data)
+                versions = _file_versions(*watched)
+                stale_checked_at = now
+        if now - stale_checked_at >= STALE_CHECK_INTERVAL:
+            stale_checked_at = now
+            outdated = stale_markets(manifest_timestamps(cache_file), retry_after=manifest_retry_after(cache_file))
+            revalidate_universe(cache_file, outdated)
+            stale = bool(outdated)
+
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            query = str(request.get('q') or '')
+            limit = max(1, min(int(request.get('limit') or 20), MAX_BATCH_LIMIT))
+            market = (request.get('market') or '').upper() or None
+            # 시장을 지정하면 그 시장 종목만 훑음
+            universe = shards.get(market, []) if market else stocks_data
+            response = {
+                'id': request_id,
+                'success': True,
+                'results': find_stocks(query, universe, limit, market) if query.strip() else [],
+                'stale': stale
+            }
+        except Exception as e:
+            response = {'id': request_id, 'success': False, 'error': str(e)}
+        output_stream.write(json.dumps(response, ensure_ascii=False) + '\n')
+        output_stream.flush()
 
 def main():
     parser = argparse.ArgumentParser(description='Complete Korean stock search using PyKRX')
     parser.add_argument('--search', '-s', type=str, help='Search query')
-    parser.add_argument('--search-file', type=str, help='File containing search query (UTF-8)')
     parser.add_argument('--limit', '-l', type=int, default=20, help='Search result limit')
     parser.add_argument('--cache', '-c', type=str, help='Cache file path for stock data')
     parser.add_argument('--refresh', '-r', action='store_true', help='Force refresh stock data')
+    parser.add_argument('--background', action='store_true', help='With --refresh: exit quietly if another rebuild holds the lock')
+    parser.add_argument('--batch', action='store_true', help='Answer NDJSON search requests from stdin until EOF')
+    parser.add_argument('--market', '-m', action='append', type=str.upper, choices=UNIVERSE_MARKETS,
+                        help='Restrict refresh (repeatable) or search (once) to a market')
     
     args = parser.parse_args()
+    if args.search and args.market and len(args.market) > 1:
+        parser.error('--search accepts a single --market')
     
     try:
         # 캐시 파일 사용 여부
         cache_file = args.cache or 'all_stocks_cache.json'
-        stocks_data = None
-        
-        # 캐시 파일 로드 시도 (새로고침이 아닌 경우)
-        if not args.refresh:
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
-                    # 캐시가 있으면 사용 (7일 이내)
-                    cache_date = cached_data.get('timestamp', '')
-                    if cache_date:
-                        # 7일 이내 캐시면 사용
-                        cache_time = datetime.fromisoformat(cache_date.replace('Z', '+00:00') if 'Z' in cache_date else cache_date)
-                        if (datetime.now() - cache_time).days <= 7:
-                            stocks_data = cached_data['data']
-                            print(f"캐시에서 {len(stocks_data)}개 종목 로드 (캐시 날짜: {cache_date[:10]})", file=sys.stderr)
-            except Exception as e:
-                print(f"캐시 로드 실패: {e}", file=sys.stderr)
-        
-        # 캐시가 없거나 새로고침인 경우 새로 가져오기
-        if stocks_data is None:
-            result = get_all_korean_stocks()
-            
+        rebuilding = False
+
+        if args.batch:
+            serve_batch(cache_file, sys.stdin, sys.stdout)
+            return
+
+        if args.refresh:
+            # 명시적 재생성 (백그라운드 실행이면 이미 진행 중인 재생성이 있을 때 바로 종료)
+            result = rebuild_universe_locked(cache_file, args.market, wait=not args.background)
+            if result is None:
+                print("다른 프로세스가 전체 종목을 재생성 중입니다.", file=sys.stderr)
+                return
             if not result['success']:
                 raise Exception(result['error'])
-                
             stocks_data = result['data']
-            
-            # 캐시 파일 저장
-            try:
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, ensure_ascii=False, indent=2)
-                print(f"종목 데이터를 {cache_file}에 캐시했습니다.", file=sys.stderr)
-            except Exception as e:
-                print(f"캐시 저장 실패: {e}", file=sys.stderr)
-        
-        # 검색 쿼리 결정 (환경변수 우선)
-        search_query = None
-        import os
-        
-        if os.getenv('SEARCH_QUERY'):
-            search_query = os.getenv('SEARCH_QUERY')
-            print(f"환경변수에서 검색 쿼리 읽음: {search_query}", file=sys.stderr)
-        elif args.search_file:
-            try:
-                with open(args.search_file, 'r', encoding='utf-8') as f:
-                    search_query = f.read().strip()
-                    print(f"파일에서 검색 쿼리 읽음: {search_query}", file=sys.stderr)
-                # 임시 파일 삭제
-                os.remove(args.search_file)
-            except Exception as e:
-                print(f"검색 파일 읽기 실패: {e}", file=sys.stderr)
-        elif args.search:
-            search_query = args.search
+        else:
+            stocks_data, rebuilding = open_universe(cache_file, args.market)
         
         # 검색 수행
-        if search_query:
-            search_results = search_stocks(search_query, stocks_data, args.limit)
+        market = args.market[0] if args.market else None
+        if args.search:
+            if market:
+                stocks_data = [stock_info for stock_info in stocks_data if stock_info['market'] == market]
+            search_results = find_stocks(args.search, stocks_data, args.limit, market)
             
             output = {
                 'success': True,
-                'query': search_query,
+                'query': args.search,
                 'results': search_results,
                 'total_found': len(search_results),
+                'stale': rebuilding,
                 'timestamp': datetime.now().isoformat()
             }
         else:
@@ -417,6 +826,7 @@ def main():
                 'success': True,
                 'total_count': len(stocks_data),
                 'data': stocks_data[:args.limit] if args.limit else stocks_data,
+                'stale': rebuilding,
                 'timestamp': datetime.now().isoformat()
             }
         
@@ -10,7 +10,79 @@ import sys
 import argparse
 from datetime import datetime
 import pandas as pd
-from io import StringIO
+from io import BytesIO
+
+# KRX 시장구분 -> 시장
+MARKET_LABELS = {
+    '유가': 'KOSPI',
+    '유가증권': 'KOSPI',
+    '코스닥': 'KOSDAQ',
+    '코넥스': 'KONEX',
+}
+
+# 회사명에 포함되면 붙이는 검색 키워드
+KEYWORD_GROUPS = (
+    ('삼성', ['삼성', 'Samsung']),
+    ('LG', ['LG', 'Lucky']),
+    ('SK', ['SK']),
+    ('현대', ['현대', 'Hyundai']),
+    ('카카오', ['카카오', 'Kakao']),
+    ('네이버', ['네이버', 'NAVER']),
+    ('포스코', ['포스코', 'POSCO']),
+)
+
+def parse_krx_listing(content):
+    """
+    KRX 상장법인목록 다운로드(EUC-KR)를 종목 정보 리스트로 변환합니다.
+    행 단위 반복 없이 컬럼 단위 문자열 연산으로 처리합니다.
+
+    Args:
+        content (bytes): 다운로드한 원본 데이터
+
+    Returns:
+        list: [{'symbol', 'name', 'full_name', 'market', 'sector', 'search_names'}, ...]
+    """
+    # 종목코드 앞자리 0 이 숫자 변환으로 사라지지 않도록 모두 문자열로 읽음
+    df = pd.read_csv(BytesIO(content), encoding='euc-kr', dtype=str, on_bad_lines='skip')
+    df = df.dropna(subset=['종목코드', '회사명'])
+
+    codes = df['종목코드'].str.strip().str.zfill(6)
+    full_names = df['회사명'].str.strip()
+    # 종목명에서 괄호 이후 제거
+    names = full_names.str.split('(', n=1).str[0].str.strip()
+    sectors = df['업종'].fillna('').str.strip() if '업종' in df else pd.Series('', index=df.index)
+
+    # 시장은 KRX 시장구분 컬럼 기준, 없거나 알 수 없는 값이면 종목코드 앞자리로 추정
+    guessed = codes.str[:2].lt('30').map({True: 'KOSPI', False: 'KOSDAQ'})
+    if '시장구분' in df:
+        markets = df['시장구분'].str.strip().map(MARKET_LABELS).fillna(guessed)
+    else:
+        markets = guessed
+
+    # 키워드 그룹 포함 여부를 비트로 모아, 나오는 조합마다 키워드 목록을 한 번만 만듦
+    signatures = pd.Series(0, index=df.index)
+    for bit, (token, _) in enumerate(KEYWORD_GROUPS):
+        signatures += names.str.contains(token, regex=False).astype(int) * (1 << bit)
+    extras = {
+        signature: [keyword for bit, (_, keywords) in enumerate(KEYWORD_GROUPS) if signature >> bit & 1
+                    for keyword in keywords]
+        for signature in signatures.unique().tolist()
+    }
+
+    return [
+        {
+            'symbol': code,
+            'name': name,
+            'full_name': full_name,
+            'market': market,
+            'sector': sector,
+            'search_names': list(dict.fromkeys([name, *extras[signature]]))  # 중복 제거
+        }
+        for code, name, full_name, market, sector, signature in zip(
+            codes.tolist(), names.tolist(), full_names.tolist(), markets.tolist(), sectors.tolist(),
+            signatures.tolist()
+        )
+    ]
 
 def fetch_krx_stock_list():
     """
@@ -41,71 +113,7 @@ def fetch_krx_stock_list():
         response = requests.get(url, params=params, headers=headers, timeout=30)
         response.raise_for_status()
         
-        # EUC-KR 인코딩으로 디코딩
-        content = response.content.decode('euc-kr')
-        
-        # CSV 데이터를 DataFrame으로 변환 (에러 무시하고 파싱)
-        df = pd.read_csv(StringIO(content), encoding='utf-8', on_bad_lines='skip')
-        
-        # 필요한 컬럼만 선택 및 정리
-        stocks = []
-        for _, row in df.iterrows():
-            try:
-                stock_code = str(row['종목코드']).zfill(6)  # 6자리로 패딩
-                company_name = str(row['회사명']).strip()
-                
-                # 종목명에서 불필요한 부분 제거
-                clean_name = company_name
-                if '(' in clean_name:
-                    clean_name = clean_name.split('(')[0].strip()
-                
-                # 시장 구분 (업종 정보에서 추출)
-                sector = str(row.get('업종', '')).strip()
-                
-                # 기본 시장 구분 (종목코드 기반)
-                if stock_code.startswith(('00', '01', '02', '03', '04', '05')):
-                    market = 'KOSPI'
-                elif stock_code.startswith(('06', '07', '08', '09', '10', '11', '12', '13', '14', '15', '16', '17', '18', '19', '20', '21', '22', '23', '24', '25', '26', '27', '28', '29')):
-                    market = 'KOSPI'
-                else:
-                    market = 'KOSDAQ'
-                
-                # 검색용 키워드 생성
-                search_names = [clean_name]
-                
-                # 회사명에서 자주 사용되는 키워드 추출
-                keywords = []
-                if '삼성' in clean_name:
-                    keywords.extend(['삼성', 'Samsung'])
-                if 'LG' in clean_name:
-                    keywords.extend(['LG', 'Lucky'])
-                if 'SK' in clean_name:
-                    keywords.extend(['SK'])
-                if '현대' in clean_name:
-                    keywords.extend(['현대', 'Hyundai'])
-                if '카카오' in clean_name:
-                    keywords.extend(['카카오', 'Kakao'])
-                if '네이버' in clean_name:
-                    keywords.extend(['네이버', 'NAVER'])
-                if '포스코' in clean_name:
-                    keywords.extend(['포스코', 'POSCO'])
-                
-                search_names.extend(keywords)
-                
-                stock_info = {
-                    'symbol': stock_code,
-                    'name': clean_name,
-                    'full_name': company_name,
-                    'market': market,
-                    'sector': sector,
-                    'search_names': list(set(search_names))  # 중복 제거
-                }
-                
-                stocks.append(stock_info)
-                
-            except Exception as e:
-                print(f"종목 처리 중 오류 (row {len(stocks)}): {e}")
-                continue
+        stocks = parse_krx_listing(response.content)
         
         result = {
             'success': True,
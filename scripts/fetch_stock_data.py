@@ -7,11 +7,195 @@ Korean Stock Data Fetcher using PyKRX API
 import json
 import sys
 import argparse
-from datetime import datetime, timedelta
-from pykrx import stock
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
+from shared_cache import get_shared_cache
+from market_hours import quote_expires_at
+from trading_calendar import last_trading_day, previous_trading_day, trading_day_window
+from symbol_index import lookup_symbol
+from daily_stats import get_daily_stats, YEAR_TRADING_DAYS, VOLUME_TRADING_DAYS
+from single_flight import single_flight
 
-def get_korean_stock_info(symbol):
+# 공유 캐시 네임스페이스
+QUOTE_NAMESPACE = 'quote'
+
+# 동시 조회 시 선행 요청을 기다리는 최대 시간 (초)
+QUOTE_FLIGHT_TIMEOUT = 30
+
+# 관심종목 일괄 조회 시 캐시에 없는 종목을 동시에 조회할 최대 수
+BOARD_FETCH_WORKERS = 8
+
+# 관심종목 카드에 필요한 필드
+CARD_FIELDS = ('symbol', 'name', 'price', 'changeAmount', 'changePercent', 'volume',
+               'marketCap', 'high52w', 'low52w', 'timestamp')
+
+
+def get_cached_quote(symbol):
+    """
+    공유 캐시에서 만료되지 않은 시세를 가져옵니다. 없으면 None.
+    """
+    try:
+        return get_shared_cache().get(QUOTE_NAMESPACE, symbol)
+    except Exception as e:
+        print(f"공유 캐시 조회 실패: {e}", file=sys.stderr)
+        return None
+
+
+def store_quote(result):
+    """
+    조회 성공한 시세를 KRX 세션 시계 기준 만료시각으로 공유 캐시에 저장합니다.
+    """
+    expires_at = quote_expires_at()
+    result['extra_info']['cache_expires_at'] = expires_at.isoformat()
+    try:
+        get_shared_cache().set(QUOTE_NAMESPACE, result['symbol'], result, expires_at.timestamp())
+    except Exception as e:
+        print(f"공유 캐시 저장 실패: {e}", file=sys.stderr)
+    return result
+
+
+def get_korean_stock_info(symbol, use_cache=True):
+    """
+    공유 캐시를 우선 사용하고, 없거나 만료된 경우에만 KRX에서 조회합니다.
+
+    Args:
+        symbol (str): 종목코드
+        use_cache (bool): False 이면 캐시를 건너뛰고 항상 새로 조회
+
+    Returns:
+        dict: 주식/ETF 정보
+    """
+    if use_cache:
+        cached = get_cached_quote(symbol)
+        if cached:
+            return cached
+
+    def fetch_and_store():
+        result = fetch_korean_stock_info(symbol)
+        if result['success']:
+            store_quote(result)
+        return result
+
+    # 같은 종목을 동시에 조회하는 다른 프로세스가 있으면 그 결과를 공유
+    return single_flight('quote', symbol, fetch_and_store, wait_timeout=QUOTE_FLIGHT_TIMEOUT,
+                         check=(lambda: get_cached_quote(symbol) or None) if use_cache else None)
+
+
+def resolve_symbol_upstream(symbol, date):
+    """
+    종목 인덱스에 없는 종목의 이름과 ETF 여부를 KRX에서 확인합니다.
+    
+    Returns:
+        tuple: (종목명, ETF 여부)
+    """
+    from pykrx import stock
+
+    # 먼저 일반 주식으로 시도
+    try:
+        stock_name = stock.get_market_ticker_name(symbol)
+        if stock_name and stock_name != 'N/A':
+            return stock_name, False
+    except:
+        pass
+    
+    # ETF로 시도
+    try:
+        etf_list = stock.get_etf_ticker_list(date)
+    except Exception as e:
+        raise Exception(f"종목코드 {symbol}를 찾을 수 없습니다: {str(e)}")
+    
+    if symbol not in etf_list:
+        raise Exception(f"종목코드 {symbol}를 찾을 수 없습니다.")
+    
+    try:
+        stock_name = stock.get_etf_ticker_name(symbol)
+    except:
+        stock_name = None
+    return stock_name or f"ETF_{symbol}", True
+
+
+def prices_from_frame(df):
+    """
+    52주 구간 OHLCV DataFrame 에서 시세, 52주 최고/최저, 거래량 비중을 계산합니다.
+    """
+    # 최신 데이터 (가장 마지막 행)
+    latest_data = df.iloc[-1]
+    volume = int(latest_data['거래량'])
+    
+    prices = {
+        'price': int(latest_data['종가']),
+        'open': int(latest_data['시가']),
+        'high': int(latest_data['고가']),
+        'low': int(latest_data['저가']),
+        'volume': volume,
+        # 전일 종가 (직전 거래일, 데이터가 1개만 있으면 시가 사용)
+        'previous_close': int(df.iloc[-2]['종가']) if len(df) > 1 else int(latest_data['시가']),
+        'high_52w': 0,
+        'low_52w': 0,
+        'volume_ratio': 0
+    }
+    
+    # 52주 최고/최저 계산 (1년치 데이터)
+    try:
+        prices['high_52w'] = int(df['고가'].max())
+        prices['low_52w'] = int(df['저가'].min())
+    except Exception as e:
+        print(f"52주 최고/최저 계산 실패: {e}", file=sys.stderr)
+    
+    # 거래량 비중 계산 (최근 30일(약 21거래일) 평균 대비 거래량)
+    try:
+        historical_df = df.tail(VOLUME_TRADING_DAYS)
+        if len(historical_df) > 1:
+            avg_volume = historical_df['거래량'].mean()
+            prices['volume_ratio'] = round((volume / avg_volume * 100), 0) if avg_volume > 0 else 0
+            print(f"평균 거래량: {avg_volume:,.0f}, 현재 거래량: {volume:,}, 거래량 비중: {prices['volume_ratio']:.0f}%", file=sys.stderr)
+    except Exception as e:
+        print(f"거래량 비중 계산 실패: {e}", file=sys.stderr)
+    
+    return prices
+
+
+def prices_from_stats(stats, bar=None):
+    """
+    사전 계산된 일별 통계로 시세 필드를 만듭니다.
+    
+    Args:
+        stats (dict): 일별 통계 (precompute_stats.py)
+        bar (Series): 통계 다음 거래일의 OHLCV 행. None 이면 통계 당일 값 사용
+    """
+    if bar is None:
+        return {
+            'price': stats['close'],
+            'open': stats['open'],
+            'high': stats['high'],
+            'low': stats['low'],
+            'volume': stats['volume'],
+            'previous_close': stats['prev_close'],
+            'high_52w': stats['high_52w'],
+            'low_52w': stats['low_52w'],
+            'volume_ratio': stats['volume_ratio']
+        }
+    
+    volume = int(bar['거래량'])
+    high = int(bar['고가'])
+    low = int(bar['저가'])
+    # 통계의 251/20거래일 값에 오늘을 더해 252/21거래일 구간을 만듦
+    avg_volume = (stats['volume_sum_20'] + volume) / (stats['volume_count_20'] + 1)
+    return {
+        'price': int(bar['종가']),
+        'open': int(bar['시가']),
+        'high': high,
+        'low': low,
+        'volume': volume,
+        'previous_close': stats['close'] or int(bar['시가']),
+        'high_52w': max(stats['high_251'], high),
+        'low_52w': min(stats['low_251'], low) if stats['low_251'] else low,
+        'volume_ratio': round((volume / avg_volume * 100), 0) if avg_volume > 0 else 0
+    }
+
+
+def fetch_korean_stock_info(symbol):
     """
     PyKRX를 사용해 한국 주식/ETF 정보를 가져옵니다.
     
@@ -22,119 +206,78 @@ def get_korean_stock_info(symbol):
         dict: 주식/ETF 정보
     """
     try:
-        # 오늘 날짜
-        today = datetime.now().strftime('%Y%m%d')
-        yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y%m%d')
+        # pykrx(pandas 포함)는 캐시로 응답할 수 없을 때만 불러옴
+        from pykrx import stock
+
+        # 데이터가 있는 최근 거래일
+        last_day = last_trading_day()
         
-        # ETF 여부 확인
+        # ETF 여부 확인 (종목 인덱스 우선, 인덱스에 없는 종목만 KRX 조회)
         is_etf = False
         stock_name = None
         
-        # 먼저 일반 주식으로 시도
-        try:
-            stock_name = stock.get_market_ticker_name(symbol)
-            if not stock_name or stock_name == 'N/A':
-                raise Exception("일반 주식 아님")
-        except:
-            # ETF로 시도
-            try:
-                etf_list = stock.get_etf_ticker_list(today)
-                if symbol in etf_list:
-                    is_etf = True
-                    # ETF 이름 가져오기 (여러 방법 시도)
-                    try:
-                        # 방법 1: ETF 기본 정보 가져오기
-                        etf_info = stock.get_etf_portfolio_deposit_file(symbol)
-                        if not etf_info.empty:
-                            if '종목명' in etf_info.columns:
-                                stock_name = etf_info['종목명'].iloc[0]
-                            else:
-                                # 컬럼명이 다를 수 있으므로 첫번째 컬럼 사용
-                                stock_name = etf_info.iloc[0, 0] if len(etf_info.columns) > 0 else f"ETF_{symbol}"
-                        else:
-                            stock_name = f"ETF_{symbol}"
-                    except:
-                        # 방법 2: 캐시에서 찾기
-                        try:
-                            import os
-                            cache_file = '/app/all_stocks_cache.json'
-                            if os.path.exists(cache_file):
-                                import json
-                                with open(cache_file, 'r', encoding='utf-8') as f:
-                                    cache_data = json.load(f)
-                                    for item in cache_data.get('data', []):
-                                        if item.get('symbol') == symbol:
-                                            stock_name = item.get('name', f"ETF_{symbol}")
-                                            break
-                                    else:
-                                        stock_name = f"ETF_{symbol}"
-                            else:
-                                stock_name = f"ETF_{symbol}"
-                        except:
-                            stock_name = f"ETF_{symbol}"
-                else:
-                    raise Exception(f"종목코드 {symbol}를 찾을 수 없습니다.")
-            except Exception as e:
-                raise Exception(f"종목코드 {symbol}를 찾을 수 없습니다: {str(e)}")
-        
-        # 주가 데이터 가져오기
-        df = None
-        
-        if is_etf:
-            # ETF 데이터 가져오기
-            try:
-                df = stock.get_etf_ohlcv_by_date(today, today, symbol)
-                if df.empty:
-                    df = stock.get_etf_ohlcv_by_date(yesterday, yesterday, symbol)
-            except:
-                five_days_ago = (datetime.now() - timedelta(days=5)).strftime('%Y%m%d')
-                df = stock.get_etf_ohlcv_by_date(five_days_ago, today, symbol)
+        indexed = lookup_symbol(symbol)
+        if indexed:
+            stock_name = indexed['name']
+            is_etf = indexed['type'] == 'ETF'
         else:
-            # 일반 주식 데이터 가져오기
-            try:
-                df = stock.get_market_ohlcv_by_date(today, today, symbol)
-                if df.empty:
-                    df = stock.get_market_ohlcv_by_date(yesterday, yesterday, symbol)
-            except:
-                five_days_ago = (datetime.now() - timedelta(days=5)).strftime('%Y%m%d')
-                df = stock.get_market_ohlcv_by_date(five_days_ago, today, symbol)
+            stock_name, is_etf = resolve_symbol_upstream(symbol, last_day)
         
-        if df is None or df.empty:
-            raise Exception(f"종목 {symbol}의 주가 데이터를 찾을 수 없습니다.")
+        # 사전 계산된 일별 통계(precompute_stats.py)가 있으면 최근 거래일 시세만 조회
+        stats = get_daily_stats(symbol)
+        prices = None
+        # 오늘 통계는 종가 확정 후 계산된 것만 그대로 사용 (final 표시가 없으면 장중 값일 수 있음)
+        if stats and stats['date'] == last_day and stats.get('final'):
+            prices = prices_from_stats(stats)
+        elif stats and stats['date'] == previous_trading_day(last_day):
+            if is_etf:
+                bar_df = stock.get_etf_ohlcv_by_date(last_day, last_day, symbol)
+            else:
+                bar_df = stock.get_market_ohlcv_by_date(last_day, last_day, symbol)
+            if not bar_df.empty:
+                prices = prices_from_stats(stats, bar_df.iloc[-1])
         
-        # 최신 데이터 (가장 마지막 행)
-        latest_data = df.iloc[-1]
+        if prices is None:
+            # 통계가 없으면 52주 구간을 한 번에 조회해 시세/52주/거래량 계산에 공용
+            year_start, _ = trading_day_window(YEAR_TRADING_DAYS, last_day)
+            if is_etf:
+                df = stock.get_etf_ohlcv_by_date(year_start, last_day, symbol)
+            else:
+                df = stock.get_market_ohlcv_by_date(year_start, last_day, symbol)
+            
+            if df is None or df.empty:
+                raise Exception(f"종목 {symbol}의 주가 데이터를 찾을 수 없습니다.")
+            
+            prices = prices_from_frame(df)
         
-        current_price = int(latest_data['종가'])
-        open_price = int(latest_data['시가'])
-        high_price = int(latest_data['고가'])
-        low_price = int(latest_data['저가'])
-        volume = int(latest_data['거래량'])
-        
-        # 전일 종가 계산 (직전 거래일)
-        if len(df) > 1:
-            previous_close = int(df.iloc[-2]['종가'])
-        else:
-            # 데이터가 1개만 있으면 시가를 전일 종가로 사용
-            previous_close = open_price
+        current_price = prices['price']
+        open_price = prices['open']
+        high_price = prices['high']
+        low_price = prices['low']
+        volume = prices['volume']
+        previous_close = prices['previous_close']
+        high_52w = prices['high_52w']
+        low_52w = prices['low_52w']
+        volume_ratio = prices['volume_ratio']
         
         # 변화량 계산
         change_amount = current_price - previous_close
         change_percent = round((change_amount / previous_close * 100), 2) if previous_close else 0
         
-        # 시가총액, 거래대금, 상장주식수 및 52주 최고/최저 계산
+        # 시가총액, 거래대금, 상장주식수
         market_cap = 0
         trading_value = 0
         shares_outstanding = 0
-        high_52w = 0
-        low_52w = 0
         
-        if not is_etf:  # 일반 주식만 시가총액 계산
+        if not is_etf and stats and stats['date'] == last_day and stats.get('final') and stats.get('market_cap'):
+            # 최근 거래일 통계에 포함된 값 사용
+            market_cap = stats['market_cap']
+            trading_value = stats['value']
+            shares_outstanding = stats['shares']
+        elif not is_etf:  # 일반 주식만 시가총액 계산
             try:
                 # 시가총액과 상장주식수, 거래대금 직접 조회
-                cap_data = stock.get_market_cap_by_date(today, today, symbol)
-                if cap_data.empty:
-                    cap_data = stock.get_market_cap_by_date(yesterday, yesterday, symbol)
+                cap_data = stock.get_market_cap_by_date(last_day, last_day, symbol)
                 
                 if not cap_data.empty:
                     # 모든 데이터 수집 (PyKRX에서 제공되는 값들)
@@ -164,42 +307,15 @@ def get_korean_stock_info(symbol):
                 print(f"ETF NAV 조회 실패: {e}, 시가총액을 0으로 설정", file=sys.stderr)
                 market_cap = 0
         
-        # 52주 최고/최저 계산 (1년치 데이터)
-        try:
-            one_year_ago = (datetime.now() - timedelta(days=365)).strftime('%Y%m%d')
-            
-            if is_etf:
-                yearly_df = stock.get_etf_ohlcv_by_date(one_year_ago, today, symbol)
-            else:
-                yearly_df = stock.get_market_ohlcv_by_date(one_year_ago, today, symbol)
-            
-            if not yearly_df.empty:
-                high_52w = int(yearly_df['고가'].max())
-                low_52w = int(yearly_df['저가'].min())
-        except Exception as e:
-            print(f"52주 최고/최저 계산 실패: {e}", file=sys.stderr)
-            high_52w = 0
-            low_52w = 0
+        # 투자지표 (야간 작업이 저장한 전 종목 스냅샷에서 찾음, 추가 KRX 조회 없음)
+        fundamentals = {}
+        if not is_etf:
+            try:
+                from fundamentals import stored_fundamentals, quote_fields
+                fundamentals = quote_fields(stored_fundamentals(last_day), symbol)
+            except Exception as e:
+                print(f"투자지표 조회 실패: {e}", file=sys.stderr)
         
-        # 거래량 비중 계산 (평균 대비 거래량)
-        volume_ratio = 0
-        try:
-            # 최근 30일 평균 거래량과 비교
-            thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime('%Y%m%d')
-            
-            if is_etf:
-                historical_df = stock.get_etf_ohlcv_by_date(thirty_days_ago, today, symbol)
-            else:
-                historical_df = stock.get_market_ohlcv_by_date(thirty_days_ago, today, symbol)
-            
-            if not historical_df.empty and len(historical_df) > 1:
-                avg_volume = historical_df['거래량'].mean()
-                volume_ratio = round((volume / avg_volume * 100), 0) if avg_volume > 0 else 0
-                print(f"평균 거래량: {avg_volume:,.0f}, 현재 거래량: {volume:,}, 거래량 비중: {volume_ratio:.0f}%", file=sys.stderr)
-        except Exception as e:
-            print(f"거래량 비중 계산 실패: {e}", file=sys.stderr)
-            volume_ratio = 0
-
         # 결과 반환
         return {
             'success': True,
@@ -219,11 +335,14 @@ def get_korean_stock_info(symbol):
             'previousClose': previous_close,
             'high52w': high_52w,
             'low52w': low_52w,
+            **fundamentals,
             'timestamp': datetime.now().isoformat(),
             'extra_info': {
                 'data_source': 'PyKRX (한국거래소)',
                 'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'is_etf': is_etf
+                'is_etf': is_etf,
+                'instrument_type': indexed['type'] if indexed else ('ETF' if is_etf else 'STOCK'),
+                'market': indexed['market'] if indexed else None
             }
         }
         
@@ -236,12 +355,13 @@ def get_korean_stock_info(symbol):
         }
 
 
-def get_multiple_stocks(symbols):
+def get_multiple_stocks(symbols, use_cache=True):
     """
     여러 종목의 데이터를 한번에 가져옵니다.
     
     Args:
         symbols (list): 종목코드 리스트
+        use_cache (bool): 공유 캐시 사용 여부
     
     Returns:
         dict: 전체 결과
@@ -249,7 +369,7 @@ def get_multiple_stocks(symbols):
     results = {}
     
     for symbol in symbols:
-        results[symbol] = get_korean_stock_info(symbol)
+        results[symbol] = get_korean_stock_info(symbol, use_cache)
     
     return {
         'success': True,
@@ -258,24 +378,142 @@ def get_multiple_stocks(symbols):
     }
 
 
+def card_payload(quote, name=None):
+    """
+    시세에서 관심종목 카드에 필요한 필드만 남깁니다.
+    """
+    if not quote.get('success'):
+        return {'symbol': quote['symbol'], 'success': False, 'error': quote.get('error')}
+    card = {field: quote.get(field) for field in CARD_FIELDS}
+    card['success'] = True
+    if name:
+        card['name'] = name
+    return card
+
+
+def get_watchlist_board(entries, use_cache=True):
+    """
+    관심종목 전체를 한 번에 조회해 화면 순서대로 카드 데이터를 만듭니다.
+    
+    공유 캐시를 한 번의 조회로 읽고, 없거나 만료된 종목만 KRX에서 조회합니다.
+    캐시에 없는 종목은 BOARD_FETCH_WORKERS 개까지 동시에 조회해 API 시간 제한 안에 끝냅니다.
+    
+    Args:
+        entries (list): [(종목코드, 종목명 또는 None), ...] 화면 순서
+        use_cache (bool): 공유 캐시 사용 여부
+    
+    Returns:
+        dict: {'success', 'data': [카드, ...], 'timestamp'}
+    """
+    symbols = list(dict.fromkeys(symbol for symbol, _ in entries))
+    
+    cached = {}
+    if use_cache:
+        try:
+            cached = get_shared_cache().get_many(QUOTE_NAMESPACE, symbols)
+        except Exception as e:
+            print(f"공유 캐시 조회 실패: {e}", file=sys.stderr)
+    
+    quotes = {symbol: cached[symbol] for symbol in symbols if cached.get(symbol) is not None}
+    missing = [symbol for symbol in symbols if symbol not in quotes]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(BOARD_FETCH_WORKERS, len(missing))) as pool:
+            fetched = pool.map(lambda symbol: get_korean_stock_info(symbol, use_cache), missing)
+            quotes.update(zip(missing, fetched))
+    
+    cards = [card_payload(quotes[symbol], name) for symbol, name in entries]
+    
+    # 투자자별 순매수는 저장된 전 종목 파일에서 잘라 붙임 (없으면 생략, KRX 조회 없음)
+    try:
+        from investor_flow import latest_stored_flow, flow_slice
+        flows = flow_slice(latest_stored_flow(), symbols)
+        for card in cards:
+            if card['success'] and card['symbol'] in flows:
+                card['investorFlow'] = flows[card['symbol']]
+    except Exception as e:
+        print(f"투자자별 순매수 조회 실패: {e}", file=sys.stderr)
+    
+    return {
+        'success': True,
+        'timestamp': datetime.now().isoformat(),
+        'data': cards
+    }
+
+
+def read_watchlist_file(path):
+    """
+    관심종목 파일을 읽습니다. ('-' 이면 표준입력)
+    
+    JSON 배열(["005930", ...] 또는 [{"symbol", "name"}, ...]) 또는 줄 단위 종목코드를 받습니다.
+    
+    Returns:
+        list: [(종목코드, 종목명 또는 None), ...]
+    """
+    if path == '-':
+        content = sys.stdin.read()
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    
+    try:
+        items = json.loads(content)
+    except ValueError:
+        items = [line.strip() for line in content.splitlines() if line.strip()]
+    
+    entries = []
+    for item in items:
+        if isinstance(item, dict):
+            entries.append((str(item['symbol']), item.get('name')))
+        else:
+            entries.append((str(item), None))
+    return entries
+
+
+def read_user_watchlist(user):
+    """
+    DB 에서 사용자(ID 또는 이메일)의 관심종목을 화면 순서대로 읽습니다.
+    """
+    from database import get_connection, get_user_watchlist
+    
+    conn = get_connection()
+    try:
+        return get_user_watchlist(conn, user)
+    finally:
+        conn.close()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Fetch Korean stock data from PyKRX')
     parser.add_argument('--symbol', '-s', type=str, help='Single stock symbol (e.g., 005930)')
     parser.add_argument('--symbols', '-m', type=str, nargs='+', help='Multiple stock symbols')
     parser.add_argument('--output', '-o', type=str, help='Output file path (optional)')
+    parser.add_argument('--watchlist-file', type=str, help='Watchlist file (JSON array or one symbol per line, - for stdin)')
+    parser.add_argument('--user', '-u', type=str, help='User id or email whose watchlist to load from the database')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the shared quote cache')
     
     args = parser.parse_args()
+    use_cache = not args.no_cache
     
-    if args.symbol:
+    if args.watchlist_file or args.user:
+        # 관심종목 카드 일괄 조회
+        try:
+            if args.watchlist_file:
+                entries = read_watchlist_file(args.watchlist_file)
+            else:
+                entries = read_user_watchlist(args.user)
+            result = get_watchlist_board(entries, use_cache)
+        except Exception as e:
+            result = {'success': False, 'error': f'관심종목 조회 실패: {str(e)}', 'timestamp': datetime.now().isoformat()}
+    elif args.symbol:
         # 단일 종목
-        result = get_korean_stock_info(args.symbol)
+        result = get_korean_stock_info(args.symbol, use_cache)
     elif args.symbols:
         # 다중 종목
-        result = get_multiple_stocks(args.symbols)
+        result = get_multiple_stocks(args.symbols, use_cache)
     else:
         # 기본: 주요 종목들
         major_symbols = ['005930', '000660', '035420', '005935', '207940']
-        result = get_multiple_stocks(major_symbols)
+        result = get_multiple_stocks(major_symbols, use_cache)
     
     # JSON 출력
     json_result = json.dumps(result, ensure_ascii=False, indent=2)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+전체 종목 투자지표 스냅샷 (컬럼형 NumPy 파일)
+거래일마다 시장별 일괄 조회 한 번으로 전 종목의 BPS/PER/PBR/EPS/DIV/DPS 를 받아
+fundamentals/YYYYMMDD.npz 로 저장합니다.
+시세 응답과 스크리너는 저장된 파일에서 종목코드로 찾아 붙이므로 요청마다 KRX 를 조회하지 않습니다.
+
+실행 예: python3 scripts/fundamentals.py --symbols 005930 000660
+"""
+
+import os
+import sys
+import json
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from shared_cache import CACHE_DIR
+from trading_calendar import last_trading_day
+from market_snapshot import save_columns, load_columns, is_final, INTRADAY_MAX_AGE, STOCK_MARKETS
+
+FUNDAMENTALS_DIR = os.path.join(CACHE_DIR, 'fundamentals')
+
+# 컬럼명 -> PyKRX 컬럼
+FUNDAMENTAL_FIELDS = {
+    'bps': 'BPS',
+    'per': 'PER',
+    'pbr': 'PBR',
+    'eps': 'EPS',
+    'div': 'DIV',
+    'dps': 'DPS',
+}
+
+# 비율(소수) 지표 - 나머지(BPS/EPS/DPS)는 원 단위 정수
+RATIO_FIELDS = ('per', 'pbr', 'div')
+
+# 0 이하 값이 의미 없는 지표 (KRX 는 적자/자본잠식이면 0 으로 줌) - 스크리너에서는 값 없음으로 취급
+POSITIVE_FIELDS = ('per', 'pbr')
+
+# 시세 응답 필드명 (camelCase)
+QUOTE_FIELDS = {
+    'bps': 'bps',
+    'per': 'per',
+    'pbr': 'pbr',
+    'eps': 'eps',
+    'div': 'dividendYield',
+    'dps': 'dps',
+}
+
+
+def fundamentals_path(date):
+    return os.path.join(FUNDAMENTALS_DIR, f"{date}.npz")
+
+
+def fetch_fundamentals(date):
+    """
+    PyKRX 시장별 일괄 조회로 해당 거래일의 전 종목 투자지표를 만듭니다.
+
+    Returns:
+        dict: {컬럼명: 배열} (symbol 오름차순, 지표는 float32 - 값이 없으면 NaN)
+    """
+    from pykrx import stock
+
+    parts = []
+    for market in STOCK_MARKETS:
+        try:
+            df = stock.get_market_fundamental_by_ticker(date, market=market)
+            if df.empty:
+                continue
+            part = {'symbol': df.index.astype(str).to_numpy(dtype='U12')}
+            for name, column in FUNDAMENTAL_FIELDS.items():
+                part[name] = (df[column].to_numpy(dtype=np.float32)
+                              if column in df.columns else np.full(len(df), np.nan, dtype=np.float32))
+            parts.append(part)
+            print(f"{market} 투자지표: {len(df)}개", file=sys.stderr)
+        except Exception as e:
+            print(f"{market} 투자지표 조회 실패: {e}", file=sys.stderr)
+
+    if not parts:
+        raise Exception(f"{date} 투자지표 데이터가 없습니다.")
+
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    order = np.argsort(columns['symbol'], kind='stable')
+    columns = {name: values[order] for name, values in columns.items()}
+    columns['date'] = np.array(date)
+    columns['fetched_at'] = np.array(time.time())
+    return columns
+
+
+def load_fundamentals(date):
+    return load_columns(fundamentals_path(date))
+
+
+def ensure_fundamentals(date, max_age=INTRADAY_MAX_AGE):
+    """
+    저장된 투자지표를 반환하고, 없거나 장중에 받은 오래된 데이터면 새로 받아 저장합니다.
+    """
+    columns = load_fundamentals(date)
+    if columns is not None:
+        if is_final(columns) or time.time() - float(columns['fetched_at']) < max_age:
+            return columns
+
+    columns = fetch_fundamentals(date)
+    save_columns(fundamentals_path(date), columns)
+    return columns
+
+
+def stored_fundamentals(date=None):
+    """
+    date 이전(포함) 가장 최근에 저장된 투자지표 (조회하지 않음, 없으면 None)
+    """
+    try:
+        files = sorted(entry for entry in os.listdir(FUNDAMENTALS_DIR) if entry.endswith('.npz'))
+    except FileNotFoundError:
+        return None
+    if date is not None:
+        files = [entry for entry in files if entry[:-len('.npz')] <= date]
+    return load_columns(os.path.join(FUNDAMENTALS_DIR, files[-1])) if files else None
+
+
+def align(columns, symbols):
+    """
+    투자지표를 symbols 순서에 맞춘 배열로 만듭니다. 없는 종목(ETF 등)은 NaN 이므로
+    스크리너 비교에서 참도 거짓도 아닌 값으로 빠집니다.
+
+    Returns:
+        dict: {지표명: float64 배열}
+    """
+    count = len(symbols)
+    aligned = {name: np.full(count, np.nan) for name in FUNDAMENTAL_FIELDS}
+    if columns is None or not len(columns['symbol']) or not count:
+        return aligned
+    pos = np.clip(np.searchsorted(columns['symbol'], symbols), 0, len(columns['symbol']) - 1)
+    found = columns['symbol'][pos] == symbols
+    for name in FUNDAMENTAL_FIELDS:
+        aligned[name][found] = columns[name][pos[found]]
+    return aligned
+
+
+def quote_fields(columns, symbol):
+    """
+    한 종목의 투자지표를 시세 응답 필드로 ({} 이면 없음, 값이 없는 지표는 None)
+    """
+    if columns is None:
+        return {}
+    symbols = columns['symbol']
+    i = int(np.searchsorted(symbols, symbol))
+    if i >= len(symbols) or symbols[i] != symbol:
+        return {}
+    fields = {}
+    for name, field in QUOTE_FIELDS.items():
+        value = columns[name][i]
+        if np.isnan(value):
+            fields[field] = None
+        else:
+            fields[field] = round(float(value), 2) if name in RATIO_FIELDS else int(value)
+    return fields
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Store whole-market BPS/PER/PBR/EPS/DIV/DPS once per trading day')
+    parser.add_argument('--date', '-d', type=str, help='Trading date (YYYYMMDD), defaults to the last trading day')
+    parser.add_argument('--symbols', '-s', type=str, nargs='+', help='Symbols to print')
+    args = parser.parse_args()
+
+    try:
+        date = args.date or last_trading_day()
+        columns = ensure_fundamentals(date)
+        output = {'success': True, 'date': date, 'count': int(len(columns['symbol']))}
+        if args.symbols:
+            output['data'] = {symbol: quote_fields(columns, symbol) for symbol in args.symbols}
+        output['timestamp'] = datetime.now().isoformat()
+    except Exception as e:
+        output = {'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    if not output['success']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+섹터/테마/그룹별 등락 집계
+전체 종목 캐시와 함께 저장된 역색인(섹터/테마/그룹 -> 종목)과 일별 스냅샷으로
+그룹마다 시가총액 가중/동일 가중 등락률, 상승/하락 종목 수, 거래량을 한 번에 계산해
+groups/YYYYMMDD.json 으로 저장합니다. 섹터 히트맵은 이 파일 하나만 읽으면 됩니다.
+
+실행 예:
+  python3 scripts/group_index.py --refresh
+  python3 scripts/group_index.py --kind sector
+"""
+
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+
+import numpy as np
+
+from shared_cache import CACHE_DIR
+from symbol_index import UNIVERSE_CACHE_PATH
+from universe_cache import GROUP_KINDS, build_group_index, load_group_index, load_universe
+from market_snapshot import fill_change_pct
+
+GROUPS_DIR = os.path.join(CACHE_DIR, 'groups')
+
+
+def performance_path(date):
+    return os.path.join(GROUPS_DIR, f"{date}.json")
+
+
+def load_groups(cache_file=None):
+    """
+    저장된 역색인을 읽습니다. 없으면 (예전 형식 캐시) 전체 종목 캐시에서 바로 만듭니다.
+    """
+    cache_file = cache_file or UNIVERSE_CACHE_PATH
+    index = load_group_index(cache_file)
+    if index is None:
+        stocks_data, _ = load_universe(cache_file)
+        if stocks_data is None:
+            raise Exception(f"{cache_file} 전체 종목 캐시가 없습니다.")
+        index = build_group_index(stocks_data)
+    return {kind: index.get(kind, {}) for kind in GROUP_KINDS}
+
+
+def _clean(value, digits=2):
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def compute_group_performance(snapshot, groups, change_pct=None):
+    """
+    한 분류(예: 섹터)의 그룹별 등락을 계산합니다.
+
+    Args:
+        snapshot (dict): 일별 스냅샷 {컬럼명: 배열}
+        groups (dict): {그룹명: [종목코드, ...]}
+        change_pct (ndarray): 스냅샷 순서의 등락률 (기본: 스냅샷의 change_pct)
+
+    Returns:
+        list: 그룹별 집계 (시가총액 내림차순)
+    """
+    names = list(groups)
+    if not names:
+        return []
+    change_pct = snapshot['change_pct'] if change_pct is None else change_pct
+
+    # 그룹 구성 종목을 (그룹 번호, 스냅샷 위치) 배열로 펼침
+    members = np.array([symbol for name in names for symbol in groups[name]], dtype='U12')
+    group_ids = np.repeat(np.arange(len(names)), [len(groups[name]) for name in names])
+    order = np.argsort(snapshot['symbol'])
+    sorted_symbols = snapshot['symbol'][order]
+    pos = np.clip(np.searchsorted(sorted_symbols, members), 0, len(sorted_symbols) - 1)
+    found = sorted_symbols[pos] == members
+    rows = order[pos[found]]
+    group_ids = group_ids[found]
+
+    change = change_pct[rows]
+    valid = ~np.isnan(change)
+    change = np.where(valid, change, 0.0)
+    cap = np.where(valid, snapshot['market_cap'][rows], 0).astype(np.float64)
+
+    size = len(names)
+    def total(weights):
+        return np.bincount(group_ids, weights=weights, minlength=size)
+
+    count = np.bincount(group_ids, minlength=size)
+    priced = total(valid.astype(np.float64))
+    advancers = total((valid & (change > 0)).astype(np.float64))
+    decliners = total((valid & (change < 0)).astype(np.float64))
+    cap_total = total(cap)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        equal_weighted = total(change) / priced
+        cap_weighted = total(change * cap) / cap_total
+        breadth = advancers / (advancers + decliners)
+    volume = total(snapshot['volume'][rows].astype(np.float64))
+    value = total(snapshot['value'][rows].astype(np.float64))
+    market_cap = total(snapshot['market_cap'][rows].astype(np.float64))
+
+    records = [
+        {
+            'name': name,
+            'count': int(count[i]),
+            'cap_weighted_change_pct': _clean(cap_weighted[i]),
+            'equal_weighted_change_pct': _clean(equal_weighted[i]),
+            'advancers': int(advancers[i]),
+            'decliners': int(decliners[i]),
+            'unchanged': int(priced[i] - advancers[i] - decliners[i]),
+            'breadth': _clean(breadth[i], 4),
+            'volume': int(volume[i]),
+            'value': int(value[i]),
+            'market_cap': int(market_cap[i]),
+        }
+        for i, name in enumerate(names) if count[i]
+    ]
+    records.sort(key=lambda record: record['market_cap'], reverse=True)
+    return records
+
+
+def precompute_group_performance(snapshot, previous=None, cache_file=None):
+    """
+    모든 분류의 그룹별 등락을 계산해 groups/YYYYMMDD.json 으로 저장합니다.
+
+    Args:
+        previous (dict): 직전 거래일 스냅샷 (ETF 등락률 계산용, 없으면 생략)
+
+    Returns:
+        dict: 저장한 내용 {'date', 'groups': {분류: [그룹별 집계, ...]}, 'timestamp'}
+    """
+    index = load_groups(cache_file)
+    change_pct = fill_change_pct(snapshot, previous)
+    date = str(snapshot['date'])
+    result = {
+        'date': date,
+        'groups': {kind: compute_group_performance(snapshot, groups, change_pct) for kind, groups in index.items()},
+        'timestamp': datetime.now().isoformat(),
+    }
+
+    os.makedirs(GROUPS_DIR, exist_ok=True)
+    path = performance_path(date)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+    return result
+
+
+def load_group_performance(date=None):
+    """
+    저장된 그룹별 등락 (date 기본: 가장 최근 파일, 없으면 None)
+    """
+    if date is None:
+        try:
+            files = sorted(entry for entry in os.listdir(GROUPS_DIR) if entry.endswith('.json'))
+        except FileNotFoundError:
+            return None
+        if not files:
+            return None
+        date = files[-1][:-len('.json')]
+    try:
+        with open(performance_path(date), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sector/theme/group performance from the daily snapshot')
+    parser.add_argument('--date', '-d', type=str, help='Trading date (YYYYMMDD), defaults to the latest stored result')
+    parser.add_argument('--kind', '-k', type=str, choices=tuple(GROUP_KINDS), help='Only return one grouping')
+    parser.add_argument('--refresh', '-r', action='store_true', help='Recompute from the snapshot before reading')
+    parser.add_argument('--cache', '-c', type=str, help='Universe cache file path')
+    args = parser.parse_args()
+
+    try:
+        result = None if args.refresh else load_group_performance(args.date)
+        if result is None:
+            from trading_calendar import last_trading_day, previous_trading_day
+            from market_snapshot import ensure_snapshot, load_snapshot
+            date = args.date or last_trading_day()
+            result = precompute_group_performance(ensure_snapshot(date), load_snapshot(previous_trading_day(date)),
+                                                  args.cache)
+        groups = {args.kind: result['groups'].get(args.kind, [])} if args.kind else result['groups']
+        output = {'success': True, 'date': result['date'], 'groups': groups, 'timestamp': datetime.now().isoformat()}
+    except Exception as e:
+        output = {'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    if not output['success']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
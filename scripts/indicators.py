@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+기술적 지표 계산 엔진
+SMA/EMA, RSI, MACD, 볼린저 밴드, ATR, OBV 를 여러 종목에 대해 한 번에 계산합니다.
+
+종목 x 거래일 행렬(N, T)에 대해 NumPy 벡터 연산만 사용하며,
+결과는 (종목, 마지막 봉 날짜) 단위로 공유 캐시에 저장됩니다.
+"""
+
+import sys
+import json
+import argparse
+import warnings
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from shared_cache import get_shared_cache
+from market_hours import bar_expires_at
+from trading_calendar import last_trading_day, trading_day_window
+from daily_stats import YEAR_TRADING_DAYS
+from precompute_stats import load_history, MATRIX_FIELDS
+from symbol_index import lookup_symbol
+
+INDICATORS_NAMESPACE = 'indicators'
+
+# 확정된 봉의 지표는 바뀌지 않으므로 길게 보관
+FINAL_TTL = timedelta(days=7)
+
+SMA_PERIODS = (5, 20, 60, 120)
+EMA_PERIODS = (12, 26)
+RSI_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BOLLINGER_PERIOD, BOLLINGER_WIDTH = 20, 2
+ATR_PERIOD = 14
+
+
+# ---------------------------------------------------------------------------
+# 벡터 연산 (모든 입력은 (N, T) 행렬, 시간축 = axis 1)
+# ---------------------------------------------------------------------------
+
+def forward_fill(values):
+    """
+    거래정지 등으로 비어 있는 칸을 직전 값으로 채웁니다. (상장 전 NaN 은 유지)
+    """
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(values.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    return values[np.arange(values.shape[0])[:, None], index]
+
+
+def _rolling_sums(values, period):
+    """
+    기간 합계, 제곱합, 유효 개수를 누적합 차분으로 구합니다.
+    """
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    zeros = np.zeros((values.shape[0], 1))
+    csum = np.concatenate([zeros, np.cumsum(filled, axis=1)], axis=1)
+    csq = np.concatenate([zeros, np.cumsum(filled * filled, axis=1)], axis=1)
+    ccount = np.concatenate([zeros, np.cumsum(valid, axis=1)], axis=1)
+
+    total = np.full(values.shape, np.nan)
+    squares = np.full(values.shape, np.nan)
+    count = np.zeros(values.shape)
+    if values.shape[1] >= period:
+        total[:, period - 1:] = csum[:, period:] - csum[:, :-period]
+        squares[:, period - 1:] = csq[:, period:] - csq[:, :-period]
+        count[:, period - 1:] = ccount[:, period:] - ccount[:, :-period]
+    return total, squares, count
+
+
+def sma(values, period):
+    total, _, count = _rolling_sums(values, period)
+    return np.where(count == period, total / period, np.nan)
+
+
+def rolling_std(values, period):
+    total, squares, count = _rolling_sums(values, period)
+    mean = total / period
+    variance = np.maximum(squares / period - mean * mean, 0.0)
+    return np.where(count == period, np.sqrt(variance), np.nan)
+
+
+def ema(values, span=None, alpha=None):
+    """
+    지수이동평균. 시간축으로만 순회하고 각 시점은 전체 종목에 대해 한 번에 계산합니다.
+    """
+    alpha = alpha if alpha is not None else 2.0 / (span + 1)
+    result = np.empty_like(values)
+    previous = np.full(values.shape[0], np.nan)
+    for t in range(values.shape[1]):
+        current = values[:, t]
+        updated = previous + alpha * (current - previous)
+        previous = np.where(np.isnan(previous), current, np.where(np.isnan(current), previous, updated))
+        result[:, t] = previous
+    return result
+
+
+def _shift(values):
+    shifted = np.full(values.shape, np.nan)
+    shifted[:, 1:] = values[:, :-1]
+    return shifted
+
+
+def rsi(close, period=RSI_PERIOD):
+    """
+    Wilder RSI
+    """
+    delta = close - _shift(close)
+    gain = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+    loss = np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0))
+    avg_gain = ema(gain, alpha=1.0 / period)
+    avg_loss = ema(loss, alpha=1.0 / period)
+    rs = avg_gain / avg_loss
+    return np.where(avg_loss == 0, np.where(avg_gain > 0, 100.0, 50.0), 100.0 - 100.0 / (1.0 + rs))
+
+
+def macd(close, fast=MACD_FAST, slow=MACD_SLOW, signal=MACD_SIGNAL):
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(close, period=BOLLINGER_PERIOD, width=BOLLINGER_WIDTH):
+    middle = sma(close, period)
+    deviation = rolling_std(close, period)
+    return middle + width * deviation, middle, middle - width * deviation
+
+
+def atr(high, low, close, period=ATR_PERIOD):
+    previous_close = _shift(close)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+    return ema(true_range, alpha=1.0 / period)
+
+
+def obv(close, volume):
+    direction = np.nan_to_num(np.sign(close - _shift(close)))
+    return np.cumsum(direction * np.nan_to_num(volume), axis=1)
+
+
+def compute_indicators(ohlcv):
+    """
+    (N, T) OHLCV 행렬로 종목별 최신 지표 값을 계산합니다.
+
+    Returns:
+        dict: {지표명: (N,) 배열}
+    """
+    with warnings.catch_warnings(), np.errstate(all='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+
+        close = forward_fill(ohlcv['close'])
+        high = np.where(np.isnan(ohlcv['high']), close, ohlcv['high'])
+        low = np.where(np.isnan(ohlcv['low']), close, ohlcv['low'])
+
+        latest = {}
+        for period in SMA_PERIODS:
+            latest[f'sma{period}'] = sma(close, period)[:, -1]
+        for period in EMA_PERIODS:
+            latest[f'ema{period}'] = ema(close, period)[:, -1]
+        latest['rsi14'] = rsi(close)[:, -1]
+
+        macd_line, signal_line, histogram = macd(close)
+        latest['macd'] = macd_line[:, -1]
+        latest['macd_signal'] = signal_line[:, -1]
+        latest['macd_histogram'] = histogram[:, -1]
+
+        upper, middle, lower = bollinger(close)
+        latest['bollinger_upper'] = upper[:, -1]
+        latest['bollinger_middle'] = middle[:, -1]
+        latest['bollinger_lower'] = lower[:, -1]
+
+        latest['atr14'] = atr(high, low, close)[:, -1]
+        latest['obv'] = obv(close, ohlcv['volume'])[:, -1]
+    return latest
+
+
+def to_payload(symbol, date, latest, row):
+    def value(name, digits=2):
+        number = latest[name][row]
+        return None if np.isnan(number) else round(float(number), digits)
+
+    return {
+        'symbol': symbol,
+        'date': date,
+        'sma': {str(period): value(f'sma{period}') for period in SMA_PERIODS},
+        'ema': {str(period): value(f'ema{period}') for period in EMA_PERIODS},
+        'rsi14': value('rsi14'),
+        'macd': {
+            'macd': value('macd'),
+            'signal': value('macd_signal'),
+            'histogram': value('macd_histogram')
+        },
+        'bollinger': {
+            'upper': value('bollinger_upper'),
+            'middle': value('bollinger_middle'),
+            'lower': value('bollinger_lower')
+        },
+        'atr14': value('atr14'),
+        'obv': value('obv', 0)
+    }
+
+
+# ---------------------------------------------------------------------------
+# 데이터 적재 및 캐시
+# ---------------------------------------------------------------------------
+
+def fetch_ohlcv_upstream(symbol, end, length):
+    """
+    사전 계산 행렬에 없는 종목의 OHLCV 를 PyKRX에서 받아 길이 length 로 맞춥니다.
+    """
+    from pykrx import stock
+
+    start, _ = trading_day_window(length, end)
+    indexed = lookup_symbol(symbol)
+    if indexed and indexed['type'] == 'ETF':
+        df = stock.get_etf_ohlcv_by_date(start, end, symbol)
+    else:
+        df = stock.get_market_ohlcv_by_date(start, end, symbol)
+    if df is None or df.empty:
+        raise Exception(f"종목 {symbol}의 주가 데이터를 찾을 수 없습니다.")
+
+    rows = {}
+    for field, column in zip(MATRIX_FIELDS, ('시가', '고가', '저가', '종가', '거래량')):
+        series = df[column].to_numpy(dtype=np.float64)[-length:]
+        padded = np.full(length, np.nan)
+        padded[length - len(series):] = series
+        rows[field] = padded
+    rows['close'][rows['close'] <= 0] = np.nan
+    return rows
+
+
+def get_indicators(symbols):
+    """
+    여러 종목의 기술적 지표를 한 번에 계산합니다.
+
+    사전 계산 행렬(precompute_stats.py)에 있는 종목은 mmap 으로 해당 행만 읽고,
+    없는 종목만 PyKRX에서 조회합니다.
+
+    Returns:
+        dict: {'data': {종목코드: 지표}, 'errors': {종목코드: 오류}}
+    """
+    symbols = list(dict.fromkeys(symbols))
+    cache = get_shared_cache()
+    history = load_history()
+
+    # 종목별 마지막 봉 날짜 (행렬에 있으면 행렬 날짜, 없으면 최근 거래일)
+    rows = {}
+    if history is not None:
+        positions = np.searchsorted(history['symbols'], symbols)
+        for symbol, position in zip(symbols, positions.tolist()):
+            if position < len(history['symbols']) and history['symbols'][position] == symbol:
+                rows[symbol] = position
+    fallback_date = last_trading_day() if len(rows) < len(symbols) else None
+    dates = {symbol: history['date'] if symbol in rows else fallback_date for symbol in symbols}
+
+    keys = {symbol: f"{symbol}:{dates[symbol]}" for symbol in symbols}
+    try:
+        cached = cache.get_many(INDICATORS_NAMESPACE, keys.values())
+    except Exception as e:
+        print(f"지표 캐시 조회 실패: {e}", file=sys.stderr)
+        cached = {}
+    data = {symbol: cached[keys[symbol]] for symbol in symbols if keys[symbol] in cached}
+    errors = {}
+
+    missing = [symbol for symbol in symbols if symbol not in data]
+    if not missing:
+        return {'data': data, 'errors': errors}
+
+    # 행렬 행 + 업스트림 조회 행을 하나의 (N, T) 배치로 묶어 한 번에 계산
+    length = len(history['days']) if history is not None else YEAR_TRADING_DAYS
+    batch_symbols = []
+    batch = {field: [] for field in MATRIX_FIELDS}
+
+    matrix_missing = [symbol for symbol in missing if symbol in rows]
+    if matrix_missing:
+        index = np.array([rows[symbol] for symbol in matrix_missing])
+        for field in MATRIX_FIELDS:
+            batch[field].append(np.asarray(history[field][index], dtype=np.float64))
+        batch_symbols.extend(matrix_missing)
+
+    for symbol in missing:
+        if symbol in rows:
+            continue
+        try:
+            fetched = fetch_ohlcv_upstream(symbol, fallback_date, length)
+        except Exception as e:
+            errors[symbol] = str(e)
+            continue
+        for field in MATRIX_FIELDS:
+            batch[field].append(fetched[field][None, :])
+        batch_symbols.append(symbol)
+
+    if batch_symbols:
+        ohlcv = {field: np.concatenate(batch[field]) for field in MATRIX_FIELDS}
+        latest = compute_indicators(ohlcv)
+
+        computed = {}
+        for row, symbol in enumerate(batch_symbols):
+            payload = to_payload(symbol, dates[symbol], latest, row)
+            data[symbol] = payload
+            computed[keys[symbol]] = payload
+
+        try:
+            by_date = {}
+            for symbol in batch_symbols:
+                by_date.setdefault(dates[symbol], {})[keys[symbol]] = computed[keys[symbol]]
+            for date, items in by_date.items():
+                cache.set_many(INDICATORS_NAMESPACE, items, bar_expires_at(date, FINAL_TTL))
+        except Exception as e:
+            print(f"지표 캐시 저장 실패: {e}", file=sys.stderr)
+
+    return {'data': data, 'errors': errors}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute technical indicators for one or more symbols')
+    parser.add_argument('--symbols', '-m', type=str, nargs='+', required=True, help='Stock symbols')
+    args = parser.parse_args()
+
+    try:
+        result = get_indicators(args.symbols)
+        output = {
+            'success': True,
+            'data': result['data'],
+            'errors': result['errors'],
+            'timestamp': datetime.now().isoformat()
+        }
+    except Exception as e:
+        output = {'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    if not output['success']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
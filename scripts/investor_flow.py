@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+전체 시장 투자자별 순매수 (컬럼형 NumPy 파일)
+거래일마다 시장 x 투자자(외국인/기관/개인) 일괄 조회 몇 번으로
+전 종목의 순매수 거래대금·거래량을 받아 investor_flow/YYYYMMDD.npz 로 저장합니다.
+종목별/관심종목별 조회와 최근 N거래일 추이는 저장된 파일에서 잘라 냅니다.
+
+실행 예:
+  python3 scripts/investor_flow.py --symbols 005930 000660 --days 20
+  python3 scripts/investor_flow.py --backfill 60
+"""
+
+import os
+import sys
+import json
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from shared_cache import CACHE_DIR
+from trading_calendar import last_trading_day, recent_trading_days
+from market_snapshot import save_columns, load_columns, is_final, INTRADAY_MAX_AGE
+
+FLOW_DIR = os.path.join(CACHE_DIR, 'investor_flow')
+
+# 순매수를 받는 시장
+FLOW_MARKETS = ('KOSPI', 'KOSDAQ', 'KONEX')
+
+# 컬럼 접두어 -> PyKRX 투자자 구분
+INVESTORS = {
+    'foreign': '외국인',
+    'institution': '기관합계',
+    'individual': '개인',
+}
+
+
+def flow_path(date):
+    return os.path.join(FLOW_DIR, f"{date}.npz")
+
+
+def _market_columns(stock, date, market):
+    """
+    한 시장의 투자자별 순매수를 종목 기준으로 맞춘 컬럼으로 만듭니다.
+
+    일부 투자자만 비어 있으면 0 으로 채우지 않고 예외를 냅니다. (실제 순매수를 0 으로 저장하지 않도록)
+    """
+    frames = {}
+    for prefix, investor in INVESTORS.items():
+        df = stock.get_market_net_purchases_of_equities_by_ticker(date, date, market, investor)
+        if not df.empty:
+            frames[prefix] = df
+    if not frames:
+        return None
+    missing = [INVESTORS[prefix] for prefix in INVESTORS if prefix not in frames]
+    if missing:
+        raise Exception(f"{', '.join(missing)} 순매수 데이터가 없습니다.")
+
+    # 투자자마다 종목 목록이 조금씩 다를 수 있어 합집합 기준으로 정렬
+    index = sorted(set().union(*(df.index.astype(str) for df in frames.values())))
+    count = len(index)
+    columns = {
+        'symbol': np.array(index, dtype='U12'),
+        'market': np.full(count, market, dtype='U6'),
+    }
+    for prefix, df in frames.items():
+        df = df.set_axis(df.index.astype(str)).reindex(index)
+        columns[f"{prefix}_net_value"] = df['순매수거래대금'].fillna(0).to_numpy(dtype=np.int64)
+        columns[f"{prefix}_net_volume"] = df['순매수거래량'].fillna(0).to_numpy(dtype=np.int64)
+    return columns
+
+
+def fetch_investor_flow(date):
+    """
+    PyKRX 일괄 조회(시장 x 투자자)로 해당 거래일의 전 종목 순매수를 만듭니다.
+
+    Returns:
+        dict: {컬럼명: 배열} (symbol 오름차순) - 조회에 실패한 시장이 있으면 partial 이 True (is_final 이 아님)
+    """
+    from pykrx import stock
+
+    parts = []
+    failed = []
+    for market in FLOW_MARKETS:
+        try:
+            columns = _market_columns(stock, date, market)
+            if columns is not None:
+                parts.append(columns)
+                print(f"{market} 투자자별 순매수: {len(columns['symbol'])}개", file=sys.stderr)
+        except Exception as e:
+            print(f"{market} 투자자별 순매수 조회 실패: {e}", file=sys.stderr)
+            failed.append(market)
+
+    if not parts:
+        raise Exception(f"{date} 투자자별 순매수 데이터가 없습니다.")
+
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    order = np.argsort(columns['symbol'], kind='stable')
+    columns = {name: values[order] for name, values in columns.items()}
+    columns['date'] = np.array(date)
+    columns['fetched_at'] = np.array(time.time())
+    # 일부 시장이 빠졌으면 확정 데이터로 보지 않고 INTRADAY_MAX_AGE 뒤 다시 받음
+    columns['partial'] = np.array(bool(failed))
+    return columns
+
+
+def load_flow(date):
+    return load_columns(flow_path(date))
+
+
+def ensure_flow(date, max_age=INTRADAY_MAX_AGE):
+    """
+    저장된 순매수를 반환하고, 없거나 장중에 받은 오래된 데이터면 새로 받아 저장합니다.
+    """
+    columns = load_flow(date)
+    if columns is not None:
+        if is_final(columns) or time.time() - float(columns['fetched_at']) < max_age:
+            return columns
+
+    columns = fetch_investor_flow(date)
+    save_columns(flow_path(date), columns)
+    return columns
+
+
+def latest_stored_flow():
+    """
+    가장 최근에 저장된 순매수 (조회하지 않음, 없으면 None)
+    """
+    try:
+        files = sorted(entry for entry in os.listdir(FLOW_DIR) if entry.endswith('.npz'))
+    except FileNotFoundError:
+        return None
+    return load_columns(os.path.join(FLOW_DIR, files[-1])) if files else None
+
+
+def flow_slice(columns, symbols):
+    """
+    {종목코드: {'foreign', 'institution', 'individual' (순매수 거래대금), ...}} - 없는 종목은 제외
+    """
+    if columns is None:
+        return {}
+    wanted = np.array(list(symbols), dtype='U12')
+    sorted_symbols = columns['symbol']
+    if not len(wanted) or not len(sorted_symbols):
+        return {}
+    pos = np.clip(np.searchsorted(sorted_symbols, wanted), 0, len(sorted_symbols) - 1)
+    found = sorted_symbols[pos] == wanted
+
+    date = str(columns['date'])
+    result = {}
+    for symbol, row in zip(wanted[found].tolist(), pos[found].tolist()):
+        entry = {'date': date}
+        for prefix in INVESTORS:
+            entry[prefix] = int(columns[f"{prefix}_net_value"][row])
+            entry[f"{prefix}_volume"] = int(columns[f"{prefix}_net_volume"][row])
+        result[symbol] = entry
+    return result
+
+
+def flow_history(symbols, days, end=None):
+    """
+    최근 days 거래일의 종목별 순매수 추이. 저장되지 않은 거래일만 새로 받아 덧붙입니다.
+
+    Returns:
+        dict: {종목코드: [{'date', 'foreign', 'institution', 'individual', ...}, ...]} (오래된 순)
+    """
+    history = {symbol: [] for symbol in symbols}
+    for day in recent_trading_days(days, end or last_trading_day()):
+        try:
+            columns = ensure_flow(day)
+        except Exception as e:
+            print(f"{day} 투자자별 순매수 없음: {e}", file=sys.stderr)
+            continue
+        for symbol, entry in flow_slice(columns, symbols).items():
+            history[symbol].append(entry)
+    return history
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Whole-market investor net buying, stored per trading day')
+    parser.add_argument('--date', '-d', type=str, help='Trading date (YYYYMMDD), defaults to the last trading day')
+    parser.add_argument('--symbols', '-s', type=str, nargs='+', help='Symbols to slice out')
+    parser.add_argument('--user', '-u', type=str, help='Slice the watchlist of this user id or email')
+    parser.add_argument('--days', type=int, default=1, help='Trading days of history per symbol')
+    parser.add_argument('--backfill', type=int, help='Fetch and store any missing days among the last N trading days')
+    args = parser.parse_args()
+
+    try:
+        date = args.date or last_trading_day()
+        symbols = list(args.symbols or [])
+        if args.user:
+            from fetch_stock_data import read_user_watchlist
+            symbols += [symbol for symbol, _ in read_user_watchlist(args.user)]
+        symbols = list(dict.fromkeys(symbols))
+
+        if args.backfill:
+            missing = [day for day in recent_trading_days(args.backfill, date) if load_flow(day) is None]
+            flow_history([], args.backfill, date)
+            output = {'success': True, 'date': date, 'missing': len(missing),
+                      'stored': sum(load_flow(day) is not None for day in missing)}
+        elif args.days > 1:
+            output = {'success': True, 'date': date, 'data': flow_history(symbols, args.days, date)}
+        else:
+            columns = ensure_flow(date)
+            output = {'success': True, 'date': date, 'count': int(len(columns['symbol']))}
+            if symbols:
+                output['data'] = flow_slice(columns, symbols)
+        output['timestamp'] = datetime.now().isoformat()
+    except Exception as e:
+        output = {'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    if not output['success']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+KRX 정규장 시간 기준 세션 시계
+장중에는 짧은 TTL, 장 마감 후/휴장일에는 다음 개장 시각까지 유효한 TTL을 계산합니다.
+"""
+
+from datetime import datetime, timedelta, timezone, time as dtime
+
+# 한국 표준시 (서머타임 없음)
+KST = timezone(timedelta(hours=9), 'KST')
+
+MARKET_OPEN = dtime(9, 0)
+MARKET_CLOSE = dtime(15, 30)
+# 장 마감 후 종가 확정까지 짧은 TTL을 유지하는 구간
+CLOSE_SETTLE = dtime(15, 40)
+
+# 장중 시세 TTL (초)
+INTRADAY_TTL = 30
+
+
+def now_kst():
+    return datetime.now(KST)
+
+
+def to_kst(moment=None):
+    """
+    naive datetime 은 서버 로컬 시간으로 간주하고 KST 로 변환합니다.
+    """
+    if moment is None:
+        return now_kst()
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return moment.astimezone(KST)
+
+
+def is_trading_day(day):
+    """
+    거래일 여부 (주말 및 KRX 휴장일 제외)
+    """
+    if day.weekday() >= 5:
+        return False
+    # trading_calendar 가 이 모듈을 import 하므로 지연 import
+    from trading_calendar import is_trading_day as is_krx_trading_day
+    return is_krx_trading_day(day)
+
+
+def is_market_open(moment=None):
+    """
+    정규장(09:00~15:30) 진행 중인지 여부
+    """
+    moment = to_kst(moment)
+    return is_trading_day(moment.date()) and MARKET_OPEN <= moment.time() < MARKET_CLOSE
+
+
+def next_market_open(moment=None):
+    """
+    moment 이후 첫 개장 시각(KST)을 반환합니다.
+    """
+    moment = to_kst(moment)
+    day = moment.date()
+    if moment.time() >= MARKET_OPEN:
+        day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return datetime.combine(day, MARKET_OPEN, tzinfo=KST)
+
+
+def quote_expires_at(moment=None):
+    """
+    시세 캐시 만료시각을 계산합니다.
+
+    - 장중 및 종가 확정 구간: INTRADAY_TTL 초
+    - 그 외 (장 시작 전, 장 마감 후, 휴장일): 다음 개장 시각
+    """
+    moment = to_kst(moment)
+    if is_trading_day(moment.date()) and MARKET_OPEN <= moment.time() < CLOSE_SETTLE:
+        return moment + timedelta(seconds=INTRADAY_TTL)
+    return next_market_open(moment)
+
+
+def bar_expires_at(date, final_ttl, moment=None):
+    """
+    일봉 기반 캐시 만료시각 (epoch 초).
+
+    오늘 봉은 아직 바뀔 수 있으므로 시세와 같은 만료시각, 지난 봉은 final_ttl 뒤.
+    """
+    moment = to_kst(moment)
+    if date == moment.strftime('%Y%m%d'):
+        return quote_expires_at(moment).timestamp()
+    return (moment + final_ttl).timestamp()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+시장별 상위 종목 (market movers)
+전체 시장 스냅샷에서 상승률/하락률/거래대금/거래량 급증 상위 K개를
+argpartition 으로 전체 정렬 없이 골라 시장별로 공유 캐시에 저장합니다.
+조회는 캐시 한 번 읽기로 끝납니다.
+
+실행 예:
+  python3 scripts/market_movers.py --market KOSDAQ   # 조회 (캐시가 없으면 계산)
+  python3 scripts/market_movers.py --refresh         # 다시 계산해 저장
+"""
+
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+
+import numpy as np
+
+from shared_cache import get_shared_cache
+from market_hours import quote_expires_at
+from screener import load_screen_columns
+from symbol_index import lookup_symbol
+from single_flight import single_flight
+
+MOVERS_NAMESPACE = 'market_movers'
+
+TOP_K = 20
+
+# 전체(ALL)는 주식 시장만 합쳐서 계산 (ETF 제외)
+ALL_MARKETS = ('KOSPI', 'KOSDAQ', 'KONEX')
+
+# 장중 순위 유지 시간 (초). 갱신 주기(quote_refresher.MOVERS_INTERVAL)보다 길게 둠
+MOVERS_TTL = 90
+
+# 거래량 급증 순위에서 제외할 소규모 거래 (거래대금, 원)
+MIN_SPIKE_VALUE = 100_000_000
+
+# 순위 이름: (정렬 컬럼, 내림차순 여부)
+RANKINGS = {
+    'gainers': ('change_pct', True),
+    'losers': ('change_pct', False),
+    'value': ('value', True),
+    'volume_spike': ('volume_ratio', True),
+}
+
+
+def top_k(values, candidates, k, descending=True):
+    """
+    candidates 중 values 기준 상위 k개의 인덱스를 순서대로 반환합니다.
+
+    argpartition 으로 k개만 고른 뒤 그 k개만 정렬합니다. (O(n + k log k))
+    """
+    if len(candidates) == 0:
+        return candidates
+    keys = -values[candidates] if descending else values[candidates]
+    if len(candidates) > k:
+        part = np.argpartition(keys, k - 1)[:k]
+    else:
+        part = np.arange(len(candidates))
+    return candidates[part[np.argsort(keys[part], kind='stable')]]
+
+
+def _row(columns, i):
+    symbol = str(columns['symbol'][i])
+    indexed = lookup_symbol(symbol)
+    return {
+        'symbol': symbol,
+        'name': indexed['name'] if indexed else symbol,
+        'market': str(columns['market'][i]),
+        'price': int(columns['price'][i]),
+        'changePercent': None if np.isnan(columns['change_pct'][i]) else float(columns['change_pct'][i]),
+        'volume': int(columns['volume'][i]),
+        'tradingValue': int(columns['value'][i]),
+        'volumeRatio': int(columns['volume_ratio'][i]),
+    }
+
+
+def compute_movers(columns, k=TOP_K):
+    """
+    시장별 순위를 계산합니다.
+
+    ETF 등락률은 load_screen_columns 가 직전 거래일 종가로 채우며, 그래도 모르는 종목은
+    상승률/하락률 순위에서 제외합니다.
+
+    Returns:
+        dict: {시장: {'date', 'gainers': [...], 'losers': [...], 'value': [...], 'volume_spike': [...]}}
+    """
+    # 거래정지/거래 없는 종목 제외
+    traded = (columns['price'] > 0) & (columns['volume'] > 0)
+    markets = {market: columns['market'] == market for market in np.unique(columns['market']).tolist()}
+    markets['ALL'] = np.isin(columns['market'], ALL_MARKETS)
+
+    movers = {}
+    for market, in_market in markets.items():
+        candidates = np.flatnonzero(in_market & traded)
+        entry = {'date': columns['date']}
+        for name, (column, descending) in RANKINGS.items():
+            pool = candidates[~np.isnan(columns[column][candidates])]
+            if name == 'volume_spike':
+                pool = pool[columns['value'][pool] >= MIN_SPIKE_VALUE]
+            entry[name] = [_row(columns, i) for i in top_k(columns[column], pool, k, descending).tolist()]
+        movers[market] = entry
+    return movers
+
+
+def refresh_movers(k=TOP_K):
+    """
+    최신 스냅샷으로 순위를 다시 계산해 시장별로 저장합니다.
+
+    장중에는 MOVERS_TTL, 장 마감 후에는 다음 개장까지 유지합니다.
+    """
+    movers = compute_movers(load_screen_columns(), k)
+    generated_at = datetime.now().isoformat()
+    for entry in movers.values():
+        entry['generated_at'] = generated_at
+    expires_at = max(quote_expires_at().timestamp(), time.time() + MOVERS_TTL)
+    get_shared_cache().set_many(MOVERS_NAMESPACE, movers, expires_at)
+    return movers
+
+
+def get_movers(market='ALL'):
+    """
+    시장별 순위를 캐시에서 읽고, 없으면 (동시 요청은 하나로 합쳐) 계산합니다.
+    """
+    cached = get_shared_cache().get(MOVERS_NAMESPACE, market)
+    if cached is not None:
+        return cached
+    movers = single_flight('movers', 'refresh', refresh_movers)
+    if market not in movers:
+        raise Exception(f"{market} 시장 데이터가 없습니다.")
+    return movers[market]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Top gainers, losers, trading value and volume spikes per market')
+    parser.add_argument('--market', '-m', type=str, default='ALL', help='KOSPI, KOSDAQ, KONEX, ETF or ALL')
+    parser.add_argument('--refresh', action='store_true', help='Recompute and store all markets')
+    args = parser.parse_args()
+
+    try:
+        if args.refresh:
+            movers = refresh_movers()
+            output = {'success': True, 'markets': sorted(movers), 'timestamp': datetime.now().isoformat()}
+        else:
+            output = {'success': True, 'data': get_movers(args.market.upper()), 'timestamp': datetime.now().isoformat()}
+    except Exception as e:
+        output = {'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    if not output['success']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+전체 시장 일별 스냅샷 (컬럼형 NumPy 파일)
+거래일마다 KOSPI/KOSDAQ/KONEX 주식과 ETF의 OHLCV·시가총액을
+몇 번의 일괄 조회로 받아 snapshots/YYYYMMDD.npz 로 저장합니다.
+"""
+
+import os
+import sys
+import json
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from shared_cache import CACHE_DIR
+from market_hours import KST, CLOSE_SETTLE
+from trading_calendar import last_trading_day
+
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, 'snapshots')
+
+STOCK_MARKETS = ('KOSPI', 'KOSDAQ', 'KONEX')
+
+# 장중 스냅샷 재사용 허용 시간 (초)
+INTRADAY_MAX_AGE = 60
+
+
+def save_columns(path, columns):
+    """
+    {컬럼명: 1차원 배열} 을 npz 파일로 원자적으로 저장합니다.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        np.savez(f, **columns)
+    os.replace(temp_path, path)
+
+
+def load_columns(path):
+    """
+    npz 파일을 {컬럼명: 배열} 로 읽습니다. 파일이 없으면 None.
+    """
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def snapshot_path(date):
+    return os.path.join(SNAPSHOT_DIR, f"{date}.npz")
+
+
+def _frame_columns(df, market, cap_df=None):
+    """
+    PyKRX 티커별 DataFrame 을 스냅샷 컬럼으로 변환합니다.
+    """
+    count = len(df)
+    columns = {
+        'symbol': df.index.astype(str).to_numpy(dtype='U12'),
+        'market': np.full(count, market, dtype='U6'),
+        'open': df['시가'].to_numpy(dtype=np.int64),
+        'high': df['고가'].to_numpy(dtype=np.int64),
+        'low': df['저가'].to_numpy(dtype=np.int64),
+        'close': df['종가'].to_numpy(dtype=np.int64),
+        'volume': df['거래량'].to_numpy(dtype=np.int64),
+        'value': df['거래대금'].to_numpy(dtype=np.int64),
+        'change_pct': (df['등락률'].to_numpy(dtype=np.float64)
+                       if '등락률' in df.columns else np.full(count, np.nan)),
+        'market_cap': np.zeros(count, dtype=np.int64),
+        'shares': np.zeros(count, dtype=np.int64),
+    }
+    if cap_df is not None and not cap_df.empty:
+        cap_df = cap_df.reindex(df.index)
+        columns['market_cap'] = cap_df['시가총액'].fillna(0).to_numpy(dtype=np.int64)
+        columns['shares'] = cap_df['상장주식수'].fillna(0).to_numpy(dtype=np.int64)
+    return columns
+
+
+def fetch_market_snapshot(date, include_cap=True):
+    """
+    PyKRX 일괄 조회로 해당 거래일의 전체 시장 스냅샷을 만듭니다.
+
+    Args:
+        date (str): 거래일 (YYYYMMDD)
+        include_cap (bool): False 이면 시가총액 조회를 생략 (market_cap, shares 는 0)
+
+    Returns:
+        dict: {컬럼명: 배열} - 조회에 실패한 시장이 있으면 partial 이 True (is_final 이 아님)
+    """
+    from pykrx import stock
+
+    parts = []
+    failed = []
+    for market in STOCK_MARKETS:
+        try:
+            ohlcv = stock.get_market_ohlcv_by_ticker(date, market=market)
+            if ohlcv.empty:
+                continue
+            cap = stock.get_market_cap_by_ticker(date, market=market) if include_cap else None
+            parts.append(_frame_columns(ohlcv, market, cap))
+            print(f"{market} 스냅샷: {len(ohlcv)}개", file=sys.stderr)
+        except Exception as e:
+            print(f"{market} 스냅샷 조회 실패: {e}", file=sys.stderr)
+            failed.append(market)
+
+    try:
+        etf = stock.get_etf_ohlcv_by_ticker(date)
+        if not etf.empty:
+            parts.append(_frame_columns(etf, 'ETF'))
+            print(f"ETF 스냅샷: {len(etf)}개", file=sys.stderr)
+    except Exception as e:
+        print(f"ETF 스냅샷 조회 실패: {e}", file=sys.stderr)
+        failed.append('ETF')
+
+    if not parts:
+        raise Exception(f"{date} 시장 스냅샷 데이터가 없습니다.")
+
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    columns['date'] = np.array(date)
+    columns['fetched_at'] = np.array(time.time())
+    # 일부 시장이 빠진 스냅샷은 장중 스냅샷처럼 INTRADAY_MAX_AGE 뒤 다시 받음
+    columns['partial'] = np.array(bool(failed))
+    return columns
+
+
+def is_final(columns):
+    """
+    종가 확정 이후에 빠진 시장 없이 받은 데이터인지 여부
+    (스냅샷/투자자별 순매수/투자지표 공통, partial 이 없으면 예전 파일이므로 완전한 것으로 간주)
+    """
+    if 'partial' in columns and bool(columns['partial']):
+        return False
+    date = str(columns['date'])
+    settle = datetime.strptime(date, '%Y%m%d').replace(tzinfo=KST)
+    settle = settle.replace(hour=CLOSE_SETTLE.hour, minute=CLOSE_SETTLE.minute)
+    return float(columns['fetched_at']) >= settle.timestamp()
+
+
+def fill_change_pct(snapshot, previous=None):
+    """
+    스냅샷 등락률(%). 등락률 컬럼이 없는 종목(ETF)은 직전 거래일 스냅샷 종가로 계산하고,
+    그래도 알 수 없으면 NaN 으로 둡니다.
+    """
+    change_pct = snapshot['change_pct'].astype(np.float64)
+    missing = np.isnan(change_pct)
+    if previous is None or not len(previous['symbol']) or not missing.any():
+        return change_pct
+
+    order = np.argsort(previous['symbol'])
+    sorted_symbols = previous['symbol'][order]
+    pos = np.clip(np.searchsorted(sorted_symbols, snapshot['symbol']), 0, len(sorted_symbols) - 1)
+    found = sorted_symbols[pos] == snapshot['symbol']
+    prev_close = np.where(found, previous['close'][order][pos], 0).astype(np.float64)
+    fill = missing & (prev_close > 0)
+    change_pct[fill] = np.round((snapshot['close'][fill] - prev_close[fill]) / prev_close[fill] * 100, 2)
+    return change_pct
+
+
+def load_snapshot(date):
+    return load_columns(snapshot_path(date))
+
+
+def ensure_snapshot(date, max_age=INTRADAY_MAX_AGE):
+    """
+    저장된 스냅샷을 반환하고, 없거나 장중에 받은 오래된 스냅샷이면 새로 받아 저장합니다.
+    """
+    columns = load_snapshot(date)
+    if columns is not None:
+        if is_final(columns) or time.time() - float(columns['fetched_at']) < max_age:
+            return columns
+
+    columns = fetch_market_snapshot(date)
+    save_columns(snapshot_path(date), columns)
+    return columns
+
+
+def latest_snapshot(max_age=INTRADAY_MAX_AGE):
+    """
+    최근 거래일의 스냅샷
+    """
+    return ensure_snapshot(last_trading_day(), max_age)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fetch and store the whole-market daily snapshot')
+    parser.add_argument('--date', '-d', type=str, help='Trading date (YYYYMMDD), defaults to the last trading day')
+    args = parser.parse_args()
+
+    try:
+        date = args.date or last_trading_day()
+        columns = ensure_snapshot(date)
+        output = {
+            'success': True,
+            'date': date,
+            'count': int(len(columns['symbol'])),
+            'final': bool(is_final(columns)),
+            'timestamp': datetime.now().isoformat()
+        }
+        print(json.dumps(output, ensure_ascii=False, indent=2))
+    except Exception as e:
+        print(json.dumps({'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}, ensure_ascii=False, indent=2))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
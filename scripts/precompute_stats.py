@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+전체 종목 일별 통계 사전 계산 (야간 작업)
+최근 252거래일 스냅샷으로 거래일 x 종목 행렬을 만들고
+52주 최고/최저, 20/30일 평균 거래량, 전일 종가, 등락을 한 번에 계산합니다.
+검색 결과 정렬에 쓰는 종목별 인기 점수, 섹터/테마/그룹별 등락, 투자자별 순매수, 투자지표도 함께 갱신합니다.
+행렬은 지표 계산(indicators.py)용으로 history/ 에 함께 저장합니다.
+
+실행 예: python3 scripts/precompute_stats.py
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import warnings
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from shared_cache import CACHE_DIR, get_shared_cache
+from trading_calendar import last_final_trading_day, recent_trading_days
+from market_snapshot import ensure_snapshot, save_columns, load_columns, is_final
+from daily_stats import DAILY_STATS_NAMESPACE, YEAR_TRADING_DAYS, VOLUME_TRADING_DAYS
+from search_index import refresh_search_ranks
+from group_index import precompute_group_performance
+from investor_flow import ensure_flow
+from fundamentals import ensure_fundamentals
+
+STATS_DIR = os.path.join(CACHE_DIR, 'stats')
+HISTORY_DIR = os.path.join(CACHE_DIR, 'history')
+
+# 보관할 과거 행렬 세대 수
+HISTORY_KEEP = 2
+
+# 다음 야간 작업이 실패해도 며칠간은 통계를 사용 (호출 측에서 date 로 최신 여부 판단)
+STATS_TTL = timedelta(days=7)
+
+MATRIX_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def stats_path(date):
+    return os.path.join(STATS_DIR, f"{date}.npz")
+
+
+def load_stats_table(date):
+    """
+    해당 거래일의 통계 테이블 {컬럼명: 배열} (없으면 None)
+    """
+    return load_columns(stats_path(date))
+
+
+def build_price_matrix(days, snapshots):
+    """
+    거래일 x 종목 가격/거래량 행렬을 만듭니다.
+
+    종목 축은 마지막 거래일 스냅샷의 종목(정렬)이며,
+    상장 전/거래정지(종가 0) 칸은 NaN 입니다.
+
+    Returns:
+        tuple: (종목 배열, 시장 배열, {필드: (T, N) 행렬})
+    """
+    latest = snapshots[-1]
+    order = np.argsort(latest['symbol'])
+    symbols = latest['symbol'][order]
+    markets = latest['market'][order]
+
+    shape = (len(days), len(symbols))
+    matrix = {field: np.full(shape, np.nan) for field in MATRIX_FIELDS}
+
+    for row, columns in enumerate(snapshots):
+        pos = np.searchsorted(symbols, columns['symbol'])
+        pos = np.minimum(pos, len(symbols) - 1)
+        found = symbols[pos] == columns['symbol']
+        cols = pos[found]
+        for field in MATRIX_FIELDS:
+            matrix[field][row, cols] = columns[field][found]
+
+    halted = ~(matrix['close'] > 0)
+    for field in ('open', 'high', 'low', 'close'):
+        matrix[field][halted] = np.nan
+    matrix['volume'][halted] = np.nan
+
+    return symbols, markets, matrix
+
+
+def save_history(date, days, symbols, markets, matrix):
+    """
+    종목 x 거래일 행렬을 필드별 .npy 로 저장합니다. (종목별 행이 연속되도록 전치)
+
+    읽는 쪽은 mmap 으로 필요한 종목 행만 읽습니다. (load_history)
+    """
+    target = os.path.join(HISTORY_DIR, date)
+    temp_dir = f"{target}.{os.getpid()}.tmp"
+    os.makedirs(temp_dir, exist_ok=True)
+    np.save(os.path.join(temp_dir, 'symbols.npy'), symbols)
+    np.save(os.path.join(temp_dir, 'markets.npy'), markets)
+    np.save(os.path.join(temp_dir, 'days.npy'), np.array(days))
+    for field in MATRIX_FIELDS:
+        np.save(os.path.join(temp_dir, f"{field}.npy"), np.ascontiguousarray(matrix[field].T))
+
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    os.replace(temp_dir, target)
+
+    # 최신 세대 포인터 갱신
+    pointer = os.path.join(HISTORY_DIR, 'LATEST')
+    with open(f"{pointer}.tmp", 'w') as f:
+        f.write(date)
+    os.replace(f"{pointer}.tmp", pointer)
+
+    generations = sorted(name for name in os.listdir(HISTORY_DIR) if name.isdigit())
+    for name in generations[:-HISTORY_KEEP]:
+        shutil.rmtree(os.path.join(HISTORY_DIR, name), ignore_errors=True)
+
+
+def load_history():
+    """
+    최신 종목 x 거래일 행렬을 mmap 으로 엽니다. 없으면 None.
+
+    Returns:
+        dict: {'date', 'days', 'symbols', 'markets', 'open', 'high', 'low', 'close', 'volume'}
+    """
+    try:
+        with open(os.path.join(HISTORY_DIR, 'LATEST')) as f:
+            date = f.read().strip()
+    except OSError:
+        return None
+    directory = os.path.join(HISTORY_DIR, date)
+    history = {'date': date}
+    try:
+        for name in ('symbols', 'markets', 'days'):
+            history[name] = np.load(os.path.join(directory, f"{name}.npy"))
+        for field in MATRIX_FIELDS:
+            history[field] = np.load(os.path.join(directory, f"{field}.npy"), mmap_mode='r')
+    except OSError:
+        return None
+    return history
+
+
+def compute_statistics(matrix):
+    """
+    행렬 전체에 대해 종목별 통계를 벡터 연산으로 계산합니다.
+    """
+    high, low, close, volume = matrix['high'], matrix['low'], matrix['close'], matrix['volume']
+
+    with warnings.catch_warnings(), np.errstate(all='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+
+        prev_close = close[-2] if len(close) > 1 else np.full(close.shape[1], np.nan)
+        change = close[-1] - prev_close
+        change_pct = np.round(change / prev_close * 100, 2)
+
+        avg_volume_ratio_window = np.nanmean(volume[-VOLUME_TRADING_DAYS:], axis=0)
+        volume_ratio = np.round(volume[-1] / avg_volume_ratio_window * 100, 0)
+
+        stats = {
+            'open': matrix['open'][-1],
+            'high': high[-1],
+            'low': low[-1],
+            'close': close[-1],
+            'volume': volume[-1],
+            'prev_close': prev_close,
+            'change': change,
+            'change_pct': change_pct,
+            'high_52w': np.nanmax(high[-YEAR_TRADING_DAYS:], axis=0),
+            'low_52w': np.nanmin(low[-YEAR_TRADING_DAYS:], axis=0),
+            # 다음 거래일 시세와 합쳐 정확히 252거래일/21거래일 구간을 만들기 위한 값
+            'high_251': np.nanmax(high[-(YEAR_TRADING_DAYS - 1):], axis=0),
+            'low_251': np.nanmin(low[-(YEAR_TRADING_DAYS - 1):], axis=0),
+            'volume_sum_20': np.nansum(volume[-(VOLUME_TRADING_DAYS - 1):], axis=0),
+            'volume_count_20': np.sum(~np.isnan(volume[-(VOLUME_TRADING_DAYS - 1):]), axis=0).astype(np.float64),
+            'avg_volume_20': np.nanmean(volume[-20:], axis=0),
+            'avg_volume_30': np.nanmean(volume[-30:], axis=0),
+            'volume_ratio': volume_ratio,
+        }
+
+    return {name: np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0) for name, values in stats.items()}
+
+
+# 정수로 저장할 필드 (나머지는 실수)
+INTEGER_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'prev_close', 'change',
+                  'high_52w', 'low_52w', 'high_251', 'low_251', 'volume_sum_20', 'volume_count_20',
+                  'market_cap', 'shares', 'value')
+
+
+def to_records(date, symbols, markets, stats, latest):
+    """
+    통계 배열을 종목별 레코드 {종목코드: dict} 로 변환합니다.
+    """
+    pos = np.searchsorted(symbols, latest['symbol'])
+    extra = {}
+    for field in ('market_cap', 'shares', 'value'):
+        column = np.zeros(len(symbols))
+        column[pos] = latest[field]
+        extra[field] = column
+
+    columns = {**stats, **extra}
+    lists = {
+        name: (values.astype(np.int64) if name in INTEGER_FIELDS else values).tolist()
+        for name, values in columns.items()
+    }
+    records = {}
+    for i, symbol in enumerate(symbols.tolist()):
+        record = {name: values[i] for name, values in lists.items()}
+        record['date'] = date
+        record['final'] = True
+        record['market'] = str(markets[i])
+        records[symbol] = record
+    return records
+
+
+def precompute(date=None):
+    """
+    date(기본: 종가가 확정된 최근 거래일)까지 252거래일 통계를 계산해 저장합니다.
+
+    마지막 날 스냅샷이 장중 스냅샷이면 저장하지 않습니다. (장중 시세가 그날 종가로 굳지 않도록)
+    """
+    date = date or last_final_trading_day()
+    days = recent_trading_days(YEAR_TRADING_DAYS, date)
+
+    snapshots = []
+    for day in days:
+        try:
+            snapshots.append(ensure_snapshot(day))
+        except Exception as e:
+            print(f"{day} 스냅샷 없음: {e}", file=sys.stderr)
+            snapshots.append(None)
+    if snapshots[-1] is None:
+        raise Exception(f"{date} 스냅샷을 가져올 수 없습니다.")
+    if not is_final(snapshots[-1]):
+        raise Exception(f"{date} 종가가 아직 확정되지 않아 통계를 저장하지 않습니다.")
+    present = [i for i, columns in enumerate(snapshots) if columns is not None]
+    days = [days[i] for i in present]
+    snapshots = [snapshots[i] for i in present]
+
+    symbols, markets, matrix = build_price_matrix(days, snapshots)
+    stats = compute_statistics(matrix)
+
+    table = {'symbol': symbols, 'market': markets, **stats, 'date': np.array(date)}
+    save_columns(stats_path(date), table)
+    save_history(date, days, symbols, markets, matrix)
+
+    records = to_records(date, symbols, markets, stats, snapshots[-1])
+    expires_at = (datetime.now() + STATS_TTL).timestamp()
+    get_shared_cache().set_many(DAILY_STATS_NAMESPACE, records, expires_at)
+
+    # 검색 결과 정렬용 인기 점수 (시가총액/거래대금 + 관심종목 수)
+    try:
+        refresh_search_ranks(snapshots[-1])
+    except Exception as e:
+        print(f"검색 인기 점수 갱신 실패: {e}", file=sys.stderr)
+
+    # 섹터/테마/그룹별 등락 (히트맵용)
+    try:
+        precompute_group_performance(snapshots[-1], snapshots[-2] if len(snapshots) > 1 else None)
+    except Exception as e:
+        print(f"그룹별 등락 집계 실패: {e}", file=sys.stderr)
+
+    # 전 종목 투자자별 순매수 (관심종목 카드용)
+    try:
+        ensure_flow(date)
+    except Exception as e:
+        print(f"투자자별 순매수 저장 실패: {e}", file=sys.stderr)
+
+    # 전 종목 투자지표 (시세 응답/스크리너용)
+    try:
+        ensure_fundamentals(date)
+    except Exception as e:
+        print(f"투자지표 저장 실패: {e}", file=sys.stderr)
+
+    return {
+        'success': True,
+        'date': date,
+        'trading_days': len(days),
+        'symbols': len(symbols),
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute daily 52-week and volume statistics for all listings')
+    parser.add_argument('--date', '-d', type=str, help='Trading date (YYYYMMDD), defaults to the last trading day')
+    args = parser.parse_args()
+
+    try:
+        result = precompute(args.date)
+    except Exception as e:
+        result = {'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if not result['success']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+가격 알림 평가 엔진
+종목별로 상향(ABOVE)/하향(BELOW) 알림 가격을 정렬 배열로 유지하고,
+새 시세가 들어오면 이진 탐색으로 발동 구간만 잘라냅니다.
+발동 구간 탐색은 (가격이 바뀐 종목 수 x log 종목별 알림 수)이고, 발동/재무장된 알림을
+다른 배열로 옮기는 삽입/삭제는 list 원소 이동이라 건당 O(종목별 알림 수)입니다.
+(원소 이동은 memmove 라 종목당 알림 수천 개 수준까지는 탐색 비용과 차이가 작습니다)
+
+발동한 알림은 가격이 임계값에서 REARM_GAP 이상 되돌아가면 다시 무장되며,
+그 전까지는 같은 알림이 반복 발동하지 않습니다.
+"""
+
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+ABOVE = 'ABOVE'
+BELOW = 'BELOW'
+
+# 재무장 여유폭 (임계값 대비 비율)
+REARM_GAP = 0.01
+
+# 삭제된 알림 반영을 위한 전체 재적재 주기 (초)
+FULL_RELOAD_INTERVAL = 5 * 60
+
+# Prisma DateTime(TIMESTAMP(3), 시간대 없음) 컬럼은 UTC 로 저장되므로 DB 세션 시간대와 관계없이 UTC 로 기록
+UTC_NOW = "(now() AT TIME ZONE 'UTC')"
+
+
+class SortedBook:
+    """
+    (키, 알림 ID) 를 키 오름차순으로 유지하는 정렬 배열
+
+    탐색은 O(log n), 삽입/삭제는 list 원소 이동으로 O(n) 입니다.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.ids = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def insert(self, key, alert_id):
+        i = bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.ids.insert(i, alert_id)
+
+    def remove(self, key, alert_id):
+        i = bisect_left(self.keys, key)
+        while i < len(self.keys) and self.keys[i] == key:
+            if self.ids[i] == alert_id:
+                del self.keys[i]
+                del self.ids[i]
+                return True
+            i += 1
+        return False
+
+    def pop_prefix(self, end):
+        """
+        앞쪽 end 개를 꺼냅니다. [(키, ID), ...]
+        """
+        popped = list(zip(self.keys[:end], self.ids[:end]))
+        del self.keys[:end]
+        del self.ids[:end]
+        return popped
+
+    def pop_suffix(self, start):
+        """
+        start 이후를 꺼냅니다. [(키, ID), ...]
+        """
+        popped = list(zip(self.keys[start:], self.ids[start:]))
+        del self.keys[start:]
+        del self.ids[start:]
+        return popped
+
+
+class SymbolAlerts:
+    """
+    한 종목의 알림 정렬 배열 4개
+
+    - armed_above: 임계값 오름차순. 가격 >= 임계값인 앞부분이 발동
+    - armed_below: 임계값 오름차순. 가격 <= 임계값인 뒷부분이 발동
+    - fired_above: 재무장 가격(임계값 x (1-REARM_GAP)) 오름차순. 가격 < 재무장 가격인 뒷부분이 재무장
+    - fired_below: 재무장 가격(임계값 x (1+REARM_GAP)) 오름차순. 가격 > 재무장 가격인 앞부분이 재무장
+    """
+
+    def __init__(self):
+        self.armed_above = SortedBook()
+        self.armed_below = SortedBook()
+        self.fired_above = SortedBook()
+        self.fired_below = SortedBook()
+        self.thresholds = {}
+
+    def __len__(self):
+        return len(self.armed_above) + len(self.armed_below) + len(self.fired_above) + len(self.fired_below)
+
+    def _book(self, direction, armed):
+        if direction == ABOVE:
+            return self.armed_above if armed else self.fired_above
+        return self.armed_below if armed else self.fired_below
+
+    @staticmethod
+    def _key(direction, threshold, armed):
+        if armed:
+            return threshold
+        return threshold * (1 - REARM_GAP) if direction == ABOVE else threshold * (1 + REARM_GAP)
+
+    def add(self, alert_id, direction, threshold, armed):
+        self.thresholds[alert_id] = threshold
+        self._book(direction, armed).insert(self._key(direction, threshold, armed), alert_id)
+
+    def remove(self, alert_id, direction, threshold, armed):
+        self.thresholds.pop(alert_id, None)
+        return self._book(direction, armed).remove(self._key(direction, threshold, armed), alert_id)
+
+    def evaluate(self, price):
+        """
+        가격 하나로 발동/재무장할 알림을 찾아 상태를 옮깁니다.
+
+        Returns:
+            tuple: (발동 ID 목록, 재무장 ID 목록)
+        """
+        fired = []
+        rearmed = []
+
+        for _, alert_id in self.armed_above.pop_prefix(bisect_right(self.armed_above.keys, price)):
+            self.fired_above.insert(self._key(ABOVE, self.thresholds[alert_id], False), alert_id)
+            fired.append(alert_id)
+        for _, alert_id in self.armed_below.pop_suffix(bisect_left(self.armed_below.keys, price)):
+            self.fired_below.insert(self._key(BELOW, self.thresholds[alert_id], False), alert_id)
+            fired.append(alert_id)
+
+        for _, alert_id in self.fired_above.pop_suffix(bisect_right(self.fired_above.keys, price)):
+            self.armed_above.insert(self.thresholds[alert_id], alert_id)
+            rearmed.append(alert_id)
+        for _, alert_id in self.fired_below.pop_prefix(bisect_left(self.fired_below.keys, price)):
+            self.armed_below.insert(self.thresholds[alert_id], alert_id)
+            rearmed.append(alert_id)
+
+        return fired, rearmed
+
+
+class AlertIndex:
+    """
+    전체 알림 인덱스: {종목코드: SymbolAlerts} + {알림 ID: (종목, 방향, 임계값, 무장 여부)}
+    """
+
+    def __init__(self):
+        self.books = {}
+        self.alerts = {}
+        self.last_prices = {}
+        self.synced_at = None
+        self.reloaded_at = 0
+
+    def __len__(self):
+        return len(self.alerts)
+
+    def symbols(self):
+        return [symbol for symbol, book in self.books.items() if len(book)]
+
+    def upsert(self, alert_id, symbol, direction, threshold, armed):
+        self.discard(alert_id)
+        if direction not in (ABOVE, BELOW):
+            return
+        self.books.setdefault(symbol, SymbolAlerts()).add(alert_id, direction, threshold, armed)
+        self.alerts[alert_id] = (symbol, direction, threshold, armed)
+        # 새/변경된 알림은 현재 가격으로 다시 평가되도록
+        self.last_prices.pop(symbol, None)
+
+    def discard(self, alert_id):
+        previous = self.alerts.pop(alert_id, None)
+        if previous is not None:
+            symbol, direction, threshold, armed = previous
+            self.books[symbol].remove(alert_id, direction, threshold, armed)
+
+    def _set_armed(self, alert_id, armed):
+        symbol, direction, threshold, _ = self.alerts[alert_id]
+        self.alerts[alert_id] = (symbol, direction, threshold, armed)
+
+    def restore(self, alert_ids, armed):
+        """
+        evaluate() 로 옮긴 알림을 되돌립니다. (DB 반영 실패 시)
+
+        해당 종목의 직전 가격도 지우므로 다음 평가에서 다시 평가됩니다.
+        """
+        for alert_id in alert_ids:
+            if alert_id in self.alerts:
+                symbol, direction, threshold, _ = self.alerts[alert_id]
+                self.upsert(alert_id, symbol, direction, threshold, armed)
+
+    def evaluate(self, prices):
+        """
+        {종목코드: 가격} 중 직전 평가 이후 가격이 바뀐 종목만 평가합니다.
+
+        Returns:
+            tuple: ([(알림 ID, 가격), ...] 발동, [알림 ID, ...] 재무장)
+        """
+        fired = []
+        rearmed = []
+        for symbol, price in prices.items():
+            if price is None or self.last_prices.get(symbol) == price:
+                continue
+            self.last_prices[symbol] = price
+            book = self.books.get(symbol)
+            if book is None:
+                continue
+            symbol_fired, symbol_rearmed = book.evaluate(price)
+            for alert_id in symbol_fired:
+                self._set_armed(alert_id, False)
+                fired.append((alert_id, price))
+            for alert_id in symbol_rearmed:
+                self._set_armed(alert_id, True)
+                rearmed.append(alert_id)
+        return fired, rearmed
+
+    def sync(self, conn):
+        """
+        DB 의 알림을 반영합니다. 평소에는 변경분만, FULL_RELOAD_INTERVAL 마다 전체를 다시 읽습니다.
+        """
+        full = self.synced_at is None or time.time() - self.reloaded_at >= FULL_RELOAD_INTERVAL
+        rows = load_alerts(conn, None if full else self.synced_at)
+        if full:
+            self.books = {}
+            self.alerts = {}
+            self.reloaded_at = time.time()
+        for alert_id, symbol, direction, threshold, armed, updated_at in rows:
+            self.upsert(alert_id, symbol, direction, float(threshold), bool(armed))
+            if self.synced_at is None or updated_at > self.synced_at:
+                self.synced_at = updated_at
+        if self.synced_at is None:
+            # 알림이 하나도 없을 때도 다음부터는 변경분만 조회
+            self.synced_at = datetime(1970, 1, 1)
+        return len(rows)
+
+
+def load_alerts(conn, since=None):
+    """
+    알림을 읽습니다. since 가 있으면 그 이후 변경된 알림만.
+    """
+    query = 'SELECT id, symbol, direction, threshold, armed, "updatedAt" FROM price_alerts'
+    params = ()
+    if since is not None:
+        query += ' WHERE "updatedAt" > %s'
+        params = (since,)
+    with conn.cursor() as cursor:
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+
+def mark_fired(conn, fired):
+    """
+    발동한 알림을 기록합니다. 이미 다른 프로세스가 발동 처리한 알림은 제외됩니다.
+
+    Returns:
+        list: 이번에 실제로 발동 처리된 알림 ID
+    """
+    if not fired:
+        return []
+    with conn.cursor() as cursor:
+        values = ','.join(['(%s, %s)'] * len(fired))
+        params = [value for pair in fired for value in pair]
+        cursor.execute(
+            f'UPDATE price_alerts AS a SET armed = false, "triggeredAt" = {UTC_NOW}, '
+            f'"triggeredPrice" = v.price, "updatedAt" = {UTC_NOW} '
+            f'FROM (VALUES {values}) AS v(id, price) '
+            'WHERE a.id = v.id AND a.armed RETURNING a.id',
+            params
+        )
+        confirmed = [row[0] for row in cursor.fetchall()]
+    conn.commit()
+    return confirmed
+
+
+def mark_rearmed(conn, rearmed):
+    if not rearmed:
+        return 0
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE price_alerts SET armed = true, "updatedAt" = {UTC_NOW} WHERE id = ANY(%s) AND NOT armed',
+            (list(rearmed),)
+        )
+        count = cursor.rowcount
+    conn.commit()
+    return count
+
+
+def process_prices(index, conn, prices):
+    """
+    시세로 알림을 평가하고 DB 에 반영합니다.
+
+    DB 반영이 실패하면 인덱스에서 옮긴 알림을 되돌리고 예외를 그대로 올립니다.
+    (인덱스만 발동 상태가 되어 알림이 유실되지 않도록)
+
+    Returns:
+        dict: {'fired': [(알림 ID, 가격), ...], 'rearmed': 재무장 수}
+    """
+    fired, rearmed = index.evaluate(prices)
+    try:
+        confirmed = set(mark_fired(conn, fired))
+    except Exception:
+        conn.rollback()
+        index.restore([alert_id for alert_id, _ in fired], armed=True)
+        index.restore(rearmed, armed=False)
+        raise
+    try:
+        rearmed_count = mark_rearmed(conn, rearmed)
+    except Exception:
+        # 발동은 이미 커밋됨: 재무장만 되돌림
+        conn.rollback()
+        index.restore(rearmed, armed=False)
+        raise
+    fired = [(alert_id, price) for alert_id, price in fired if alert_id in confirmed]
+    for alert_id, price in fired:
+        symbol, direction, threshold, _ = index.alerts.get(alert_id, (None, None, None, None))
+        print(f"알림 발동 {alert_id}: {symbol} {price:,.0f} ({direction} {threshold:,.0f})", file=sys.stderr)
+    return {'fired': fired, 'rearmed': rearmed_count}
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+관심종목 시세 백그라운드 갱신 프로세스
+모든 사용자의 관심종목(watchlists)을 관심 사용자 수 순으로 정렬해
+장중에는 공유 캐시가 만료되기 전에 미리 갱신하고, 장 마감 후에는 다음 개장까지 쉽니다.
+한 주기의 조회는 여러 스레드로 동시에 하며, 시세 TTL 안에 끝나도록 시간 한도를 둡니다.
+갱신 주기마다 가격 알림(price_alerts)도 바뀐 시세에 대해서만 평가합니다.
+거래일마다 종가 확정(CLOSE_SETTLE) 후 한 번 투자자별 순매수(investor_flow)와
+투자지표(fundamentals)를 받아 저장합니다.
+
+실행 예: python3 scripts/quote_refresher.py
+"""
+
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from shared_cache import get_shared_cache
+from market_hours import now_kst, to_kst, is_trading_day, next_market_open, MARKET_OPEN, CLOSE_SETTLE, INTRADAY_TTL
+from database import get_connection, get_watched_symbols
+from fetch_stock_data import get_korean_stock_info, QUOTE_NAMESPACE, BOARD_FETCH_WORKERS
+from market_movers import refresh_movers, MOVERS_NAMESPACE
+from price_alerts import AlertIndex, process_prices
+from trading_calendar import last_final_trading_day
+from investor_flow import ensure_flow
+from fundamentals import ensure_fundamentals
+
+# 종가 확정 후 거래일마다 한 번 저장하는 일별 데이터
+DAILY_STORES = (ensure_flow, ensure_fundamentals)
+
+# 장중 갱신 주기 (초)
+CYCLE_INTERVAL = 10
+# 만료까지 이 시간(초) 이내로 남은 시세를 미리 갱신
+REFRESH_LEAD = 15
+# 한 주기에 갱신할 최대 종목 수 (실제로는 CYCLE_BUDGET 안에 조회한 만큼)
+BATCH_SIZE = 200
+# 동시에 조회할 종목 수 (관심종목 일괄 조회와 같음)
+REFRESH_WORKERS = BOARD_FETCH_WORKERS
+# 장중 한 주기 조회 시간 한도 (초) - 주기 시작에 갱신한 시세가 다음 주기 전에 만료되지 않도록
+CYCLE_BUDGET = INTRADAY_TTL - CYCLE_INTERVAL
+# 장 마감 후 관심종목 변경(신규 종목)을 확인하는 주기 (초)
+OFF_HOURS_INTERVAL = 10 * 60
+# 장중 시장 상위 종목 순위 갱신 주기 (초)
+MOVERS_INTERVAL = 60
+
+
+def in_session(moment=None):
+    """
+    정규장 및 종가 확정 구간(09:00~15:40) 여부
+    """
+    moment = to_kst(moment)
+    return is_trading_day(moment.date()) and MARKET_OPEN <= moment.time() < CLOSE_SETTLE
+
+
+def load_watched_symbols(alerts=None):
+    """
+    관심종목 목록을 DB에서 읽습니다. 실패하면 빈 목록.
+
+    가격 알림 인덱스가 주어지면 알림만 걸린 종목도 뒤에 덧붙입니다.
+    """
+    try:
+        conn = get_connection()
+        try:
+            watched = get_watched_symbols(conn)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"관심종목 조회 실패: {e}", file=sys.stderr)
+        watched = []
+
+    if alerts is not None:
+        known = {symbol for symbol, _ in watched}
+        watched += [(symbol, 0) for symbol in sorted(alerts.symbols()) if symbol not in known]
+    return watched
+
+
+def select_due(watched, lead=REFRESH_LEAD, limit=BATCH_SIZE):
+    """
+    캐시가 없거나 곧 만료되는 종목을 관심 사용자 수가 많은 순으로 limit 개까지 고릅니다.
+    """
+    cache = get_shared_cache()
+    deadline = time.time() + lead
+    due = []
+    for symbol, watchers in watched:
+        entry = cache.get_entry(QUOTE_NAMESPACE, symbol)
+        if entry is None or entry[1] <= deadline:
+            due.append(symbol)
+            if len(due) >= limit:
+                break
+    return due
+
+
+def refresh(symbols, deadline=None):
+    """
+    종목 시세를 REFRESH_WORKERS 개씩 동시에 새로 조회해 공유 캐시에 저장합니다.
+
+    deadline(epoch 초)이 지나면 아직 시작하지 않은 종목은 조회하지 않고 다음 주기로 넘깁니다.
+    (symbols 순서대로 시작하므로 관심 사용자가 많은 종목이 먼저 갱신됨)
+
+    Returns:
+        tuple: (성공 수, 실패 수, 건너뛴 수)
+    """
+    if not symbols:
+        return 0, 0, 0
+
+    def fetch(symbol):
+        if deadline is not None and time.time() >= deadline:
+            return None
+        return get_korean_stock_info(symbol, use_cache=False)
+
+    ok = failed = skipped = 0
+    with ThreadPoolExecutor(max_workers=min(REFRESH_WORKERS, len(symbols))) as pool:
+        for symbol, result in zip(symbols, pool.map(fetch, symbols)):
+            if result is None:
+                skipped += 1
+            elif result['success']:
+                ok += 1
+            else:
+                failed += 1
+                print(f"{symbol} 갱신 실패: {result.get('error')}", file=sys.stderr)
+    return ok, failed, skipped
+
+
+def evaluate_alerts(alerts):
+    """
+    알림 인덱스를 DB 와 맞춘 뒤, 알림 종목의 캐시 시세 중 바뀐 것만 평가합니다.
+
+    다른 프로세스(API 요청)가 갱신한 시세도 공유 캐시를 통해 함께 평가됩니다.
+    """
+    conn = get_connection()
+    try:
+        alerts.sync(conn)
+        quotes = get_shared_cache().get_many(QUOTE_NAMESPACE, alerts.symbols())
+        prices = {symbol: quote.get('price') for symbol, quote in quotes.items() if quote.get('success')}
+        return process_prices(alerts, conn, prices)
+    finally:
+        conn.close()
+
+
+def run_cycle(lead=REFRESH_LEAD, limit=BATCH_SIZE, alerts=None, budget=CYCLE_BUDGET):
+    """
+    한 주기: 관심종목을 읽어 만료 임박 종목을 budget 초 안에서 갱신합니다.
+    (limit=None 이면 전체, budget=None 이면 시간 한도 없음)
+
+    주기가 INTRADAY_TTL 보다 오래 걸리면 갱신 중에 시세가 만료되므로 경고를 남깁니다.
+    """
+    started = time.time()
+    watched = load_watched_symbols(alerts)
+    due = select_due(watched, lead, limit or len(watched))
+    ok, failed, skipped = refresh(due, started + budget if budget is not None else None)
+    elapsed = time.time() - started
+    if budget is not None and elapsed > INTRADAY_TTL:
+        print(f"갱신 주기가 {elapsed:.1f}초 걸려 시세 TTL({INTRADAY_TTL}초)을 넘었습니다. "
+              f"(대상 {len(due)}개, 건너뜀 {skipped}개)", file=sys.stderr)
+    stats = {'watched': len(watched), 'refreshed': ok, 'failed': failed, 'skipped': skipped,
+             'elapsed': round(elapsed, 1)}
+    if alerts is not None:
+        try:
+            stats['alerts_fired'] = len(evaluate_alerts(alerts)['fired'])
+        except Exception as e:
+            print(f"가격 알림 평가 실패: {e}", file=sys.stderr)
+    return stats
+
+
+def refresh_movers_if_due(last_refreshed, session):
+    """
+    장중에는 MOVERS_INTERVAL 마다, 장외에는 캐시가 비었을 때만 시장 상위 종목을 다시 계산합니다.
+
+    Returns:
+        float: 마지막 갱신 시각
+    """
+    if session:
+        due = time.time() - last_refreshed >= MOVERS_INTERVAL
+    else:
+        due = get_shared_cache().get(MOVERS_NAMESPACE, 'ALL') is None
+    if not due:
+        return last_refreshed
+    try:
+        refresh_movers()
+    except Exception as e:
+        print(f"시장 상위 종목 갱신 실패: {e}", file=sys.stderr)
+    return time.time()
+
+
+def store_daily_if_due(last_stored):
+    """
+    종가가 확정된 최근 거래일의 일별 데이터를 아직 저장하지 않았으면 받아 저장합니다.
+
+    실패하면 다음 주기에 다시 시도합니다.
+
+    Returns:
+        str: 마지막으로 저장한 거래일 ('YYYYMMDD')
+    """
+    day = last_final_trading_day()
+    if day == last_stored:
+        return last_stored
+    stored = True
+    for ensure in DAILY_STORES:
+        # 이미 저장된 확정 데이터는 다시 받지 않으므로 실패한 것만 다음 주기에 다시 받음
+        try:
+            ensure(day)
+        except Exception as e:
+            print(f"{day} 일별 데이터 저장 실패 ({ensure.__module__}): {e}", file=sys.stderr)
+            stored = False
+    return day if stored else last_stored
+
+
+def run_forever():
+    """
+    장중에는 CYCLE_INTERVAL 마다, 장 마감 후에는 다음 개장까지 간격을 늘려 반복합니다.
+    """
+    movers_refreshed = 0
+    daily_stored = None
+    alerts = AlertIndex()
+    while True:
+        started = time.time()
+        try:
+            session = in_session()
+            movers_refreshed = refresh_movers_if_due(movers_refreshed, session)
+            daily_stored = store_daily_if_due(daily_stored)
+            if session:
+                stats = run_cycle(alerts=alerts)
+                if stats['refreshed'] or stats['failed'] or stats['skipped']:
+                    print(f"[{now_kst():%H:%M:%S}] 갱신 {stats['refreshed']}개, 실패 {stats['failed']}개, "
+                          f"다음 주기로 {stats['skipped']}개 ({stats['elapsed']}초, 관심종목 {stats['watched']}개)",
+                          file=sys.stderr)
+                delay = CYCLE_INTERVAL
+            else:
+                # 장 마감 후: 캐시가 없는 종목만 채움 (종가 시세는 다음 개장까지 유효)
+                stats = run_cycle(lead=0, limit=None, alerts=alerts, budget=None)
+                if stats['refreshed']:
+                    print(f"[{now_kst():%H:%M:%S}] 장외 갱신 {stats['refreshed']}개", file=sys.stderr)
+                until_open = (next_market_open() - now_kst()).total_seconds()
+                delay = max(1, min(OFF_HOURS_INTERVAL, until_open))
+        except Exception as e:
+            print(f"갱신 주기 오류: {e}", file=sys.stderr)
+            delay = CYCLE_INTERVAL
+        time.sleep(max(0, delay - (time.time() - started)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh watched quotes into the shared cache')
+    parser.add_argument('--once', action='store_true', help='Run a single refresh cycle and exit')
+    args = parser.parse_args()
+
+    if args.once:
+        try:
+            stats = run_cycle(alerts=AlertIndex())
+            output = {'success': True, **stats, 'timestamp': datetime.now().isoformat()}
+        except Exception as e:
+            output = {'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}
+        print(json.dumps(output, ensure_ascii=False, indent=2))
+        return
+
+    print("관심종목 시세 갱신 프로세스 시작", file=sys.stderr)
+    run_forever()
+
+
+if __name__ == "__main__":
+    main()
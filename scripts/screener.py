@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+전체 종목 스크리너
+최근 거래일 전체 시장 스냅샷을 컬럼형 NumPy 배열로 읽어
+조건식을 벡터 불리언 마스크로 평가하고, 정렬/페이지 나눔까지 한 번에 처리합니다.
+
+조건식 예:
+  market == 'KOSDAQ' and change_pct > 5 and volume_ratio > 300 and market_cap >= 1e12
+  per > 0 and per < 10 and pbr < 1 and div >= 3
+
+실행 예: python3 scripts/screener.py --filter "change_pct > 5" --sort -value --limit 20
+"""
+
+import ast
+import sys
+import base64
+import json
+import argparse
+import warnings
+from datetime import datetime
+
+import numpy as np
+
+from trading_calendar import previous_trading_day
+from market_snapshot import latest_snapshot, load_snapshot, fill_change_pct
+from precompute_stats import load_stats_table
+from symbol_index import lookup_symbol
+from fundamentals import FUNDAMENTAL_FIELDS, QUOTE_FIELDS, RATIO_FIELDS, POSITIVE_FIELDS, stored_fundamentals, align
+
+# 조건식/정렬에 쓸 수 있는 컬럼
+SCREEN_COLUMNS = ('market', 'price', 'open', 'high', 'low', 'change_pct', 'volume', 'value',
+                  'volume_ratio', 'market_cap', 'high_52w', 'low_52w', *FUNDAMENTAL_FIELDS)
+
+# 결과 행의 필드명 (시세 API 와 같은 camelCase)
+RESULT_FIELDS = {
+    'market': 'market',
+    'price': 'price',
+    'change_pct': 'changePercent',
+    'volume': 'volume',
+    'value': 'tradingValue',
+    'volume_ratio': 'volumeRatio',
+    'market_cap': 'marketCap',
+    'high_52w': 'high52w',
+    'low_52w': 'low52w',
+    **QUOTE_FIELDS,
+}
+
+# 결과 행에서 소수로 내보내는 컬럼 (나머지는 정수)
+FLOAT_FIELDS = ('change_pct', *RATIO_FIELDS)
+
+MAX_LIMIT = 500
+
+_COMPARATORS = {
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+}
+
+
+class ScreenerError(ValueError):
+    pass
+
+
+def _stats_for(date):
+    """
+    스냅샷 날짜의 통계, 없으면 직전 거래일 통계 (없으면 None)
+    """
+    stats = load_stats_table(date)
+    if stats is None:
+        stats = load_stats_table(previous_trading_day(date))
+    return stats
+
+
+def load_screen_columns(snapshot=None):
+    """
+    스냅샷과 사전 계산 통계를 종목 축으로 맞춰 스크리너 컬럼을 만듭니다.
+
+    거래량 비중(volume_ratio, %)은 통계가 같은 날이면 그대로, 전일 통계면
+    최근 20거래일 합계에 오늘 거래량을 더해 21거래일 평균 대비로 계산합니다.
+    등락률이 없는 종목(ETF)은 직전 거래일 스냅샷 종가로 계산하고, 그래도 모르면 NaN 입니다.
+
+    Returns:
+        dict: {'date', 'symbol', 컬럼명: 배열, ...} (symbol 오름차순)
+    """
+    snapshot = snapshot if snapshot is not None else latest_snapshot()
+    date = str(snapshot['date'])
+    order = np.argsort(snapshot['symbol'])
+    change_pct = fill_change_pct(snapshot, load_snapshot(previous_trading_day(date)))
+
+    columns = {
+        'date': date,
+        'symbol': snapshot['symbol'][order],
+        'market': snapshot['market'][order],
+        'price': snapshot['close'][order].astype(np.float64),
+        'open': snapshot['open'][order].astype(np.float64),
+        'high': snapshot['high'][order].astype(np.float64),
+        'low': snapshot['low'][order].astype(np.float64),
+        'change_pct': change_pct[order],
+        'volume': snapshot['volume'][order].astype(np.float64),
+        'value': snapshot['value'][order].astype(np.float64),
+        'market_cap': snapshot['market_cap'][order].astype(np.float64),
+    }
+    count = len(columns['symbol'])
+    for name in ('volume_ratio', 'high_52w', 'low_52w'):
+        columns[name] = np.zeros(count)
+
+    stats = _stats_for(date)
+    if stats is not None and len(stats['symbol']):
+        pos = np.minimum(np.searchsorted(stats['symbol'], columns['symbol']), len(stats['symbol']) - 1)
+        found = stats['symbol'][pos] == columns['symbol']
+        rows = pos[found]
+        volume = columns['volume'][found]
+        if str(stats['date']) == date:
+            columns['volume_ratio'][found] = stats['volume_ratio'][rows]
+            columns['high_52w'][found] = stats['high_52w'][rows]
+            columns['low_52w'][found] = stats['low_52w'][rows]
+        else:
+            with np.errstate(all='ignore'):
+                average = (stats['volume_sum_20'][rows] + volume) / (stats['volume_count_20'][rows] + 1)
+                columns['volume_ratio'][found] = np.nan_to_num(np.round(volume / average * 100, 0))
+            columns['high_52w'][found] = np.maximum(stats['high_251'][rows], columns['high'][found])
+            low = stats['low_251'][rows]
+            columns['low_52w'][found] = np.where(low > 0, np.minimum(low, columns['low'][found]), columns['low'][found])
+
+    # 투자지표 (해당 날짜 이전 가장 최근 저장분, 없는 종목은 NaN)
+    # PER/PBR 0 이하(적자, 자본잠식)는 값 없음으로 두어 'per < 10' 같은 조건에 걸리지 않도록 함
+    fundamentals = align(stored_fundamentals(date), columns['symbol'])
+    for name in POSITIVE_FIELDS:
+        fundamentals[name][fundamentals[name] <= 0] = np.nan
+    columns.update(fundamentals)
+
+    return columns
+
+
+def _known(node, columns):
+    """
+    node 가 참조하는 숫자 컬럼 값이 모두 있는 (NaN 이 아닌) 행의 마스크
+    """
+    known = True
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and child.id in columns and columns[child.id].dtype.kind == 'f':
+            known = known & ~np.isnan(columns[child.id])
+    return known
+
+
+def _evaluate(node, columns):
+    """
+    조건식 AST 를 배열 연산으로 평가합니다. (허용된 노드만)
+
+    값을 모르는 (NaN) 행은 비교 결과가 참도 거짓도 아니므로 비교와 not 모두에서 제외합니다.
+    """
+    if isinstance(node, ast.Expression):
+        return _evaluate(node.body, columns)
+
+    if isinstance(node, ast.BoolOp):
+        masks = [_evaluate(value, columns) for value in node.values]
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        result = masks[0]
+        for mask in masks[1:]:
+            result = combine(result, mask)
+        return result
+
+    if isinstance(node, ast.UnaryOp):
+        operand = _evaluate(node.operand, columns)
+        if isinstance(node.op, ast.Not):
+            return np.logical_not(operand) & _known(node.operand, columns)
+        if isinstance(node.op, ast.USub):
+            return -operand
+        raise ScreenerError('지원하지 않는 연산자입니다.')
+
+    if isinstance(node, ast.Compare):
+        result = None
+        left = _evaluate(node.left, columns)
+        for op, comparator in zip(node.ops, node.comparators):
+            right = _evaluate(comparator, columns)
+            if isinstance(op, (ast.In, ast.NotIn)):
+                mask = np.isin(left, np.asarray(right))
+                if isinstance(op, ast.NotIn):
+                    mask = ~mask
+            elif type(op) in _COMPARATORS:
+                mask = _COMPARATORS[type(op)](left, right)
+            else:
+                raise ScreenerError('지원하지 않는 비교 연산자입니다.')
+            result = mask if result is None else result & mask
+            left = right
+        return result & _known(node, columns)
+
+    if isinstance(node, ast.BinOp):
+        left = _evaluate(node.left, columns)
+        right = _evaluate(node.right, columns)
+        operators = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide}
+        if type(node.op) not in operators:
+            raise ScreenerError('지원하지 않는 산술 연산자입니다.')
+        with np.errstate(all='ignore'):
+            return operators[type(node.op)](left, right)
+
+    if isinstance(node, ast.Name):
+        if node.id not in SCREEN_COLUMNS:
+            raise ScreenerError(f"알 수 없는 컬럼입니다: {node.id}")
+        return columns[node.id]
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str)):
+        return node.value
+
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return [_evaluate(element, columns) for element in node.elts]
+
+    raise ScreenerError('조건식에 사용할 수 없는 표현입니다.')
+
+
+def compile_filter(expression):
+    """
+    조건식 문자열을 파싱합니다. (문법 오류는 ScreenerError)
+    """
+    try:
+        return ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise ScreenerError(f"조건식 문법 오류: {e.msg}")
+
+
+def screen(columns, expression=None, sort='-market_cap', limit=50, offset=0):
+    """
+    조건에 맞는 종목을 정렬해 한 페이지를 반환합니다.
+
+    Args:
+        columns (dict): load_screen_columns() 결과
+        expression (str): 조건식 (None 이면 전체)
+        sort (str): 정렬 컬럼, '-' 접두사는 내림차순
+        limit (int): 페이지 크기
+        offset (int): 건너뛸 행 수
+
+    Returns:
+        dict: {'date', 'total', 'offset', 'limit', 'data': [행, ...]}
+    """
+    count = len(columns['symbol'])
+    if expression:
+        tree = compile_filter(expression)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                mask = np.broadcast_to(np.asarray(_evaluate(tree, columns), dtype=bool), (count,))
+        except ScreenerError:
+            raise
+        except (TypeError, ValueError) as e:
+            # 문자열 컬럼과 숫자 비교 등
+            raise ScreenerError(f"조건식을 평가할 수 없습니다: {e}")
+        selected = np.flatnonzero(mask)
+    else:
+        selected = np.arange(count)
+
+    descending = sort.startswith('-')
+    key = sort.lstrip('-+')
+    if key not in SCREEN_COLUMNS:
+        raise ScreenerError(f"정렬할 수 없는 컬럼입니다: {key}")
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    offset = max(0, int(offset))
+
+    values = columns[key][selected]
+    # 안정 정렬: 같은 값이면 종목코드 순
+    order = np.argsort(-values if descending and values.dtype.kind == 'f' else values, kind='stable')
+    if descending and values.dtype.kind != 'f':
+        order = order[::-1]
+    page = selected[order[offset:offset + limit]]
+
+    data = []
+    for i in page.tolist():
+        symbol = str(columns['symbol'][i])
+        indexed = lookup_symbol(symbol)
+        row = {'symbol': symbol, 'name': indexed['name'] if indexed else symbol}
+        for name, field in RESULT_FIELDS.items():
+            value = columns[name][i]
+            if name == 'market':
+                row[field] = str(value)
+            elif value.dtype.kind == 'f' and np.isnan(value):
+                row[field] = None
+            elif name in FLOAT_FIELDS:
+                row[field] = round(float(value), 2)
+            else:
+                row[field] = int(value)
+        data.append(row)
+
+    return {
+        'date': columns['date'],
+        'total': int(len(selected)),
+        'offset': offset,
+        'limit': limit,
+        'data': data
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Screen the whole market with vectorized filter expressions')
+    parser.add_argument('--filter', '-f', type=str, help="Filter expression, e.g. \"market == 'KOSDAQ' and change_pct > 5\"")
+    parser.add_argument('--filter-base64', type=str, help='Filter expression encoded as UTF-8 base64 (for shell-safe passing)')
+    parser.add_argument('--sort', type=str, default='-market_cap', help='Sort column, prefix with - for descending')
+    parser.add_argument('--limit', '-l', type=int, default=50, help='Page size')
+    parser.add_argument('--offset', type=int, default=0, help='Rows to skip')
+    args = parser.parse_args()
+
+    try:
+        expression = args.filter
+        if args.filter_base64:
+            expression = base64.b64decode(args.filter_base64).decode('utf-8')
+        result = screen(load_screen_columns(), expression, args.sort, args.limit, args.offset)
+        output = {'success': True, **result, 'timestamp': datetime.now().isoformat()}
+    except ScreenerError as e:
+        output = {'success': False, 'error': str(e), 'invalid_query': True, 'timestamp': datetime.now().isoformat()}
+    except Exception as e:
+        output = {'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    # 잘못된 조건식은 호출 측에서 400 으로 응답할 수 있도록 정상 종료
+    if not output['success'] and not output.get('invalid_query'):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+종목 검색 보조 인덱스 (SQLite)
+전체 종목 캐시를 만들 때 함께 생성되며, 정확/부분 일치 검색 결과가 부족할 때
+초성("ㅅㅅㅈㅈ")/로마자("samsung jeonja") 검색과 오타 허용(편집 거리 1) 검색에 사용됩니다.
+
+한글은 자모(키 입력) 단위로 분해해 비교하므로 "삼성전지" -> "삼성전자" 처럼
+한 번의 키 입력 오류가 거리 1 이 됩니다. 후보 탐색은 SymSpell 방식의
+삭제 사전(한 글자씩 지운 문자열 -> 원래 단어)으로 하므로 질의마다 전체를 훑지 않습니다.
+"""
+
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import argparse
+from datetime import datetime
+
+from shared_cache import CACHE_DIR
+from symbol_index import UNIVERSE_CACHE_PATH
+from universe_cache import load_universe
+
+SEARCH_INDEX_PATH = os.path.join(CACHE_DIR, 'search_index.db')
+SEARCH_RANKS_PATH = os.path.join(CACHE_DIR, 'search_ranks.json')
+
+# 시가총액이 없는 종목(ETF 등)의 규모 추정: 거래대금 x 배수
+VALUE_TO_CAP = 100
+
+# 관심종목 등록 수 가중치 (등록 사용자 수가 2배가 될 때마다 더해지는 점수)
+WATCH_WEIGHT = 0.5
+
+# 오타 허용 검색을 시도할 최소 질의 길이 (자모 기준)
+MIN_FUZZY_LENGTH = 4
+
+# 초성/로마자 검색을 시도할 최소 질의 길이
+MIN_CHOSUNG_LENGTH = 2
+MIN_ROMAN_LENGTH = 3
+
+# 한글 음절 분해 (키 입력 단위: 겹모음/겹받침은 두 키로 분해)
+CHOSUNG = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+JUNGSUNG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅗㅏ', 'ㅗㅐ', 'ㅗㅣ', 'ㅛ', 'ㅜ',
+            'ㅜㅓ', 'ㅜㅔ', 'ㅜㅣ', 'ㅠ', 'ㅡ', 'ㅡㅣ', 'ㅣ']
+JONGSUNG = ['', 'ㄱ', 'ㄲ', 'ㄱㅅ', 'ㄴ', 'ㄴㅈ', 'ㄴㅎ', 'ㄷ', 'ㄹ', 'ㄹㄱ', 'ㄹㅁ', 'ㄹㅂ', 'ㄹㅅ', 'ㄹㅌ',
+            'ㄹㅍ', 'ㄹㅎ', 'ㅁ', 'ㅂ', 'ㅂㅅ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+
+# 단독으로 입력된 겹자모 (예: "ㅘ") 도 키 입력 단위로 분해
+COMPOUND_JAMO = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+}
+
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+
+# 국어의 로마자 표기법 (음절 단위, 자음동화 등 음운 변화는 적용하지 않음)
+ROMAN_INITIAL = ['g', 'kk', 'n', 'd', 'tt', 'r', 'm', 'b', 'pp', 's', 'ss', '', 'j', 'jj', 'ch', 'k', 't', 'p', 'h']
+ROMAN_MEDIAL = ['a', 'ae', 'ya', 'yae', 'eo', 'e', 'yeo', 'ye', 'o', 'wa', 'wae', 'oe', 'yo', 'u',
+                'wo', 'we', 'wi', 'yu', 'eu', 'ui', 'i']
+ROMAN_FINAL = ['', 'k', 'k', 'k', 'n', 'n', 'n', 't', 'l', 'k', 'm', 'l', 'l', 'l',
+               'p', 'l', 'm', 'p', 'p', 't', 't', 'ng', 't', 't', 'k', 't', 'p', 't']
+
+# 사용자가 흔히 섞어 쓰는 표기를 한쪽으로 모음 (인덱스와 질의 모두에 적용)
+# 예: samseong / samsung, hyeondae / hyundai, jeonja / junja, nikseu / nix
+ROMAN_FOLDS = (('x', 'ks'), ('ai', 'ae'), ('eo', 'u'), ('oo', 'u'), ('sh', 's'),
+               ('g', 'k'), ('d', 't'), ('b', 'p'), ('r', 'l'))
+
+CHOSUNG_QUERY = re.compile(r'[ㄱ-ㅎ]+')
+ROMAN_QUERY = re.compile(r'[a-z0-9]*[a-z][a-z0-9]*')
+
+
+def normalize(text):
+    """
+    검색 비교용 정규화 (소문자, 공백 제거) - search_stocks 와 동일
+    """
+    return text.lower().replace(' ', '')
+
+
+def to_jamo(text):
+    """
+    한글 음절을 키 입력 단위 자모열로 분해합니다. 한글이 아닌 문자는 그대로 둡니다.
+    """
+    parts = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_END:
+            offset = code - HANGUL_BASE
+            parts.append(CHOSUNG[offset // 588])
+            parts.append(JUNGSUNG[(offset % 588) // 28])
+            parts.append(JONGSUNG[offset % 28])
+        else:
+            parts.append(COMPOUND_JAMO.get(char, char))
+    return ''.join(parts)
+
+
+def chosung_key(name):
+    """
+    이름의 한글 음절 초성만 이은 문자열 (예: "SK하이닉스" -> "ㅎㅇㄴㅅ")
+    """
+    return ''.join(
+        CHOSUNG[(ord(char) - HANGUL_BASE) // 588]
+        for char in name if HANGUL_BASE <= ord(char) <= HANGUL_END
+    )
+
+
+def fold_roman(text):
+    """
+    로마자 문자열을 비교용으로 접습니다. (소문자 영숫자만, 표기 변이 통일, 연속 중복 글자 제거)
+    """
+    text = re.sub(r'[^a-z0-9]', '', text.lower())
+    for source, target in ROMAN_FOLDS:
+        text = text.replace(source, target)
+    return re.sub(r'(.)\1+', r'\1', text)
+
+
+def roman_key(name):
+    """
+    이름을 로마자로 옮겨 접은 문자열 (예: "삼성전자" -> "samsunkjunja")
+    """
+    parts = []
+    for char in name:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_END:
+            offset = code - HANGUL_BASE
+            parts.append(ROMAN_INITIAL[offset // 588])
+            parts.append(ROMAN_MEDIAL[(offset % 588) // 28])
+            parts.append(ROMAN_FINAL[offset % 28])
+        else:
+            parts.append(char)
+    return fold_roman(''.join(parts))
+
+
+def name_keys(name):
+    """
+    한글이 들어간 이름의 접두사 검색 키 [(종류, 키), ...]
+    """
+    chosung = chosung_key(name)
+    if not chosung:
+        return []
+    return [('chosung', chosung), ('roman', roman_key(name))]
+
+
+def single_deletes(term):
+    """
+    한 글자씩 지운 문자열 집합 (원래 문자열 포함)
+    """
+    keys = {term}
+    for i in range(len(term)):
+        keys.add(term[:i] + term[i + 1:])
+    return keys
+
+
+def within_one_edit(a, b):
+    """
+    두 문자열의 편집 거리(삽입/삭제/치환/인접 전치)가 1 이하인지 여부
+    """
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la > lb:
+        a, b, la, lb = b, a, lb, la
+
+    i = 0
+    while i < la and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        # 치환 1회 또는 인접 두 글자 전치
+        if a[i + 1:] == b[i + 1:]:
+            return True
+        return i + 1 < la and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+    # b 에 한 글자 삽입
+    return a[i:] == b[i + 1:]
+
+
+def index_terms(stocks_data):
+    """
+    종목 리스트에서 검색 단어(정규화된 이름/키워드)와 종목 매핑을 만듭니다.
+
+    Returns:
+        tuple: ({단어: 단어 ID}, [(단어 ID, 종목코드, 'name'|'keyword')], {종목코드: (종목명, 시장)})
+    """
+    terms = {}
+    links = set()
+    entries = {}
+    for item in stocks_data:
+        symbol = item.get('symbol')
+        name = item.get('name')
+        if not symbol or not name or symbol in entries:
+            continue
+        entries[symbol] = (name, item.get('market', ''))
+
+        words = [(normalize(name), 'name')]
+        words += [(normalize(keyword), 'keyword') for keyword in item.get('search_keywords', [])]
+        for word, kind in words:
+            if not word:
+                continue
+            term_id = terms.setdefault(word, len(terms) + 1)
+            links.add((term_id, symbol, kind))
+    return terms, sorted(links), entries
+
+
+def build_search_index(stocks_data, index_path=None):
+    """
+    전체 종목 리스트로 검색 인덱스 파일을 새로 만듭니다. (임시 파일에 쓴 뒤 교체)
+
+    Returns:
+        int: 인덱스된 단어 수
+    """
+    index_path = index_path or SEARCH_INDEX_PATH
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    temp_path = f"{index_path}.{os.getpid()}.tmp"
+
+    terms, links, entries = index_terms(stocks_data)
+
+    conn = sqlite3.connect(temp_path)
+    try:
+        conn.execute(
+            'CREATE TABLE entries ('
+            ' symbol TEXT PRIMARY KEY,'
+            ' name TEXT NOT NULL,'
+            ' market TEXT NOT NULL'
+            ') WITHOUT ROWID'
+        )
+        conn.execute('CREATE TABLE terms (id INTEGER PRIMARY KEY, term TEXT NOT NULL, jamo TEXT NOT NULL)')
+        conn.execute(
+            'CREATE TABLE term_symbols ('
+            ' term_id INTEGER NOT NULL,'
+            ' symbol TEXT NOT NULL,'
+            ' kind TEXT NOT NULL,'
+            ' PRIMARY KEY (term_id, symbol, kind)'
+            ') WITHOUT ROWID'
+        )
+        conn.execute(
+            'CREATE TABLE prefix_keys ('
+            ' kind TEXT NOT NULL,'
+            ' key TEXT NOT NULL,'
+            ' symbol TEXT NOT NULL,'
+            ' PRIMARY KEY (kind, key, symbol)'
+            ') WITHOUT ROWID'
+        )
+        conn.execute(
+            'CREATE TABLE deletes ('
+            ' key TEXT NOT NULL,'
+            ' term_id INTEGER NOT NULL,'
+            ' PRIMARY KEY (key, term_id)'
+            ') WITHOUT ROWID'
+        )
+
+        conn.executemany('INSERT INTO entries VALUES (?, ?, ?)',
+                         ((symbol, name, market) for symbol, (name, market) in entries.items()))
+        conn.executemany(
+            'INSERT OR IGNORE INTO prefix_keys VALUES (?, ?, ?)',
+            ((kind, key, symbol) for symbol, (name, _) in entries.items() for kind, key in name_keys(name) if key)
+        )
+        jamo_terms = {term_id: to_jamo(term) for term, term_id in terms.items()}
+        conn.executemany('INSERT INTO terms VALUES (?, ?, ?)',
+                         ((term_id, term, jamo_terms[term_id]) for term, term_id in terms.items()))
+        conn.executemany('INSERT INTO term_symbols VALUES (?, ?, ?)', links)
+        conn.executemany(
+            'INSERT OR IGNORE INTO deletes VALUES (?, ?)',
+            ((key, term_id) for term_id, jamo in jamo_terms.items() for key in single_deletes(jamo))
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(temp_path, index_path)
+    _reset()
+    return len(terms)
+
+
+_connection = None
+
+
+def _reset():
+    global _connection
+    if _connection is not None:
+        _connection.close()
+        _connection = None
+
+
+def reload():
+    """
+    다른 프로세스가 인덱스/인기 점수 파일을 새로 만든 뒤, 오래 실행되는 프로세스가 다시 읽도록 합니다.
+    """
+    global _ranks
+    _reset()
+    _ranks = None
+
+
+def _connect():
+    """
+    검색 인덱스를 읽기 전용으로 연결합니다. 인덱스가 없으면 전체 종목 캐시에서 한 번 생성합니다.
+    """
+    global _connection
+    if _connection is None:
+        if not os.path.exists(SEARCH_INDEX_PATH):
+            if not os.path.exists(UNIVERSE_CACHE_PATH):
+                return None
+            stocks_data, _ = load_universe(UNIVERSE_CACHE_PATH)
+            count = build_search_index(stocks_data or [])
+            print(f"검색 인덱스 생성: 단어 {count}개", file=sys.stderr)
+        _connection = sqlite3.connect(f"file:{SEARCH_INDEX_PATH}?mode=ro", uri=True)
+    return _connection
+
+
+def build_search_ranks(snapshot, watch_counts=None, ranks_path=None):
+    """
+    검색 결과 정렬용 종목별 인기 점수를 계산해 저장합니다.
+
+    점수 = log10(시가총액, 없으면 거래대금 x VALUE_TO_CAP) + WATCH_WEIGHT x log2(1 + 관심 사용자 수)
+
+    Args:
+        snapshot (dict): 전체 시장 스냅샷 컬럼 (market_snapshot)
+        watch_counts (dict): {종목코드: 관심 사용자 수}
+
+    Returns:
+        int: 점수가 매겨진 종목 수
+    """
+    ranks_path = ranks_path or SEARCH_RANKS_PATH
+    watch_counts = watch_counts or {}
+    ranks = {}
+    for symbol, market_cap, value in zip(snapshot['symbol'].tolist(), snapshot['market_cap'].tolist(),
+                                         snapshot['value'].tolist()):
+        size = market_cap if market_cap > 0 else value * VALUE_TO_CAP
+        ranks[symbol] = math.log10(1 + size)
+    for symbol, watchers in watch_counts.items():
+        ranks[symbol] = ranks.get(symbol, 0.0) + WATCH_WEIGHT * math.log2(1 + watchers)
+
+    os.makedirs(os.path.dirname(ranks_path), exist_ok=True)
+    temp_path = f"{ranks_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'date': str(snapshot['date']), 'ranks': {symbol: round(rank, 4) for symbol, rank in ranks.items()}}, f)
+    os.replace(temp_path, ranks_path)
+    global _ranks
+    _ranks = None
+    return len(ranks)
+
+
+def refresh_search_ranks(snapshot):
+    """
+    스냅샷과 DB 관심종목 수로 인기 점수를 갱신합니다. (DB 를 쓸 수 없으면 스냅샷만)
+    """
+    watch_counts = {}
+    try:
+        from database import get_connection, get_watched_symbols
+        conn = get_connection()
+        try:
+            watch_counts = dict(get_watched_symbols(conn))
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"관심종목 수 조회 실패 (시장 규모만 사용): {e}", file=sys.stderr)
+    return build_search_ranks(snapshot, watch_counts)
+
+
+_ranks = None
+
+
+def load_search_ranks():
+    """
+    {종목코드: 인기 점수} (파일이 없으면 빈 dict)
+    """
+    global _ranks
+    if _ranks is None:
+        try:
+            with open(SEARCH_RANKS_PATH, 'r', encoding='utf-8') as f:
+                _ranks = json.load(f).get('ranks', {})
+        except (OSError, ValueError):
+            _ranks = {}
+    return _ranks
+
+
+def key_search(query, limit=20, exclude=(), market=None):
+    """
+    초성 또는 로마자 질의를 미리 만든 키에서 접두사로 찾습니다.
+    키가 질의와 같은 종목이 먼저, 그다음 인기 점수 순입니다.
+
+    Args:
+        query (str): 검색어 (초성만 또는 영문/숫자만일 때 사용)
+        limit (int): 최대 결과 수
+        exclude (iterable): 제외할 종목코드
+        market (str): 지정하면 해당 시장 종목만
+
+    Returns:
+        list: [{'symbol', 'name', 'market'}, ...]
+    """
+    text = normalize(query)
+    if CHOSUNG_QUERY.fullmatch(text) and len(text) >= MIN_CHOSUNG_LENGTH:
+        kind, key = 'chosung', text
+    elif ROMAN_QUERY.fullmatch(text) and len(text) >= MIN_ROMAN_LENGTH:
+        kind, key = 'roman', fold_roman(text)
+    else:
+        return []
+    if limit <= 0:
+        return []
+    excluded = set(exclude)
+
+    try:
+        conn = _connect()
+        if conn is None:
+            return []
+        rows = conn.execute(
+            'SELECT p.key, e.symbol, e.name, e.market FROM prefix_keys p'
+            ' JOIN entries e ON e.symbol = p.symbol'
+            ' WHERE p.kind = ? AND p.key >= ? AND p.key < ?',
+            (kind, key, key + '\U0010ffff')
+        ).fetchall()
+    except sqlite3.Error as e:
+        print(f"검색 인덱스 조회 실패: {e}", file=sys.stderr)
+        return []
+
+    ranks = load_search_ranks()
+    rows.sort(key=lambda row: (row[0] != key, -ranks.get(row[1], 0.0), row[1]))
+    results = []
+    for _, symbol, name, symbol_market in rows:
+        if symbol in excluded or (market and symbol_market != market):
+            continue
+        excluded.add(symbol)
+        results.append({'symbol': symbol, 'name': name, 'market': symbol_market})
+        if len(results) >= limit:
+            break
+    return results
+
+
+def fuzzy_search(query, limit=20, exclude=(), market=None):
+    """
+    편집 거리가 1 인 이름/키워드를 가진 종목을 찾습니다. (정확히 같은 단어는 앞선 검색 단계 몫)
+
+    Args:
+        query (str): 검색어
+        limit (int): 최대 결과 수
+        exclude (iterable): 제외할 종목코드 (앞선 검색 단계에서 이미 찾은 종목)
+        market (str): 지정하면 해당 시장 종목만
+
+    Returns:
+        list: [{'symbol', 'name', 'market'}, ...] 이름 일치가 키워드 일치보다 앞, 같으면 인기 점수 순
+    """
+    query_jamo = to_jamo(normalize(query))
+    if len(query_jamo) < MIN_FUZZY_LENGTH or limit <= 0:
+        return []
+
+    try:
+        conn = _connect()
+        if conn is None:
+            return []
+        keys = list(single_deletes(query_jamo))
+        placeholders = ','.join('?' * len(keys))
+        rows = conn.execute(
+            'SELECT t.jamo, s.symbol, s.kind, e.name, e.market FROM deletes d'
+            ' JOIN terms t ON t.id = d.term_id'
+            ' JOIN term_symbols s ON s.term_id = t.id'
+            ' JOIN entries e ON e.symbol = s.symbol'
+            f' WHERE d.key IN ({placeholders}) AND t.jamo != ?',
+            keys + [query_jamo]
+        ).fetchall()
+    except sqlite3.Error as e:
+        print(f"검색 인덱스 조회 실패: {e}", file=sys.stderr)
+        return []
+
+    excluded = set(exclude)
+    matches = {}
+    for jamo, symbol, kind, name, symbol_market in rows:
+        if symbol in excluded or (market and symbol_market != market) or not within_one_edit(query_jamo, jamo):
+            continue
+        order = 0 if kind == 'name' else 1
+        if symbol not in matches or order < matches[symbol][0]:
+            matches[symbol] = (order, name, symbol_market)
+
+    ranks = load_search_ranks()
+    ranked = sorted(matches.items(), key=lambda item: (item[1][0], -ranks.get(item[0], 0.0), item[0]))
+    return [
+        {'symbol': symbol, 'name': name, 'market': market}
+        for symbol, (_, name, market) in ranked[:limit]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the fuzzy search index')
+    parser.add_argument('--build', action='store_true', help='Rebuild the index from the universe cache')
+    parser.add_argument('--cache', '-c', type=str, help='Universe cache file path')
+    parser.add_argument('--search', '-s', type=str, help='Query to look up')
+    parser.add_argument('--limit', '-l', type=int, default=20, help='Result limit')
+    parser.add_argument('--ranks', action='store_true', help='Rebuild popularity ranks from the latest snapshot and watchlists')
+    args = parser.parse_args()
+
+    try:
+        if args.build:
+            stocks_data, _ = load_universe(args.cache or UNIVERSE_CACHE_PATH)
+            if stocks_data is None:
+                raise Exception('전체 종목 캐시가 없습니다.')
+            count = build_search_index(stocks_data)
+            output = {'success': True, 'terms': count, 'timestamp': datetime.now().isoformat()}
+        elif args.ranks:
+            from market_snapshot import latest_snapshot
+            count = refresh_search_ranks(latest_snapshot())
+            output = {'success': True, 'ranked': count, 'timestamp': datetime.now().isoformat()}
+        elif args.search:
+            results = fuzzy_search(args.search, args.limit)
+            output = {'success': True, 'query': args.search, 'results': results, 'timestamp': datetime.now().isoformat()}
+        else:
+            parser.print_help()
+            return
+        print(json.dumps(output, ensure_ascii=False, indent=2))
+    except Exception as e:
+        print(json.dumps({'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}, ensure_ascii=False, indent=2))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
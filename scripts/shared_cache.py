@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+프로세스 간 공유 캐시 (SQLite WAL)
+여러 Python 프로세스/레플리카가 같은 디스크 캐시를 읽고 씁니다.
+SQLite 연결은 만든 스레드에서만 쓸 수 있으므로 스레드마다 따로 엽니다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# 캐시 디렉토리 (환경변수로 변경 가능)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.getenv('STOCK_CACHE_DIR', os.path.join(PROJECT_ROOT, '.cache', 'stock-data'))
+CACHE_DB_PATH = os.path.join(CACHE_DIR, 'shared_cache.db')
+
+
+class SharedCache:
+    """
+    (namespace, key) -> JSON 값을 만료시각과 함께 저장하는 캐시
+
+    만료시각(expires_at)은 epoch 초 단위이며, 호출하는 쪽에서 TTL 정책을 정합니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or CACHE_DB_PATH
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                ' namespace TEXT NOT NULL,'
+                ' key TEXT NOT NULL,'
+                ' value TEXT NOT NULL,'
+                ' expires_at REAL NOT NULL,'
+                ' updated_at REAL NOT NULL,'
+                ' PRIMARY KEY (namespace, key)'
+                ') WITHOUT ROWID'
+            )
+            self._local.conn = conn
+        return conn
+
+    def get_entry(self, namespace, key):
+        """
+        만료 여부와 관계없이 (값, 만료시각)을 반환합니다. 없으면 None.
+        """
+        row = self._connect().execute(
+            'SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?',
+            (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def get(self, namespace, key):
+        """
+        만료되지 않은 값만 반환합니다.
+        """
+        entry = self.get_entry(namespace, key)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def get_many(self, namespace, keys):
+        """
+        여러 키를 한 번에 조회합니다. 만료되지 않은 값만 {key: value} 로 반환합니다.
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        conn = self._connect()
+        now = time.time()
+        found = {}
+        # SQLite 바인딩 변수 제한을 피하기 위해 나눠서 조회
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f'SELECT key, value FROM cache WHERE namespace = ? AND key IN ({placeholders}) AND expires_at > ?',
+                [namespace, *chunk, now]
+            ).fetchall()
+            for key, value in rows:
+                found[key] = json.loads(value)
+        return found
+
+    def set(self, namespace, key, value, expires_at):
+        self._connect().execute(
+            'INSERT OR REPLACE INTO cache (namespace, key, value, expires_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+            (namespace, key, json.dumps(value, ensure_ascii=False), float(expires_at), time.time())
+        )
+
+    def set_many(self, namespace, items, expires_at):
+        """
+        {key: value} 를 하나의 트랜잭션으로 저장합니다.
+        """
+        conn = self._connect()
+        now = time.time()
+        rows = [
+            (namespace, key, json.dumps(value, ensure_ascii=False), float(expires_at), now)
+            for key, value in items.items()
+        ]
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT OR REPLACE INTO cache (namespace, key, value, expires_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def delete(self, namespace, key):
+        self._connect().execute('DELETE FROM cache WHERE namespace = ? AND key = ?', (namespace, key))
+
+    def purge_expired(self):
+        """
+        만료된 항목을 정리합니다. 삭제된 행 수를 반환합니다.
+        """
+        cursor = self._connect().execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(),))
+        return cursor.rowcount
+
+
+_shared_cache = None
+
+
+def get_shared_cache():
+    """
+    프로세스 내 싱글톤 SharedCache 를 반환합니다.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = SharedCache()
+    return _shared_cache
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+프로세스 간 single-flight 요청 병합
+같은 (작업, 인자) 조회가 동시에 여러 프로세스에서 들어오면
+하나만 실제로 업스트림을 호출하고 나머지는 그 결과를 기다렸다가 공유합니다.
+
+잠금은 flock 파일 잠금을 사용하므로 프로세스가 죽으면 자동으로 풀립니다.
+오래된 잠금/결과 파일은 선행 요청이 끝날 때 PRUNE_INTERVAL 마다 한 번 정리합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import hashlib
+
+from shared_cache import CACHE_DIR
+
+FLIGHT_DIR = os.path.join(CACHE_DIR, 'flight')
+
+# 선행 요청을 기다리는 동안의 확인 간격 (초)
+POLL_INTERVAL = 0.02
+
+# 이보다 오래된 잠금/결과 파일은 정리 (초). 가장 긴 wait_timeout 보다 길어야 함
+FLIGHT_FILE_TTL = 10 * 60
+# 정리 주기 (초)
+PRUNE_INTERVAL = 10 * 60
+
+
+def flight_key(operation, args):
+    payload = json.dumps([operation, args], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _write_result(path, result):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def _read_result(path, since):
+    """
+    since 이후에 기록된 결과만 읽습니다. 없으면 None.
+    """
+    try:
+        if os.path.getmtime(path) < since:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def prune_flight_files(max_age=FLIGHT_FILE_TTL, now=None):
+    """
+    max_age 보다 오래된 잠금/결과 파일을 지웁니다. (PRUNE_INTERVAL 에 한 번만 실제로 정리)
+
+    잠금 파일은 flock 을 잡을 수 있을 때(사용 중이 아닐 때)만 지웁니다.
+    지우는 순간 옛 파일을 열어 둔 프로세스가 있으면 한 번 중복 조회될 수 있지만 결과는 같습니다.
+
+    Returns:
+        int: 지운 파일 수
+    """
+    now = now or time.time()
+    marker = os.path.join(FLIGHT_DIR, '.pruned')
+    try:
+        if now - os.path.getmtime(marker) < PRUNE_INTERVAL:
+            return 0
+    except OSError:
+        pass
+    try:
+        with open(marker, 'w'):
+            pass
+        entries = list(os.scandir(FLIGHT_DIR))
+    except OSError:
+        return 0
+
+    removed = 0
+    for entry in entries:
+        if entry.name.startswith('.'):
+            continue
+        try:
+            if now - entry.stat().st_mtime < max_age:
+                continue
+            if entry.name.endswith('.lock'):
+                fd = os.open(entry.path, os.O_RDWR)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    os.unlink(entry.path)
+                finally:
+                    os.close(fd)
+            else:
+                os.unlink(entry.path)
+            removed += 1
+        except (BlockingIOError, OSError):
+            continue
+    return removed
+
+
+def single_flight(operation, args, fn, wait_timeout=60, check=None):
+    """
+    (operation, args) 단위로 fn() 호출을 병합합니다.
+
+    Args:
+        operation (str): 작업 이름 (예: 'quote')
+        args: 작업 인자 (JSON 직렬화 가능)
+        fn (callable): 실제 조회 함수. 결과는 JSON 직렬화 가능해야 합니다.
+        wait_timeout (float): 선행 요청을 기다릴 최대 시간(초). 초과하면 직접 호출
+        check (callable): 잠금을 잡은 뒤 먼저 확인할 함수 (예: 캐시 조회).
+            None 이 아닌 값을 돌려주면 fn() 을 호출하지 않고 그 값을 반환합니다.
+
+    Returns:
+        fn() 의 결과 (선행 요청이 있었다면 그 결과)
+    """
+    os.makedirs(FLIGHT_DIR, exist_ok=True)
+    key = flight_key(operation, args)
+    lock_path = os.path.join(FLIGHT_DIR, f"{key}.lock")
+    result_path = os.path.join(FLIGHT_DIR, f"{key}.json")
+
+    started = time.time()
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # 다른 프로세스가 조회 중: 끝날 때까지 기다린 뒤 결과 공유
+            deadline = started + wait_timeout
+            while True:
+                time.sleep(POLL_INTERVAL)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.time() >= deadline:
+                        print(f"{operation} 선행 요청 대기 시간 초과, 직접 조회", file=sys.stderr)
+                        return fn()
+
+            shared = _read_result(result_path, started)
+            if shared is not None:
+                return shared
+            # 선행 요청이 결과 없이 끝났으면(오류/종료) 직접 조회
+
+        # 캐시 확인과 잠금 사이에 다른 프로세스가 이미 조회를 끝냈을 수 있음
+        if check is not None:
+            checked = check()
+            if checked is not None:
+                return checked
+
+        result = fn()
+        try:
+            _write_result(result_path, result)
+        except Exception as e:
+            print(f"single-flight 결과 저장 실패: {e}", file=sys.stderr)
+        prune_flight_files()
+        return result
+    finally:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
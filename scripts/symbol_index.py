@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+종목코드 -> (종목명, 상품유형, 시장) 인덱스
+전체 종목 캐시를 만들 때 함께 생성되는 SQLite 파일로,
+종목 분류/이름 조회에 네트워크나 전체 JSON 파싱이 필요 없습니다.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import argparse
+import threading
+from datetime import datetime
+
+from shared_cache import CACHE_DIR, PROJECT_ROOT
+from universe_cache import load_universe
+
+SYMBOL_INDEX_PATH = os.path.join(CACHE_DIR, 'symbol_index.db')
+UNIVERSE_CACHE_PATH = os.getenv('UNIVERSE_CACHE_PATH', os.path.join(PROJECT_ROOT, 'all_stocks_cache.json'))
+
+# 시장 구분 -> 상품유형
+STOCK_MARKETS = ('KOSPI', 'KOSDAQ', 'KONEX')
+
+
+def instrument_type(market):
+    """
+    전체 종목 캐시의 market 값에서 상품유형(STOCK/ETF/ETN/INDEX)을 구합니다.
+    """
+    return 'STOCK' if market in STOCK_MARKETS else market
+
+
+def build_symbol_index(stocks_data, index_path=None):
+    """
+    전체 종목 리스트로 인덱스 파일을 새로 만듭니다. (임시 파일에 쓴 뒤 교체)
+
+    Args:
+        stocks_data (list): create_stock_info 형식의 종목 리스트
+        index_path (str): 인덱스 파일 경로
+
+    Returns:
+        int: 인덱스된 종목 수
+    """
+    index_path = index_path or SYMBOL_INDEX_PATH
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    temp_path = f"{index_path}.{os.getpid()}.tmp"
+
+    rows = {}
+    for item in stocks_data:
+        symbol = item.get('symbol')
+        if symbol and symbol not in rows:
+            market = item.get('market', '')
+            rows[symbol] = (symbol, item.get('name', ''), instrument_type(market), market)
+
+    conn = sqlite3.connect(temp_path)
+    try:
+        conn.execute(
+            'CREATE TABLE symbols ('
+            ' symbol TEXT PRIMARY KEY,'
+            ' name TEXT NOT NULL,'
+            ' type TEXT NOT NULL,'
+            ' market TEXT NOT NULL'
+            ') WITHOUT ROWID'
+        )
+        conn.executemany('INSERT INTO symbols VALUES (?, ?, ?, ?)', rows.values())
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(temp_path, index_path)
+    _reset()
+    return len(rows)
+
+
+def build_from_universe_cache(cache_file=None, index_path=None):
+    """
+    전체 종목 캐시(시장별 파일 포함)에서 인덱스를 만듭니다.
+    """
+    stocks_data, _ = load_universe(cache_file or UNIVERSE_CACHE_PATH)
+    if stocks_data is None:
+        raise FileNotFoundError(cache_file or UNIVERSE_CACHE_PATH)
+    return build_symbol_index(stocks_data, index_path)
+
+
+def is_index_stale(cache_file=None, index_path=None):
+    """
+    인덱스가 없거나 전체 종목 캐시보다 오래되었는지 여부
+    """
+    cache_file = cache_file or UNIVERSE_CACHE_PATH
+    index_path = index_path or SYMBOL_INDEX_PATH
+    try:
+        return os.path.getmtime(index_path) < os.path.getmtime(cache_file)
+    except OSError:
+        return not os.path.exists(index_path)
+
+
+_connection = None
+# 관심종목 일괄 조회처럼 여러 스레드가 같은 읽기 전용 연결을 쓰므로 연결/조회를 직렬화
+_lock = threading.RLock()
+
+
+def _reset():
+    global _connection
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+
+
+def _connect():
+    """
+    인덱스를 읽기 전용으로 연결합니다. 인덱스가 없으면 전체 종목 캐시에서 한 번 생성합니다. (_lock 안에서 호출)
+    """
+    global _connection
+    if _connection is None:
+        if not os.path.exists(SYMBOL_INDEX_PATH):
+            if not os.path.exists(UNIVERSE_CACHE_PATH):
+                return None
+            count = build_from_universe_cache()
+            print(f"종목 인덱스 생성: {count}개", file=sys.stderr)
+        _connection = sqlite3.connect(f"file:{SYMBOL_INDEX_PATH}?mode=ro", uri=True, check_same_thread=False)
+    return _connection
+
+
+def lookup_symbol(symbol):
+    """
+    종목코드로 인덱스를 조회합니다.
+
+    Returns:
+        dict | None: {'symbol', 'name', 'type', 'market'}
+    """
+    try:
+        with _lock:
+            conn = _connect()
+            if conn is None:
+                return None
+            row = conn.execute(
+                'SELECT symbol, name, type, market FROM symbols WHERE symbol = ?', (symbol,)
+            ).fetchone()
+    except sqlite3.Error as e:
+        print(f"종목 인덱스 조회 실패: {e}", file=sys.stderr)
+        return None
+    if row is None:
+        return None
+    return {'symbol': row[0], 'name': row[1], 'type': row[2], 'market': row[3]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the symbol index')
+    parser.add_argument('--build', action='store_true', help='Rebuild the index from the universe cache')
+    parser.add_argument('--cache', '-c', type=str, help='Universe cache file path')
+    parser.add_argument('--symbol', '-s', type=str, help='Symbol to look up')
+    args = parser.parse_args()
+
+    try:
+        if args.build:
+            count = build_from_universe_cache(args.cache)
+            output = {'success': True, 'indexed': count, 'timestamp': datetime.now().isoformat()}
+        elif args.symbol:
+            entry = lookup_symbol(args.symbol)
+            output = {'success': entry is not None, 'data': entry, 'timestamp': datetime.now().isoformat()}
+        else:
+            parser.print_help()
+            return
+        print(json.dumps(output, ensure_ascii=False, indent=2))
+    except Exception as e:
+        print(json.dumps({'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}, ensure_ascii=False, indent=2))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
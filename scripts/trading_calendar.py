@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+KRX 거래일 달력
+PyKRX 영업일 데이터를 월 단위로 공유 캐시에 저장해 두고
+최근/직전 거래일과 N거래일 구간을 계산합니다.
+"""
+
+import sys
+import argparse
+import json
+from datetime import datetime, timedelta, date
+
+from shared_cache import get_shared_cache
+from market_hours import KST, MARKET_OPEN, CLOSE_SETTLE, to_kst
+
+CALENDAR_NAMESPACE = 'trading_calendar'
+
+# 지나간 달의 영업일은 바뀌지 않으므로 사실상 영구 보관
+PAST_MONTH_TTL = 10 * 365 * 24 * 3600
+# 이번 달 영업일 목록은 장 시작 직후 오늘이 반영되도록 재조회
+CURRENT_MONTH_REFRESH = timedelta(minutes=10)
+
+# 한 번에 거슬러 올라갈 최대 개월 수 (무한 루프 방지)
+MAX_MONTHS_BACK = 120
+
+
+def _month_key(year, month):
+    return f"{year:04d}{month:02d}"
+
+
+def _previous_month(year, month):
+    return (year - 1, 12) if month == 1 else (year, month - 1)
+
+
+def _fetch_month(year, month):
+    """
+    PyKRX에서 해당 월의 영업일 목록을 가져옵니다.
+    """
+    from pykrx import stock
+    days = stock.get_previous_business_days(year=year, month=month)
+    return sorted(day.strftime('%Y%m%d') for day in days)
+
+
+def get_month_calendar(year, month, now=None):
+    """
+    해당 월의 영업일 정보를 반환합니다.
+
+    Returns:
+        dict: {'days': ['YYYYMMDD', ...], 'as_of': ISO 시각}
+              as_of 이후의 날짜는 아직 확인되지 않은 날입니다.
+    """
+    now = to_kst(now)
+    key = _month_key(year, month)
+    cache = get_shared_cache()
+
+    try:
+        cached = cache.get(CALENDAR_NAMESPACE, key)
+        if cached is not None:
+            return cached
+    except Exception as e:
+        print(f"거래일 캐시 조회 실패: {e}", file=sys.stderr)
+
+    if (year, month) > (now.year, now.month):
+        return {'days': [], 'as_of': now.isoformat()}
+
+    try:
+        days = _fetch_month(year, month)
+    except Exception as e:
+        print(f"거래일 조회 실패 ({key}): {e}", file=sys.stderr)
+        return None
+
+    entry = {'days': days, 'as_of': now.isoformat()}
+
+    if (year, month) < (now.year, now.month):
+        expires_at = now.timestamp() + PAST_MONTH_TTL
+    else:
+        # 오늘이 반영되는 시점(개장 + 여유)까지 또는 다음 날 개장 직후까지
+        today_open = datetime.combine(now.date(), MARKET_OPEN, tzinfo=KST)
+        refresh_at = today_open + CURRENT_MONTH_REFRESH
+        if now >= refresh_at:
+            refresh_at += timedelta(days=1)
+        expires_at = refresh_at.timestamp()
+
+    try:
+        cache.set(CALENDAR_NAMESPACE, key, entry, expires_at)
+    except Exception as e:
+        print(f"거래일 캐시 저장 실패: {e}", file=sys.stderr)
+
+    return entry
+
+
+def is_trading_day(day, now=None):
+    """
+    거래일 여부를 반환합니다.
+
+    아직 확인되지 않은 날(미래, 또는 오늘 개장 전)은 주말만 제외합니다.
+    """
+    if isinstance(day, str):
+        day = datetime.strptime(day, '%Y%m%d').date()
+    if day.weekday() >= 5:
+        return False
+
+    entry = get_month_calendar(day.year, day.month, now)
+    if entry is None:
+        return True
+
+    as_of = datetime.fromisoformat(entry['as_of'])
+    confirmed_until = datetime.combine(day, MARKET_OPEN, tzinfo=KST) + CURRENT_MONTH_REFRESH
+    if as_of < confirmed_until:
+        return True
+    return day.strftime('%Y%m%d') in entry['days']
+
+
+def _iter_trading_days_desc(end_day, now=None):
+    """
+    end_day(포함)부터 과거로 거래일을 'YYYYMMDD' 문자열로 순회합니다.
+    """
+    now = to_kst(now)
+    end_key = end_day.strftime('%Y%m%d')
+    year, month = end_day.year, end_day.month
+
+    for _ in range(MAX_MONTHS_BACK):
+        entry = get_month_calendar(year, month, now)
+        if entry is None:
+            # 달력 조회 실패 시 평일 기준으로 대체
+            first = date(year, month, 1)
+            day = min(end_day, (first.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1))
+            days = []
+            while day >= first:
+                if day.weekday() < 5:
+                    days.append(day.strftime('%Y%m%d'))
+                day -= timedelta(days=1)
+            days.reverse()
+        else:
+            days = list(entry['days'])
+            # 아직 확인되지 않은 평일(오늘 개장 직후 등)은 거래일로 간주
+            as_of_day = datetime.fromisoformat(entry['as_of']).date()
+            day = as_of_day
+            while day <= end_day and day.month == month and day.year == year:
+                key = day.strftime('%Y%m%d')
+                if key not in days and is_trading_day(day, now):
+                    days.append(key)
+                day += timedelta(days=1)
+            days.sort()
+
+        for key in reversed(days):
+            if key <= end_key:
+                yield key
+
+        year, month = _previous_month(year, month)
+
+
+def last_trading_day(moment=None):
+    """
+    데이터가 존재하는 가장 최근 거래일 ('YYYYMMDD')
+
+    오늘이 거래일이고 개장 이후라면 오늘, 아니면 직전 거래일입니다.
+    """
+    moment = to_kst(moment)
+    end_day = moment.date()
+    if moment.time() < MARKET_OPEN:
+        end_day -= timedelta(days=1)
+    return next(_iter_trading_days_desc(end_day, moment))
+
+
+def last_final_trading_day(moment=None):
+    """
+    종가가 확정된 가장 최근 거래일 ('YYYYMMDD')
+
+    오늘이 거래일이라도 종가 확정(CLOSE_SETTLE) 전이면 직전 거래일입니다.
+    """
+    moment = to_kst(moment)
+    day = last_trading_day(moment)
+    if day == moment.strftime('%Y%m%d') and moment.time() < CLOSE_SETTLE:
+        return previous_trading_day(day, moment)
+    return day
+
+
+def previous_trading_day(day, moment=None):
+    """
+    day 직전 거래일 ('YYYYMMDD')
+    """
+    if isinstance(day, str):
+        day = datetime.strptime(day, '%Y%m%d').date()
+    return next(_iter_trading_days_desc(day - timedelta(days=1), moment))
+
+
+def recent_trading_days(count, end=None, moment=None):
+    """
+    end(포함)까지 최근 count 거래일을 오래된 순으로 반환합니다.
+    """
+    if end is None:
+        end = last_trading_day(moment)
+    end_day = datetime.strptime(end, '%Y%m%d').date() if isinstance(end, str) else end
+
+    days = []
+    for key in _iter_trading_days_desc(end_day, moment):
+        days.append(key)
+        if len(days) >= count:
+            break
+    days.reverse()
+    return days
+
+
+def trading_days_between(start, end=None, moment=None):
+    """
+    start ~ end(포함) 사이의 거래일을 오래된 순으로 반환합니다.
+    """
+    if end is None:
+        end = last_trading_day(moment)
+    start_key = start.strftime('%Y%m%d') if not isinstance(start, str) else start
+    end_day = datetime.strptime(end, '%Y%m%d').date() if isinstance(end, str) else end
+
+    days = []
+    for key in _iter_trading_days_desc(end_day, moment):
+        if key < start_key:
+            break
+        days.append(key)
+    days.reverse()
+    return days
+
+
+def trading_day_window(count, end=None, moment=None):
+    """
+    최근 count 거래일을 덮는 (시작일, 종료일) 'YYYYMMDD' 구간
+    """
+    days = recent_trading_days(count, end, moment)
+    return days[0], days[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='KRX trading calendar')
+    parser.add_argument('--days', '-n', type=int, default=1, help='Number of recent trading days')
+    args = parser.parse_args()
+
+    last_day = last_trading_day()
+    result = {
+        'success': True,
+        'last_trading_day': last_day,
+        'previous_trading_day': previous_trading_day(last_day),
+        'recent_trading_days': recent_trading_days(args.days, last_day),
+        'timestamp': datetime.now().isoformat()
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+시장별로 나눠 저장하는 전체 종목 캐시
+캐시 파일(예: all_stocks_cache.json)은 작은 매니페스트이고, 종목 목록은
+같은 이름의 .shards 디렉터리에 시장별 파일(KOSPI.json, ETF.json, ...)로 저장됩니다.
+
+필요한 시장만 읽을 수 있고, 한 시장만 다시 받아도 그 시장 파일과 매니페스트만 바뀝니다.
+종목 목록이 파일 안에 바로 들어 있는 예전 형식의 캐시 파일도 그대로 읽습니다.
+"""
+
+import json
+import os
+import sys
+import argparse
+from datetime import datetime
+
+# 캐시에 저장하는 시장 (수집 순서)
+UNIVERSE_MARKETS = ('KOSPI', 'KOSDAQ', 'KONEX', 'ETF', 'ETN', 'INDEX')
+
+# 역색인 분류 -> 종목 정보 필드 (sector 는 문자열, 나머지는 리스트)
+GROUP_KINDS = {'sector': 'sector', 'theme': 'themes', 'group': 'groups'}
+
+
+def shard_dir(cache_file):
+    return f"{os.path.splitext(cache_file)[0]}.shards"
+
+
+def shard_path(cache_file, market):
+    return os.path.join(shard_dir(cache_file), f"{market}.json")
+
+
+def _write_json(path, payload, indent=None):
+    """
+    임시 파일에 쓴 뒤 교체합니다. (읽는 쪽은 항상 완전한 파일을 봄)
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=indent)
+    os.replace(temp_path, path)
+
+
+def parse_timestamp(value):
+    """
+    캐시 timestamp 문자열을 naive datetime 으로 (해석할 수 없으면 None)
+    """
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00') if 'Z' in value else value)
+    except (AttributeError, ValueError):
+        return None
+    return parsed.replace(tzinfo=None)
+
+
+def read_manifest(cache_file):
+    """
+    매니페스트를 읽습니다. 예전 형식(종목 목록이 들어 있는 파일)이면 'data' 를 그대로 담아 반환합니다.
+
+    Returns:
+        dict | None: {'timestamp', 'total_count', 'shards': {시장: {'count', 'timestamp'}},
+                      'failed': {시장: {'timestamp', 'retry_after'}}} (없으면 None)
+    """
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"캐시 로드 실패: {e}", file=sys.stderr)
+        return None
+
+
+def write_shards(cache_file, stocks_by_market, timestamp=None, failed=None):
+    """
+    시장별 종목 목록을 저장하고 매니페스트를 갱신합니다.
+    넘기지 않은 시장의 파일은 그대로 두고 매니페스트의 기존 항목을 유지합니다.
+
+    Args:
+        stocks_by_market (dict): {시장: [종목 정보, ...]}
+        timestamp (str): 수집 시각 (기본: 지금)
+        failed (dict): 이번에 조회에 실패한 시장 {시장: 다시 시도할 시각(str)}.
+            기존 시장 파일은 그대로 두고 매니페스트 'failed' 에 기록합니다.
+
+    Returns:
+        dict: 갱신된 매니페스트
+    """
+    timestamp = timestamp or datetime.now().isoformat()
+    manifest = read_manifest(cache_file) if os.path.exists(cache_file) else None
+    shards = {}
+    failures = dict(manifest.get('failed', {})) if manifest is not None else {}
+    if manifest is not None and 'data' in manifest:
+        # 예전 형식이면 나머지 시장도 함께 나눠 저장
+        legacy = {}
+        for item in manifest['data']:
+            legacy.setdefault(item.get('market', ''), []).append(item)
+        for market, stocks in legacy.items():
+            if market not in stocks_by_market:
+                _write_json(shard_path(cache_file, market),
+                            {'market': market, 'timestamp': manifest.get('timestamp', timestamp), 'data': stocks})
+                shards[market] = {'count': len(stocks), 'timestamp': manifest.get('timestamp', timestamp)}
+    elif manifest is not None:
+        shards = dict(manifest.get('shards', {}))
+
+    for market, stocks in stocks_by_market.items():
+        _write_json(shard_path(cache_file, market), {'market': market, 'timestamp': timestamp, 'data': stocks})
+        shards[market] = {'count': len(stocks), 'timestamp': timestamp}
+        failures.pop(market, None)
+    for market, retry_after in (failed or {}).items():
+        failures[market] = {'timestamp': timestamp, 'retry_after': retry_after}
+
+    ordered = {market: shards[market] for market in UNIVERSE_MARKETS if market in shards}
+    ordered.update({market: info for market, info in shards.items() if market not in ordered})
+    timestamps = [parse_timestamp(info['timestamp']) for info in ordered.values()]
+    timestamps = [value for value in timestamps if value is not None]
+    manifest = {
+        # 가장 오래된 시장 기준 (캐시 기간 판단용)
+        'timestamp': min(timestamps).isoformat() if timestamps else timestamp,
+        'total_count': sum(info['count'] for info in ordered.values()),
+        'shards': ordered,
+    }
+    if failures:
+        manifest['failed'] = failures
+    _write_json(cache_file, manifest, indent=2)
+    return manifest
+
+
+def manifest_timestamps(cache_file):
+    """
+    시장별 수집 시각만 읽습니다. (시장별 파일은 열지 않음)
+
+    Returns:
+        dict: {시장: timestamp} - 캐시가 없으면 {}
+    """
+    manifest = read_manifest(cache_file) if os.path.exists(cache_file) else None
+    if manifest is None:
+        return {}
+    if 'data' in manifest:
+        return {item.get('market'): manifest.get('timestamp', '') for item in manifest['data']}
+    return {market: info.get('timestamp', '') for market, info in manifest.get('shards', {}).items()}
+
+
+def manifest_retry_after(cache_file):
+    """
+    조회에 실패해 다시 시도를 미룬 시장과 그 시각
+
+    Returns:
+        dict: {시장: 다시 시도할 시각(datetime)} - 없으면 {}
+    """
+    manifest = read_manifest(cache_file) if os.path.exists(cache_file) else None
+    if manifest is None:
+        return {}
+    retry_after = {}
+    for market, info in manifest.get('failed', {}).items():
+        value = parse_timestamp(info.get('retry_after', '')) if isinstance(info, dict) else None
+        if value is not None:
+            retry_after[market] = value
+    return retry_after
+
+
+def load_universe(cache_file, markets=None):
+    """
+    전체 종목 캐시에서 지정한 시장(기본: 전체)의 종목만 읽습니다.
+
+    Returns:
+        tuple: (종목 리스트 또는 None, {시장: timestamp}) - 캐시가 없거나 읽을 수 없으면 (None, {})
+    """
+    manifest = read_manifest(cache_file)
+    if manifest is None:
+        return None, {}
+
+    wanted = set(markets) if markets else None
+    if 'data' in manifest:
+        # 예전 형식: 한 파일에 전체 목록
+        stocks = [item for item in manifest['data'] if wanted is None or item.get('market') in wanted]
+        markets_seen = {item.get('market') for item in stocks}
+        return stocks, {market: manifest.get('timestamp', '') for market in markets_seen}
+
+    stocks = []
+    timestamps = {}
+    for market, info in manifest.get('shards', {}).items():
+        if wanted is not None and market not in wanted:
+            continue
+        try:
+            with open(shard_path(cache_file, market), 'r', encoding='utf-8') as f:
+                shard = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"{market} 캐시 로드 실패: {e}", file=sys.stderr)
+            continue
+        stocks.extend(shard.get('data', []))
+        timestamps[market] = shard.get('timestamp', info.get('timestamp', ''))
+    return stocks, timestamps
+
+
+def group_index_path(cache_file):
+    return os.path.join(shard_dir(cache_file), 'groups.json')
+
+
+def build_group_index(stocks_data):
+    """
+    섹터/테마/그룹 -> 종목코드 역색인
+
+    Returns:
+        dict: {'sector': {업종명: [종목코드, ...]}, 'theme': {...}, 'group': {...}}
+    """
+    index = {kind: {} for kind in GROUP_KINDS}
+    for stock_info in stocks_data:
+        for kind, field in GROUP_KINDS.items():
+            values = stock_info.get(field)
+            if not values:
+                continue
+            for value in ([values] if isinstance(values, str) else values):
+                index[kind].setdefault(value, []).append(stock_info['symbol'])
+    return {kind: {name: sorted(set(symbols)) for name, symbols in sorted(groups.items())}
+            for kind, groups in index.items()}
+
+
+def write_group_index(cache_file, stocks_data, timestamp=None):
+    """
+    전체 종목으로 역색인을 만들어 시장별 캐시와 같은 디렉터리에 저장합니다.
+    """
+    index = build_group_index(stocks_data)
+    _write_json(group_index_path(cache_file), {'timestamp': timestamp or datetime.now().isoformat(), **index})
+    return index
+
+
+def load_group_index(cache_file):
+    """
+    저장된 역색인 (없으면 None)
+    """
+    try:
+        with open(group_index_path(cache_file), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class BuildJournal:
+    """
+    전체 종목 수집 중간 결과를 한 줄에 한 종목씩 (NDJSON) 남기는 기록 파일
+
+    거래일마다 파일이 따로 있고, 수집이 중간에 끊겨도 다시 실행하면
+    같은 거래일에 이미 이름을 확인한 종목은 건너뜁니다.
+    한 줄: {"market", "ticker", "name"} (이름이 없는 종목은 name 이 null)
+    """
+
+    # 이 줄 수마다 디스크에 동기화
+    SYNC_EVERY = 50
+
+    def __init__(self, journal_dir, trading_date):
+        self.journal_dir = journal_dir
+        self.path = os.path.join(journal_dir, f"{trading_date}.jsonl")
+        self.resolved = {}
+        self._file = None
+        self._pending = 0
+
+    def load(self):
+        """
+        같은 거래일 기록을 읽고 다른 거래일 기록은 지웁니다.
+
+        Returns:
+            int: 이미 확인한 종목 수
+        """
+        os.makedirs(self.journal_dir, exist_ok=True)
+        for entry in os.listdir(self.journal_dir):
+            path = os.path.join(self.journal_dir, entry)
+            if path != self.path and entry.endswith('.jsonl'):
+                os.remove(path)
+
+        self.resolved = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                        self.resolved[(row['market'], row['ticker'])] = row['name']
+                    except (ValueError, KeyError, TypeError):
+                        # 중단될 때 끝까지 쓰지 못한 마지막 줄
+                        continue
+        except FileNotFoundError:
+            pass
+        return len(self.resolved)
+
+    def get(self, market, ticker):
+        """
+        (기록 여부, 종목명) - 기록된 종목이라도 이름이 없으면 종목명은 None
+        """
+        key = (market, ticker)
+        return key in self.resolved, self.resolved.get(key)
+
+    def record(self, market, ticker, name):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps({'market': market, 'ticker': ticker, 'name': name}, ensure_ascii=False) + '\n')
+        self.resolved[(market, ticker)] = name
+        self._pending += 1
+        if self._pending >= self.SYNC_EVERY:
+            self.sync()
+
+    def sync(self):
+        if self._file is not None and self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def discard(self, markets=None):
+        """
+        수집이 끝나 캐시에 반영한 시장(기본: 전체)의 기록을 지웁니다.
+
+        일부 시장만 지울 때는 나머지 시장 기록만 남겨 다시 씁니다.
+        (한 시장만 갱신해도 중단된 전체 수집의 다른 시장 기록은 유지)
+        """
+        self.close()
+        kept = []
+        if markets is not None:
+            markets = set(markets)
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            if json.loads(line)['market'] not in markets:
+                                kept.append(line if line.endswith('\n') else line + '\n')
+                        except (ValueError, KeyError, TypeError):
+                            continue
+            except FileNotFoundError:
+                return
+        self.resolved = ({key: name for key, name in self.resolved.items() if key[0] not in markets}
+                         if markets is not None else {})
+
+        if kept:
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.writelines(kept)
+            os.replace(temp_path, self.path)
+            return
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or convert the market-sharded universe cache')
+    parser.add_argument('--cache', '-c', type=str, default='all_stocks_cache.json', help='Universe cache (manifest) path')
+    parser.add_argument('--split', action='store_true', help='Convert a single-file cache into per-market shards')
+    args = parser.parse_args()
+
+    try:
+        manifest = read_manifest(args.cache)
+        if manifest is None:
+            raise Exception(f"{args.cache} 캐시가 없습니다.")
+        if args.split and 'data' in manifest:
+            manifest = write_shards(args.cache, {}, manifest.get('timestamp'))
+        output = {'success': True, 'manifest': {k: v for k, v in manifest.items() if k != 'data'},
+                  'timestamp': datetime.now().isoformat()}
+    except Exception as e:
+        output = {'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()}
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    if not output['success']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { db } from '@/lib/db'
+import { ApiResponse } from '@/types/api'
+
+// 가격 알림 삭제
+export async function DELETE(request: NextRequest, { params }: { params: Promise<{ id: string }> }) {
+  try {
+    const { id } = await params
+
+    if (!id) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'ID parameter is required'
+      }, { status: 400 })
+    }
+
+    // TODO: 실제 사용자 인증 구현 후 userId 가져오기
+    // 임시로 demo 사용자 사용
+    const demoUser = await db.user.findUnique({
+      where: { email: 'demo@example.com' }
+    })
+
+    if (!demoUser) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Demo user not found'
+      }, { status: 500 })
+    }
+
+    const alert = await db.priceAlert.findUnique({
+      where: { id }
+    })
+
+    if (!alert) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Alert not found'
+      }, { status: 404 })
+    }
+
+    if (alert.userId !== demoUser.id) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Unauthorized'
+      }, { status: 403 })
+    }
+
+    await db.priceAlert.delete({
+      where: { id }
+    })
+
+    return NextResponse.json<ApiResponse>({
+      success: true,
+      message: 'Alert deleted'
+    })
+
+  } catch (error) {
+    console.error('Alerts DELETE error:', error)
+    return NextResponse.json<ApiResponse>({
+      success: false,
+      error: 'Internal server error'
+    }, { status: 500 })
+  }
+}
@@ -0,0 +1,99 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { db } from '@/lib/db'
+import { PriceAlert } from '@/types/stock'
+import { ApiResponse } from '@/types/api'
+
+// 가격 알림은 quote_refresher 가 시세 갱신 주기마다 평가 (scripts/price_alerts.py)
+
+// 가격 알림 조회
+export async function GET(request: NextRequest) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const symbol = searchParams.get('symbol')
+
+    // TODO: 실제 사용자 인증 구현 후 userId 가져오기
+    // 임시로 demo 사용자 사용
+    const demoUser = await db.user.findUnique({
+      where: { email: 'demo@example.com' }
+    })
+
+    if (!demoUser) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Demo user not found'
+      }, { status: 500 })
+    }
+
+    const alerts = await db.priceAlert.findMany({
+      where: {
+        userId: demoUser.id,
+        ...(symbol ? { symbol } : {})
+      },
+      orderBy: [
+        { symbol: 'asc' },
+        { threshold: 'asc' }
+      ]
+    })
+
+    return NextResponse.json<ApiResponse<PriceAlert[]>>({
+      success: true,
+      data: alerts as PriceAlert[]
+    })
+
+  } catch (error) {
+    console.error('Alerts GET error:', error)
+    return NextResponse.json<ApiResponse>({
+      success: false,
+      error: 'Internal server error'
+    }, { status: 500 })
+  }
+}
+
+// 가격 알림 추가
+export async function POST(request: NextRequest) {
+  try {
+    const body = await request.json()
+    const { symbol, direction, threshold } = body
+
+    if (!symbol || !['ABOVE', 'BELOW'].includes(direction) || typeof threshold !== 'number' || !(threshold > 0)) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Symbol, direction (ABOVE or BELOW) and a positive threshold are required'
+      }, { status: 400 })
+    }
+
+    // TODO: 실제 사용자 인증 구현 후 userId 가져오기
+    // 임시로 demo 사용자 사용
+    const demoUser = await db.user.findUnique({
+      where: { email: 'demo@example.com' }
+    })
+
+    if (!demoUser) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Demo user not found'
+      }, { status: 500 })
+    }
+
+    const alert = await db.priceAlert.create({
+      data: {
+        userId: demoUser.id,
+        symbol,
+        direction,
+        threshold
+      }
+    })
+
+    return NextResponse.json<ApiResponse<PriceAlert>>({
+      success: true,
+      data: alert as PriceAlert
+    }, { status: 201 })
+
+  } catch (error) {
+    console.error('Alerts POST error:', error)
+    return NextResponse.json<ApiResponse>({
+      success: false,
+      error: 'Internal server error'
+    }, { status: 500 })
+  }
+}
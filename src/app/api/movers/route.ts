@@ -0,0 +1,53 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { MarketMovers } from '@/types/stock'
+import { ApiResponse } from '@/types/api'
+import { executeScript } from '@/lib/python-executor'
+
+const MARKETS = ['ALL', 'KOSPI', 'KOSDAQ', 'KONEX', 'ETF']
+
+// 시장별 상승/하락/거래대금/거래량 급증 상위 종목
+export async function GET(request: NextRequest) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const market = (searchParams.get('market') || 'ALL').toUpperCase()
+
+    if (!MARKETS.includes(market)) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Invalid market'
+      }, { status: 400 })
+    }
+
+    // 순위는 quote_refresher 가 주기적으로 공유 캐시에 저장 (조회는 캐시 한 번 읽기)
+    const result = await executeScript('scripts/market_movers.py', ['--market', market])
+
+    if (!result.success) {
+      console.error('Market movers fetch failed:', result.error)
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Failed to fetch market movers'
+      }, { status: 500 })
+    }
+
+    const pythonResult = JSON.parse(result.output)
+
+    if (!pythonResult.success) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: pythonResult.error || 'Failed to fetch market movers'
+      }, { status: 500 })
+    }
+
+    return NextResponse.json<ApiResponse<MarketMovers>>({
+      success: true,
+      data: pythonResult.data
+    })
+
+  } catch (error) {
+    console.error('Market movers API error:', error)
+    return NextResponse.json<ApiResponse>({
+      success: false,
+      error: 'Internal server error'
+    }, { status: 500 })
+  }
+}
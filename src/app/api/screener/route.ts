@@ -0,0 +1,69 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { ScreenerRow } from '@/types/stock'
+import { ApiResponse, PaginatedResponse } from '@/types/api'
+import { executeScript } from '@/lib/python-executor'
+
+// 전체 종목 스크리너
+// 예: /api/screener?filter=market == 'KOSDAQ' and change_pct > 5&sort=-volume_ratio&page=1&limit=50
+export async function GET(request: NextRequest) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const filter = searchParams.get('filter')
+    const sort = searchParams.get('sort') || '-market_cap'
+    const page = Math.max(1, parseInt(searchParams.get('page') || '1') || 1)
+    const limit = Math.min(500, Math.max(1, parseInt(searchParams.get('limit') || '50') || 50))
+
+    if (!/^[-+]?[a-z0-9_]+$/.test(sort)) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Invalid sort column'
+      }, { status: 400 })
+    }
+
+    const args = ['--sort', sort, '--limit', String(limit), '--offset', String((page - 1) * limit)]
+    if (filter) {
+      // 조건식은 셸을 거치지 않도록 base64 로 전달
+      args.push('--filter-base64', Buffer.from(filter, 'utf8').toString('base64'))
+    }
+
+    const result = await executeScript('scripts/screener.py', args)
+
+    if (!result.success) {
+      console.error('Screener failed:', result.error)
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Failed to run screener'
+      }, { status: 500 })
+    }
+
+    const pythonResult = JSON.parse(result.output)
+
+    if (!pythonResult.success) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: pythonResult.error || 'Failed to run screener'
+      }, { status: pythonResult.invalid_query ? 400 : 500 })
+    }
+
+    return NextResponse.json<ApiResponse<PaginatedResponse<ScreenerRow>>>({
+      success: true,
+      data: {
+        data: pythonResult.data,
+        pagination: {
+          page,
+          limit,
+          total: pythonResult.total,
+          pages: Math.ceil(pythonResult.total / limit)
+        }
+      },
+      message: `${pythonResult.date} 기준`
+    })
+
+  } catch (error) {
+    console.error('Screener API error:', error)
+    return NextResponse.json<ApiResponse>({
+      success: false,
+      error: 'Internal server error'
+    }, { status: 500 })
+  }
+}
@@ -0,0 +1,81 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { StockChartSeries } from '@/types/stock'
+import { ApiResponse } from '@/types/api'
+import { executeScript } from '@/lib/python-executor'
+
+// 종목코드 (6자리 숫자/대문자) - 셸 명령 인자로 넘기기 전에 검증
+const SYMBOL_PATTERN = /^[0-9A-Z]{6}$/
+
+const RANGES = ['1M', '3M', '1Y', '5Y']
+const INTERVALS = ['D', 'W', 'M']
+
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ symbol: string }> }
+) {
+  try {
+    const { symbol } = await params
+    const { searchParams } = new URL(request.url)
+    const range = searchParams.get('range') || '1Y'
+    const interval = searchParams.get('interval')
+    const points = parseInt(searchParams.get('points') || '300')
+
+    if (!symbol) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Stock symbol is required'
+      }, { status: 400 })
+    }
+
+    if (!SYMBOL_PATTERN.test(symbol)) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Invalid stock symbol'
+      }, { status: 400 })
+    }
+
+    if (!RANGES.includes(range) || (interval && !INTERVALS.includes(interval)) || isNaN(points)) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Invalid range, interval or points'
+      }, { status: 400 })
+    }
+
+    const args = ['--symbol', symbol, '--range', range, '--points', String(points)]
+    if (interval) {
+      args.push('--interval', interval)
+    }
+
+    // 주/월봉은 (종목, 단위, 최근 거래일) 단위로 Python 공유 캐시에 저장됨
+    const result = await executeScript('scripts/chart_series.py', args)
+
+    if (!result.success) {
+      console.error('Chart series fetch failed:', result.error)
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Failed to fetch chart series'
+      }, { status: 500 })
+    }
+
+    const pythonResult = JSON.parse(result.output)
+
+    if (!pythonResult.success) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: pythonResult.error || 'Failed to fetch chart series'
+      }, { status: 500 })
+    }
+
+    return NextResponse.json<ApiResponse<StockChartSeries>>({
+      success: true,
+      data: pythonResult.data
+    })
+
+  } catch (error) {
+    console.error('Chart series API error:', error)
+    return NextResponse.json<ApiResponse>({
+      success: false,
+      error: 'Internal server error'
+    }, { status: 500 })
+  }
+}
@@ -0,0 +1,63 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { StockIndicators } from '@/types/stock'
+import { ApiResponse } from '@/types/api'
+import { executeScript } from '@/lib/python-executor'
+
+// 종목코드 (6자리 숫자/대문자) - 셸 명령 인자로 넘기기 전에 검증
+const SYMBOL_PATTERN = /^[0-9A-Z]{6}$/
+
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ symbol: string }> }
+) {
+  try {
+    const { symbol } = await params
+
+    if (!symbol) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Stock symbol is required'
+      }, { status: 400 })
+    }
+
+    if (!SYMBOL_PATTERN.test(symbol)) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Invalid stock symbol'
+      }, { status: 400 })
+    }
+
+    // 지표는 (종목, 마지막 봉 날짜) 단위로 Python 공유 캐시에 저장됨
+    const result = await executeScript('scripts/indicators.py', ['--symbols', symbol])
+
+    if (!result.success) {
+      console.error('Indicators fetch failed:', result.error)
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Failed to compute indicators'
+      }, { status: 500 })
+    }
+
+    const pythonResult = JSON.parse(result.output)
+    const indicators = pythonResult.data?.[symbol]
+
+    if (!pythonResult.success || !indicators) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: pythonResult.errors?.[symbol] || pythonResult.error || 'Failed to compute indicators'
+      }, { status: 500 })
+    }
+
+    return NextResponse.json<ApiResponse<StockIndicators>>({
+      success: true,
+      data: indicators
+    })
+
+  } catch (error) {
+    console.error('Indicators API error:', error)
+    return NextResponse.json<ApiResponse>({
+      success: false,
+      error: 'Internal server error'
+    }, { status: 500 })
+  }
+}
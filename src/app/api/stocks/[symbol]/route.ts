@@ -1,9 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { StockInfo } from '@/types/stock'
 import { ApiResponse } from '@/types/api'
-import path from 'path'
 import { cache } from '@/lib/cache'
-import { promises as fs } from 'fs'
 import { executeScript } from '@/lib/python-executor'
 
 export async function GET(request: NextRequest, { params }: { params: Promise<{ symbol: string }> }) {
@@ -20,7 +18,7 @@ export async function GET(request: NextRequest, { params }: { params: Promise<{
     // 캐시 키 생성
     const cacheKey = `stock_${symbol}`
     
-    // 캐시된 데이터 확인 (30초 TTL)
+    // 캐시된 데이터 확인 (TTL은 Python 공유 캐시의 만료시각을 따름)
     const cachedData = cache.get(cacheKey)
     if (cachedData) {
       console.log(`Cache HIT for ${symbol}`)
@@ -52,18 +50,10 @@ export async function GET(request: NextRequest, { params }: { params: Promise<{
       }, { status: 500 })
     }
 
-    // 한글 종목명 가져오기
-    const allStocksPath = path.join(process.cwd(), 'all_stocks_cache.json');
-    const allStocksFile = await fs.readFile(allStocksPath, 'utf-8');
-    const allStocksData = JSON.parse(allStocksFile);
-    
-    const stockFromCache = allStocksData.data.find((stock: any) => stock.symbol === symbol);
-    const koreanName = stockFromCache?.name;
-
     // StockInfo 형식으로 변환
     const stockInfo: StockInfo = {
       symbol: pythonResult.symbol,
-      name: koreanName || pythonResult.name, // 한글 이름이 있으면 사용, 없으면 API 결과 사용
+      name: pythonResult.name, // 종목 인덱스의 한글 종목명
       price: pythonResult.price,
       changeAmount: pythonResult.changeAmount,
       changePercent: pythonResult.changePercent,
@@ -82,9 +72,10 @@ export async function GET(request: NextRequest, { params }: { params: Promise<{
       extra_info: pythonResult.extra_info || {}
     }
 
-    // 캐시에 저장 (30초 TTL)
-    cache.set(cacheKey, stockInfo, 30)
-    console.log(`Cached ${symbol} for 30 seconds`)
+    // 캐시에 저장 (장중 30초, 장 마감 후/휴장일은 다음 개장까지)
+    const ttlSeconds = getCacheTtlSeconds(pythonResult.extra_info?.cache_expires_at)
+    cache.set(cacheKey, stockInfo, ttlSeconds)
+    console.log(`Cached ${symbol} for ${ttlSeconds} seconds`)
 
     return NextResponse.json<ApiResponse<StockInfo>>({
       success: true,
@@ -98,4 +89,11 @@ export async function GET(request: NextRequest, { params }: { params: Promise<{
       error: 'Internal server error'
     }, { status: 500 })
   }
-}
\ No newline at end of file
+}
+
+// Python 공유 캐시 만료시각에서 남은 TTL(초) 계산 (없으면 30초)
+function getCacheTtlSeconds(expiresAt?: string): number {
+  if (!expiresAt) return 30
+  const remaining = Math.floor((Date.parse(expiresAt) - Date.now()) / 1000)
+  return Number.isFinite(remaining) && remaining > 0 ? remaining : 1
+}
@@ -0,0 +1,55 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { db } from '@/lib/db'
+import { WatchlistCard } from '@/types/stock'
+import { ApiResponse } from '@/types/api'
+import { executeScript } from '@/lib/python-executor'
+
+// 관심종목 카드 시세 일괄 조회 (페이지 로드당 Python 프로세스 1회)
+export async function GET(request: NextRequest) {
+  try {
+    // TODO: 실제 사용자 인증 구현 후 userId 가져오기
+    // 임시로 demo 사용자 사용
+    const demoUser = await db.user.findUnique({
+      where: { email: 'demo@example.com' }
+    })
+
+    if (!demoUser) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Demo user not found'
+      }, { status: 500 })
+    }
+
+    // 관심종목 순서 조회와 시세 조회를 Python 스크립트가 한 번에 처리
+    const result = await executeScript('scripts/fetch_stock_data.py', ['--user', demoUser.id])
+
+    if (!result.success) {
+      console.error('Watchlist quotes fetch failed:', result.error)
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: 'Failed to fetch watchlist quotes'
+      }, { status: 500 })
+    }
+
+    const pythonResult = JSON.parse(result.output)
+
+    if (!pythonResult.success) {
+      return NextResponse.json<ApiResponse>({
+        success: false,
+        error: pythonResult.error || 'Failed to fetch watchlist quotes'
+      }, { status: 500 })
+    }
+
+    return NextResponse.json<ApiResponse<WatchlistCard[]>>({
+      success: true,
+      data: pythonResult.data
+    })
+
+  } catch (error) {
+    console.error('Watchlist quotes API error:', error)
+    return NextResponse.json<ApiResponse>({
+      success: false,
+      error: 'Internal server error'
+    }, { status: 500 })
+  }
+}
@@ -4,6 +4,7 @@ import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { TrendingUp } from "lucide-react"
 import { StockSearch } from "@/components/dashboard/StockSearch"
 import { WatchlistManager } from "@/components/dashboard/WatchlistManager"
+import { MarketMovers } from "@/components/dashboard/MarketMovers"
 import { Footer } from "@/components/layout/Footer"
 
 export default function DashboardPage() {
@@ -71,6 +72,9 @@ export default function DashboardPage() {
         {/* Watchlist Manager */}
         <WatchlistManager />
 
+        {/* Market Movers */}
+        <MarketMovers />
+
       </main>
 
       {/* Footer */}
@@ -7,6 +7,7 @@ import { Button } from "@/components/ui/button"
 import { Footer } from "@/components/layout/Footer"
 import { ArrowLeft, TrendingUp, TrendingDown, ExternalLink, Calendar, Building } from "lucide-react"
 import { formatMarketCapKorean } from "@/lib/utils"
+import { StockIndicators } from "@/types/stock"
 import Link from "next/link"
 
 interface StockPageProps {
@@ -95,6 +96,7 @@ export default function StockPage({ params }: StockPageProps) {
   const [stockData, setStockData] = useState<any>(null)
   const [newsData, setNewsData] = useState<any>(null)
   const [disclosureData, setDisclosureData] = useState<any>(null)
+  const [indicatorsData, setIndicatorsData] = useState<StockIndicators | null>(null)
   const [loading, setLoading] = useState(true)
   const [newsLoading, setNewsLoading] = useState(true)
   const [disclosureLoading, setDisclosureLoading] = useState(true)
@@ -203,7 +205,16 @@ export default function StockPage({ params }: StockPageProps) {
         // 2단계: 관심종목 상태 확인 (빠른 DB 조회)
         await checkWatchlistStatus()
         
-        // 3단계: 뉴스와 공시는 백그라운드에서 비동기로 로딩
+        // 3단계: 뉴스, 공시, 기술적 지표는 백그라운드에서 비동기로 로딩
+        fetch(`/api/stocks/${symbol}/indicators`, { cache: 'no-store' })
+          .then(response => response.json())
+          .then(result => {
+            if (result.success) {
+              setIndicatorsData(result.data)
+            }
+          })
+          .catch(error => console.error('Failed to fetch indicators:', error))
+
         setTimeout(async () => {
           try {
             const [newsResponse, disclosureResponse] = await Promise.all([
@@ -473,6 +484,38 @@ export default function StockPage({ params }: StockPageProps) {
                     </div>
                   </div>
                 </div>
+
+                {/* Technical Indicators */}
+                {indicatorsData && (
+                  <div className="border-t border-gray-200 pt-4 sm:pt-6 mt-4 sm:mt-6">
+                    <h4 className="text-sm font-semibold text-gray-700 mb-3 sm:mb-4 flex items-center">
+                      <div className="w-1 h-4 bg-purple-600 rounded-full mr-2"></div>
+                      기술적 지표
+                      <span className="ml-2 text-xs font-normal text-gray-500">({indicatorsData.date} 기준)</span>
+                    </h4>
+                    <div className="grid grid-cols-2 md:grid-cols-4 gap-2 sm:gap-4">
+                      {[
+                        { label: 'SMA 20', value: indicatorsData.sma['20'] },
+                        { label: 'SMA 60', value: indicatorsData.sma['60'] },
+                        { label: 'EMA 12', value: indicatorsData.ema['12'] },
+                        { label: 'RSI 14', value: indicatorsData.rsi14 },
+                        { label: 'MACD', value: indicatorsData.macd.macd },
+                        { label: 'MACD 시그널', value: indicatorsData.macd.signal },
+                        { label: '볼린저 상단', value: indicatorsData.bollinger.upper },
+                        { label: '볼린저 하단', value: indicatorsData.bollinger.lower },
+                        { label: 'ATR 14', value: indicatorsData.atr14 },
+                        { label: 'OBV', value: indicatorsData.obv }
+                      ].map((item) => (
+                        <div key={item.label} className="flex justify-between items-center p-2 sm:p-3 bg-gray-50 rounded-lg border border-gray-200">
+                          <span className="text-xs sm:text-sm text-gray-600">{item.label}</span>
+                          <span className="font-semibold text-gray-900 text-sm sm:text-base">
+                            {item.value !== null ? item.value.toLocaleString() : 'N/A'}
+                          </span>
+                        </div>
+                      ))}
+                    </div>
+                  </div>
+                )}
               </CardContent>
             </Card>
 
@@ -0,0 +1,132 @@
+'use client'
+
+import { useState, useEffect } from 'react'
+import Link from "next/link"
+import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
+import { Button } from "@/components/ui/button"
+import { MarketMovers as MarketMoversData, MarketMover } from '@/types/stock'
+
+const TABS: { key: keyof Pick<MarketMoversData, 'gainers' | 'losers' | 'value' | 'volume_spike'>; label: string }[] = [
+  { key: 'gainers', label: '상승률' },
+  { key: 'losers', label: '하락률' },
+  { key: 'value', label: '거래대금' },
+  { key: 'volume_spike', label: '거래량 급증' }
+]
+
+const MARKETS = ['ALL', 'KOSPI', 'KOSDAQ']
+
+interface MarketMoversProps {
+  maxItems?: number
+}
+
+export function MarketMovers({ maxItems = 10 }: MarketMoversProps) {
+  const [market, setMarket] = useState('ALL')
+  const [tab, setTab] = useState<typeof TABS[number]['key']>('gainers')
+  const [data, setData] = useState<MarketMoversData | null>(null)
+  const [loading, setLoading] = useState(true)
+
+  useEffect(() => {
+    const fetchMovers = async () => {
+      try {
+        const response = await fetch(`/api/movers?market=${market}`)
+        const result = await response.json()
+        if (result.success) {
+          setData(result.data)
+        } else {
+          console.error('Failed to fetch market movers:', result.error)
+        }
+      } catch (error) {
+        console.error('Error fetching market movers:', error)
+      } finally {
+        setLoading(false)
+      }
+    }
+
+    fetchMovers()
+
+    // 1분마다 자동 새로고침
+    const interval = setInterval(fetchMovers, 60 * 1000)
+    return () => clearInterval(interval)
+  }, [market])
+
+  const formatSecondary = (item: MarketMover) => {
+    if (tab === 'value') {
+      return `${Math.round(item.tradingValue / 100000000).toLocaleString()}억원`
+    }
+    if (tab === 'volume_spike') {
+      return `${item.volumeRatio.toLocaleString()}%`
+    }
+    if (item.changePercent === null) return '-'
+    return `${item.changePercent > 0 ? '+' : ''}${item.changePercent.toFixed(2)}%`
+  }
+
+  const rows = data ? data[tab].slice(0, maxItems) : []
+
+  return (
+    <div className="mb-8">
+      <Card className="bg-white border border-gray-200 overflow-hidden">
+        <CardHeader className="bg-gray-50 border-b border-gray-200">
+          <div className="flex items-center justify-between">
+            <CardTitle className="flex items-center space-x-3 text-gray-900">
+              <div className="w-1 h-6 bg-blue-600 rounded-full"></div>
+              <span className="text-lg font-semibold">시장 주요 종목</span>
+              {data && <span className="text-xs font-normal text-gray-500">({data.date} 기준)</span>}
+            </CardTitle>
+            <div className="flex items-center space-x-1">
+              {MARKETS.map((item) => (
+                <Button
+                  key={item}
+                  variant={market === item ? 'default' : 'ghost'}
+                  size="sm"
+                  onClick={() => setMarket(item)}
+                >
+                  {item === 'ALL' ? '전체' : item}
+                </Button>
+              ))}
+            </div>
+          </div>
+        </CardHeader>
+        <CardContent className="pt-4">
+          <div className="flex space-x-2 mb-4">
+            {TABS.map((item) => (
+              <Button
+                key={item.key}
+                variant={tab === item.key ? 'default' : 'outline'}
+                size="sm"
+                onClick={() => setTab(item.key)}
+              >
+                {item.label}
+              </Button>
+            ))}
+          </div>
+
+          {loading ? (
+            <div className="text-center text-sm text-gray-500 py-6">로딩 중...</div>
+          ) : rows.length === 0 ? (
+            <div className="text-center text-sm text-gray-500 py-6">데이터가 없습니다</div>
+          ) : (
+            <ol className="divide-y divide-gray-100">
+              {rows.map((item, index) => (
+                <li key={item.symbol}>
+                  <Link href={`/stock/${item.symbol}`} className="flex items-center justify-between py-2 hover:bg-gray-50 px-2 rounded">
+                    <div className="flex items-center space-x-3 min-w-0">
+                      <span className="w-5 text-sm text-gray-400">{index + 1}</span>
+                      <span className="font-medium text-gray-900 truncate">{item.name}</span>
+                      <span className="text-xs text-gray-500 font-mono">{item.symbol}</span>
+                    </div>
+                    <div className="flex items-center space-x-4">
+                      <span className="text-sm text-gray-700">{item.price.toLocaleString()}원</span>
+                      <span className={`text-sm font-semibold ${(item.changePercent ?? 0) > 0 ? 'text-red-600' : (item.changePercent ?? 0) < 0 ? 'text-blue-600' : 'text-gray-600'}`}>
+                        {formatSecondary(item)}
+                      </span>
+                    </div>
+                  </Link>
+                </li>
+              ))}
+            </ol>
+          )}
+        </CardContent>
+      </Card>
+    </div>
+  )
+}
@@ -1,9 +1,9 @@
 'use client'
 
-import { useState, useEffect } from 'react'
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { TrendingUp, TrendingDown, Loader2 } from "lucide-react"
 import { formatMarketCapKorean } from "@/lib/utils"
+import { InvestorFlow, WatchlistCard } from "@/types/stock"
 import Link from "next/link"
 
 interface StockData {
@@ -16,58 +16,49 @@ interface StockData {
   marketCap: string | number
   high52w?: number
   low52w?: number
+  investorFlow?: InvestorFlow
   timestamp?: string
 }
 
+// 투자자별 순매수 표시 항목
+const FLOW_INVESTORS = [
+  { key: 'foreign', label: '외국인' },
+  { key: 'institution', label: '기관' },
+  { key: 'individual', label: '개인' },
+] as const
+
+// 순매수 거래대금 (부호 + 조/억 단위)
+const formatFlow = (value: number) => {
+  if (value === 0) return '0'
+  return `${value > 0 ? '+' : '-'}${formatMarketCapKorean(Math.abs(value))}`
+}
+
 interface StockCardProps {
   symbol: string
   defaultName?: string
+  // 관심종목 일괄 조회 결과 (undefined 이면 로딩 중)
+  quote?: WatchlistCard
+  // 일괄 조회 자체가 실패했는지 여부 (시세가 없으면 로딩 대신 오류 표시)
+  quoteFailed?: boolean
 }
 
-export function StockCard({ symbol, defaultName = "로딩 중..." }: StockCardProps) {
-  const [data, setData] = useState<StockData | null>(null)
-  const [loading, setLoading] = useState(true)
-  const [error, setError] = useState(false)
-
-  useEffect(() => {
-    const fetchStockData = async () => {
-      try {
-        setLoading(true)
-        setError(false)
-        
-        // 주식 정보 요청만 (공시 정보는 하단 섹션에서만 표시)
-        const stockResponse = await fetch(`/api/stocks/${symbol}`)
-        const stockResult = await stockResponse.json()
-        
-        if (stockResult.success && stockResult.data) {
-          const fetchedData = stockResult.data;
-          // defaultName이 유효한 값(초기값이 아닌 경우)이면 API 결과의 name을 덮어씁니다.
-          if (defaultName && defaultName !== "로딩 중...") {
-            fetchedData.name = defaultName;
-          }
-          setData(fetchedData);
-        } else {
-          setError(true)
-        }
-        
-      } catch (err) {
-        console.error('Stock data fetch error:', err)
-        setError(true)
-      } finally {
-        setLoading(false)
-      }
-    }
-
-    // 초기 로드
-    fetchStockData()
-
-    // 5분마다 자동 새로고침
-    const interval = setInterval(() => {
-      fetchStockData()
-    }, 5 * 60 * 1000) // 5분 = 300초
-
-    return () => clearInterval(interval)
-  }, [symbol])
+export function StockCard({ symbol, defaultName = "로딩 중...", quote, quoteFailed = false }: StockCardProps) {
+  const loading = quote === undefined && !quoteFailed
+  const error = quote === undefined ? quoteFailed : !quote.success
+  const data: StockData | null = quote && quote.success ? {
+    symbol: quote.symbol,
+    // defaultName이 유효한 값(초기값이 아닌 경우)이면 API 결과의 name을 덮어씁니다.
+    name: defaultName && defaultName !== "로딩 중..." ? defaultName : (quote.name || symbol),
+    price: quote.price ?? 0,
+    changeAmount: quote.changeAmount ?? 0,
+    changePercent: quote.changePercent ?? 0,
+    volume: quote.volume ?? 0,
+    marketCap: quote.marketCap ?? 0,
+    high52w: quote.high52w,
+    low52w: quote.low52w,
+    investorFlow: quote.investorFlow,
+    timestamp: quote.timestamp
+  } : null
 
   // 색상 결정
   const getPriceColor = (change: number) => {
@@ -209,6 +200,24 @@ export function StockCard({ symbol, defaultName = "로딩 중..." }: StockCardPr
                   </div>
                 </div>
               )}
+
+              {data.investorFlow && (
+                <div className="pt-2 border-t border-gray-100">
+                  <p className="text-xs text-gray-400 mb-1">
+                    투자자별 순매수 ({data.investorFlow.date.slice(4, 6)}/{data.investorFlow.date.slice(6, 8)})
+                  </p>
+                  <div className="grid grid-cols-3 gap-2">
+                    {FLOW_INVESTORS.map(({ key, label }) => (
+                      <div key={key}>
+                        <p className="text-xs text-gray-400">{label}</p>
+                        <p className={`text-xs font-semibold ${getPriceColor(data.investorFlow![key])}`}>
+                          {formatFlow(data.investorFlow![key])}
+                        </p>
+                      </div>
+                    ))}
+                  </div>
+                </div>
+              )}
               
               <div className="flex items-center justify-between border-t border-gray-100 pt-2">
                 <div className="flex items-center gap-1">
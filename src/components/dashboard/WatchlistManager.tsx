@@ -5,6 +5,7 @@ import { StockCard } from './StockCard'
 import { Button } from '@/components/ui/button'
 import { Card, CardHeader, CardTitle } from '@/components/ui/card'
 import { Trash2, RefreshCw } from 'lucide-react'
+import { WatchlistCard } from '@/types/stock'
 
 interface WatchlistItem {
   id: string
@@ -23,6 +24,9 @@ export function WatchlistManager() {
   const [watchlist, setWatchlist] = useState<WatchlistItem[]>([])
   const [loading, setLoading] = useState(true)
   const [refreshing, setRefreshing] = useState(false)
+  const [quotes, setQuotes] = useState<Record<string, WatchlistCard>>({})
+  // 일괄 조회 실패 여부 (시세가 없는 카드는 로딩 대신 오류로 표시)
+  const [quotesFailed, setQuotesFailed] = useState(false)
 
   // 관심종목 목록 불러오기
   const fetchWatchlist = async () => {
@@ -42,6 +46,29 @@ export function WatchlistManager() {
     }
   }
 
+  // 관심종목 카드 시세 일괄 조회 (카드별 요청 대신 한 번에)
+  const fetchQuotes = async () => {
+    try {
+      const response = await fetch('/api/watchlist/quotes')
+      const data = await response.json()
+
+      if (data.success) {
+        const bySymbol: Record<string, WatchlistCard> = {}
+        for (const card of (data.data || []) as WatchlistCard[]) {
+          bySymbol[card.symbol] = card
+        }
+        setQuotes(bySymbol)
+        setQuotesFailed(false)
+      } else {
+        console.error('Failed to fetch watchlist quotes:', data.error)
+        setQuotesFailed(true)
+      }
+    } catch (error) {
+      console.error('Error fetching watchlist quotes:', error)
+      setQuotesFailed(true)
+    }
+  }
+
   // 관심종목 추가
   const addToWatchlist = async (stock: SearchResult) => {
     try {
@@ -61,6 +88,7 @@ export function WatchlistManager() {
       if (data.success) {
         // 성공 시 목록 새로고침
         fetchWatchlist()
+        fetchQuotes()
         return true
       } else {
         console.error('관심종목 추가 실패:', data.error)
@@ -96,13 +124,21 @@ export function WatchlistManager() {
   // 새로고침
   const handleRefresh = async () => {
     setRefreshing(true)
-    await fetchWatchlist()
+    await Promise.all([fetchWatchlist(), fetchQuotes()])
     setRefreshing(false)
   }
 
   // 초기 로드
   useEffect(() => {
     fetchWatchlist()
+    fetchQuotes()
+
+    // 5분마다 시세 자동 새로고침
+    const interval = setInterval(() => {
+      fetchQuotes()
+    }, 5 * 60 * 1000) // 5분 = 300초
+
+    return () => clearInterval(interval)
   }, [])
 
   if (loading) {
@@ -162,6 +198,8 @@ export function WatchlistManager() {
               <StockCard 
                 symbol={item.symbol} 
                 defaultName={item.name} 
+                quote={quotes[item.symbol]}
+                quoteFailed={quotesFailed}
               />
               <Button
                 variant="destructive"
@@ -0,0 +1,140 @@
+/**
+ * 종목 검색 상주 프로세스
+ * fetch_all_stocks.py --batch 를 한 번 띄워 두고 NDJSON 으로 질의/응답을 주고받습니다.
+ * 전체 종목과 검색 인덱스를 프로세스 시작 시 한 번만 읽으므로 검색마다 Python 을 새로 띄우지 않습니다.
+ */
+
+import { spawn, ChildProcess } from 'child_process'
+import { createInterface } from 'readline'
+import { createPythonCommand } from '@/lib/python-executor'
+import { StockSearchResult } from '@/types/stock'
+
+// 전체 종목 캐시 파일 (Docker 이미지 기준 절대 경로)
+const CACHE_FILE = '/app/all_stocks_cache.json'
+
+// 요청 한 건의 응답 대기 시간
+const REQUEST_TIMEOUT_MS = 10000
+
+export interface StockSearchResponse {
+  success: boolean
+  results?: StockSearchResult[]
+  stale?: boolean
+  error?: string
+}
+
+interface PendingSearch {
+  resolve: (response: StockSearchResponse) => void
+  timer: NodeJS.Timeout
+}
+
+interface SearchWorkerState {
+  process: ChildProcess | null
+  nextId: number
+  pending: Map<number, PendingSearch>
+}
+
+// 개발 모드 핫 리로드에서도 프로세스를 하나만 유지
+const globalForSearch = globalThis as unknown as {
+  searchWorker: SearchWorkerState | undefined
+}
+
+const state: SearchWorkerState = globalForSearch.searchWorker ?? {
+  process: null,
+  nextId: 0,
+  pending: new Map()
+}
+
+if (process.env.NODE_ENV !== 'production') globalForSearch.searchWorker = state
+
+function settle(id: number, response: StockSearchResponse) {
+  const request = state.pending.get(id)
+  if (!request) return
+  clearTimeout(request.timer)
+  state.pending.delete(id)
+  request.resolve(response)
+}
+
+function failAll(error: string) {
+  for (const id of Array.from(state.pending.keys())) {
+    settle(id, { success: false, error })
+  }
+}
+
+function startWorker(): ChildProcess {
+  const command = createPythonCommand({
+    scriptPath: 'scripts/fetch_all_stocks.py',
+    args: ['--batch', '--cache', CACHE_FILE]
+  })
+
+  const child = spawn('bash', ['-c', command], {
+    cwd: process.cwd(),
+    stdio: ['pipe', 'pipe', 'pipe'],
+    env: {
+      ...process.env,
+      LANG: 'C.UTF-8',
+      LC_ALL: 'C.UTF-8',
+      PYTHONIOENCODING: 'utf-8'
+    }
+  })
+
+  createInterface({ input: child.stdout! }).on('line', (line) => {
+    let response: { id?: number; success?: boolean; results?: StockSearchResult[]; stale?: boolean; error?: string }
+    try {
+      response = JSON.parse(line)
+    } catch {
+      console.error('Search worker output is not JSON:', line.substring(0, 200))
+      return
+    }
+    if (typeof response.id !== 'number') return
+    settle(response.id, {
+      success: Boolean(response.success),
+      results: response.results,
+      stale: response.stale,
+      error: response.error
+    })
+  })
+
+  // 프로세스가 먼저 끝난 뒤의 쓰기 오류(EPIPE)는 exit 처리에 맡김
+  child.stdin?.on('error', (error) => {
+    console.error('Search worker stdin error:', error.message)
+  })
+
+  child.stderr?.on('data', (data) => {
+    console.log(`[search-worker] ${data.toString().trim()}`)
+  })
+
+  // 종료되면 대기 중인 요청을 실패 처리하고 다음 요청에서 다시 시작
+  child.on('exit', (code) => {
+    console.error(`Search worker exited with code: ${code}`)
+    if (state.process === child) state.process = null
+    failAll('Search worker exited')
+  })
+
+  child.on('error', (error) => {
+    console.error('Search worker error:', error)
+    if (state.process === child) state.process = null
+    failAll(error.message)
+  })
+
+  return child
+}
+
+/**
+ * 상주 검색 프로세스에 질의를 보내고 응답을 기다립니다.
+ */
+export function searchStocks(query: string, limit: number, market?: string): Promise<StockSearchResponse> {
+  return new Promise((resolve) => {
+    if (!state.process || state.process.exitCode !== null) {
+      state.process = startWorker()
+    }
+    const worker = state.process
+
+    const id = ++state.nextId
+    const timer = setTimeout(() => {
+      settle(id, { success: false, error: 'Search timeout' })
+    }, REQUEST_TIMEOUT_MS)
+    state.pending.set(id, { resolve, timer })
+
+    worker.stdin!.write(JSON.stringify({ id, q: query, limit, market: market || null }) + '\n')
+  })
+}
@@ -15,6 +15,12 @@ export interface StockInfo {
   previousClose?: number
   high52w?: number
   low52w?: number
+  bps?: number | null        // 투자지표 (주식만, null 은 값 없음)
+  per?: number | null        // 적자 종목은 0
+  pbr?: number | null
+  eps?: number | null
+  dividendYield?: number | null  // 배당수익률 (%)
+  dps?: number | null
   timestamp?: Date
   extra_info?: {
     currency?: string
@@ -26,9 +32,32 @@ export interface StockInfo {
     data_source?: string
     last_updated?: string
     is_etf?: boolean
+    instrument_type?: string   // STOCK, ETF, ETN, INDEX
+    market?: string | null
+    cache_expires_at?: string  // 공유 캐시 만료시각 (ISO)
   }
 }
 
+export interface StockIndicators {
+  symbol: string
+  date: string               // 마지막 봉 날짜 (YYYYMMDD)
+  sma: Record<string, number | null>
+  ema: Record<string, number | null>
+  rsi14: number | null
+  macd: {
+    macd: number | null
+    signal: number | null
+    histogram: number | null
+  }
+  bollinger: {
+    upper: number | null
+    middle: number | null
+    lower: number | null
+  }
+  atr14: number | null
+  obv: number | null
+}
+
 export interface StockSearchResult {
   symbol: string
   name: string
@@ -43,4 +72,94 @@ export interface WatchlistItem {
   order: number
   createdAt: Date
   updatedAt: Date
-}
\ No newline at end of file
+}
+
+export interface WatchlistCard {
+  symbol: string
+  success: boolean
+  name?: string
+  price?: number
+  changeAmount?: number
+  changePercent?: number
+  volume?: number
+  marketCap?: number
+  high52w?: number
+  low52w?: number
+  timestamp?: string
+  investorFlow?: InvestorFlow
+  error?: string
+}
+
+export interface InvestorFlow {
+  date: string
+  foreign: number              // 외국인 순매수 거래대금 (원)
+  foreign_volume: number       // 외국인 순매수 거래량 (주)
+  institution: number          // 기관합계
+  institution_volume: number
+  individual: number           // 개인
+  individual_volume: number
+}
+
+export interface StockChartSeries {
+  symbol: string
+  range: '1M' | '3M' | '1Y' | '5Y'
+  interval: 'D' | 'W' | 'M'
+  date: string
+  total: number
+  dates: string[]
+  close: number[]
+  volume: number[]
+}
+
+export interface ScreenerRow {
+  symbol: string
+  name: string
+  market: string
+  price: number
+  changePercent: number | null  // null 은 등락률을 알 수 없음 (직전 종가 없는 ETF)
+  volume: number
+  tradingValue: number
+  volumeRatio: number
+  marketCap: number
+  high52w: number
+  low52w: number
+  bps: number | null            // 투자지표 (null 은 값 없음, 예: ETF)
+  per: number | null
+  pbr: number | null
+  eps: number | null
+  dividendYield: number | null
+  dps: number | null
+}
+
+export interface MarketMover {
+  symbol: string
+  name: string
+  market: string
+  price: number
+  changePercent: number | null  // null 은 등락률을 알 수 없음 (직전 종가 없는 ETF)
+  volume: number
+  tradingValue: number
+  volumeRatio: number
+}
+
+export interface MarketMovers {
+  date: string
+  generated_at: string
+  gainers: MarketMover[]
+  losers: MarketMover[]
+  value: MarketMover[]
+  volume_spike: MarketMover[]
+}
+
+export interface PriceAlert {
+  id: string
+  userId: string
+  symbol: string
+  direction: 'ABOVE' | 'BELOW'
+  threshold: number
+  armed: boolean
+  triggeredAt: Date | null
+  triggeredPrice: number | null
+  createdAt: Date
+  updatedAt: Date
+}
@@ -0,0 +1,16 @@
+"""
+scripts/ 모듈 테스트 공통 설정
+
+스크립트는 scripts/ 를 기준으로 서로 import 하므로 경로에 추가하고,
+캐시 디렉토리는 모듈을 불러오기 전에 임시 디렉토리로 바꿔 실제 캐시를 건드리지 않습니다.
+"""
+
+import os
+import sys
+import tempfile
+
+TEST_CACHE_DIR = tempfile.mkdtemp(prefix='stock-cache-test-')
+os.environ['STOCK_CACHE_DIR'] = TEST_CACHE_DIR
+os.environ['UNIVERSE_CACHE_PATH'] = os.path.join(TEST_CACHE_DIR, 'all_stocks_cache.json')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
@@ -0,0 +1,57 @@
+import json
+
+from universe_cache import BuildJournal
+
+
+def write_journal(journal_dir, date, rows):
+    journal = BuildJournal(str(journal_dir), date)
+    journal.load()
+    for market, ticker, name in rows:
+        journal.record(market, ticker, name)
+    journal.close()
+    return journal
+
+
+def test_resume_reads_recorded_names(tmp_path):
+    write_journal(tmp_path, '20261016', [('KOSPI', '005930', '삼성전자'), ('ETF', '069500', None)])
+
+    journal = BuildJournal(str(tmp_path), '20261016')
+    assert journal.load() == 2
+    assert journal.get('KOSPI', '005930') == (True, '삼성전자')
+    # 이름 없는 종목도 기록됨 (다시 조회하지 않음)
+    assert journal.get('ETF', '069500') == (True, None)
+    assert journal.get('KOSPI', '000660') == (False, None)
+
+
+def test_resume_skips_truncated_last_line(tmp_path):
+    journal = write_journal(tmp_path, '20261016', [('KOSPI', '005930', '삼성전자')])
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"market": "KOSPI", "tick')
+
+    assert BuildJournal(str(tmp_path), '20261016').load() == 1
+
+
+def test_load_removes_other_trading_days(tmp_path):
+    old = write_journal(tmp_path, '20261015', [('KOSPI', '005930', '삼성전자')])
+    assert BuildJournal(str(tmp_path), '20261016').load() == 0
+    assert not (tmp_path / old.path.split('/')[-1]).exists()
+
+
+def test_discard_only_written_markets(tmp_path):
+    journal = write_journal(tmp_path, '20261016', [
+        ('KOSPI', '005930', '삼성전자'), ('ETF', '069500', 'KODEX 200'), ('KOSDAQ', '035720', '카카오'),
+    ])
+
+    BuildJournal(str(tmp_path), '20261016').discard(['ETF'])
+    with open(journal.path, 'r', encoding='utf-8') as f:
+        markets = [json.loads(line)['market'] for line in f]
+    assert markets == ['KOSPI', 'KOSDAQ']
+
+    BuildJournal(str(tmp_path), '20261016').discard(['KOSPI', 'KOSDAQ'])
+    assert not (tmp_path / '20261016.jsonl').exists()
+
+
+def test_discard_all(tmp_path):
+    write_journal(tmp_path, '20261016', [('KOSPI', '005930', '삼성전자')])
+    BuildJournal(str(tmp_path), '20261016').discard()
+    assert not (tmp_path / '20261016.jsonl').exists()
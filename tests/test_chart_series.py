@@ -0,0 +1,53 @@
+import numpy as np
+
+from chart_series import lttb, downsample, resample
+
+
+def test_lttb_keeps_endpoints_and_threshold():
+    x = np.arange(1000)
+    y = np.sin(x / 25.0)
+    index = lttb(x, y, 100)
+    assert len(index) == 100
+    assert index[0] == 0 and index[-1] == 999
+    assert np.all(np.diff(index) > 0)
+
+
+def test_lttb_keeps_spike():
+    y = np.zeros(500)
+    y[237] = 100.0
+    assert 237 in lttb(np.arange(500), y, 20).tolist()
+
+
+def test_lttb_returns_everything_below_threshold():
+    assert lttb(np.arange(10), np.arange(10), 20).tolist() == list(range(10))
+    assert lttb(np.arange(10), np.arange(10), 2).tolist() == list(range(10))
+
+
+def test_downsample_preserves_total_volume():
+    count = 750
+    rng = np.random.default_rng(0)
+    bars = {
+        'dates': [f"d{i:04d}" for i in range(count)],
+        'close': (1000 + rng.normal(0, 10, count).cumsum()).tolist(),
+        'volume': rng.integers(0, 10_000, count).tolist(),
+    }
+    sampled = downsample(bars, 120)
+    assert len(sampled['dates']) == len(sampled['close']) == len(sampled['volume']) == 120
+    assert sampled['dates'][0] == 'd0000' and sampled['dates'][-1] == f"d{count - 1:04d}"
+    assert sum(sampled['volume']) == sum(bars['volume'])
+
+
+def test_downsample_short_series_unchanged():
+    bars = {'dates': ['20261015', '20261016'], 'close': [1.0, 2.0], 'volume': [3, 4]}
+    assert downsample(bars, 300) is bars
+
+
+def test_resample_weekly_uses_last_close_and_sums_volume():
+    bars = {
+        # 목 금 | 월 화
+        'dates': ['20261015', '20261016', '20261019', '20261020'],
+        'close': [10.0, 11.0, 12.0, 13.0],
+        'volume': [1, 2, 3, 4],
+    }
+    weekly = resample(bars, 'W')
+    assert weekly == {'dates': ['20261016', '20261020'], 'close': [11.0, 13.0], 'volume': [3, 7]}
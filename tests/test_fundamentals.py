@@ -0,0 +1,60 @@
+import numpy as np
+
+import screener
+from fundamentals import FUNDAMENTAL_FIELDS, align, quote_fields
+
+
+def make_fundamentals():
+    columns = {
+        'symbol': np.array(['000001', '000002', '000003'], dtype='U12'),
+        'date': np.array('20261016'),
+    }
+    for name in FUNDAMENTAL_FIELDS:
+        columns[name] = np.array([1.0, 2.0, np.nan], dtype=np.float32)
+    columns['per'] = np.array([8.0, 0.0, np.nan], dtype=np.float32)
+    columns['pbr'] = np.array([0.5, -1.0, np.nan], dtype=np.float32)
+    return columns
+
+
+def make_snapshot():
+    symbols = ['000001', '000002', '000003', '069500']
+    count = len(symbols)
+    snapshot = {name: np.full(count, 1000, dtype=np.int64)
+                for name in ('open', 'high', 'low', 'close', 'volume', 'value', 'market_cap')}
+    snapshot.update({
+        'date': np.array('20261016'),
+        'symbol': np.array(symbols, dtype='U12'),
+        'market': np.array(['KOSPI', 'KOSPI', 'KOSDAQ', 'ETF'], dtype='U6'),
+        'change_pct': np.zeros(count),
+    })
+    return snapshot
+
+
+def test_align_leaves_missing_symbols_unknown():
+    aligned = align(make_fundamentals(), np.array(['000001', '000004'], dtype='U12'))
+    assert aligned['per'][0] == 8.0
+    assert np.isnan(aligned['per'][1])
+    assert all(np.isnan(values).all() for values in align(None, np.array(['000001'])).values())
+
+
+def test_quote_fields_emit_null_for_missing_values():
+    columns = make_fundamentals()
+    assert quote_fields(columns, '000001')['per'] == 8.0
+    fields = quote_fields(columns, '000003')
+    assert fields['per'] is None and fields['eps'] is None
+    assert quote_fields(columns, '999999') == {}
+
+
+def test_screener_treats_non_positive_ratios_as_unknown(monkeypatch):
+    monkeypatch.setattr(screener, 'load_snapshot', lambda date: None)
+    monkeypatch.setattr(screener, '_stats_for', lambda date: None)
+    monkeypatch.setattr(screener, 'stored_fundamentals', lambda date: make_fundamentals())
+    columns = screener.load_screen_columns(make_snapshot())
+
+    def matched(expression):
+        return [row['symbol'] for row in screener.screen(columns, expression)['data']]
+
+    assert matched('per < 10') == ['000001']
+    assert matched('not per < 10') == []
+    assert matched('pbr < 1') == ['000001']
+    assert matched('eps > 0') == ['000001', '000002']
@@ -0,0 +1,58 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import investor_flow
+from investor_flow import INVESTORS, fetch_investor_flow, flow_slice
+from market_snapshot import is_final
+
+
+def market_columns(symbols, market, value=100):
+    columns = {
+        'symbol': np.array(symbols, dtype='U12'),
+        'market': np.full(len(symbols), market, dtype='U6'),
+    }
+    for prefix in INVESTORS:
+        columns[f"{prefix}_net_value"] = np.full(len(symbols), value, dtype=np.int64)
+        columns[f"{prefix}_net_volume"] = np.full(len(symbols), 1, dtype=np.int64)
+    return columns
+
+
+@pytest.fixture
+def fake_pykrx(monkeypatch):
+    module = types.ModuleType('pykrx')
+    module.stock = object()
+    monkeypatch.setitem(sys.modules, 'pykrx', module)
+
+
+def test_failed_market_makes_flow_partial(monkeypatch, fake_pykrx):
+    def fake_market_columns(stock, date, market):
+        if market == 'KOSDAQ':
+            raise Exception('timeout')
+        return market_columns(['000002', '000001'] if market == 'KOSPI' else ['000003'], market)
+
+    monkeypatch.setattr(investor_flow, '_market_columns', fake_market_columns)
+    columns = fetch_investor_flow('20261016')
+
+    assert columns['symbol'].tolist() == ['000001', '000002', '000003']
+    assert bool(columns['partial'])
+    assert not is_final(columns)
+
+
+def test_complete_flow_is_not_partial(monkeypatch, fake_pykrx):
+    monkeypatch.setattr(investor_flow, '_market_columns',
+                        lambda stock, date, market: market_columns([f"{market[:1]}00001"], market))
+    assert not bool(fetch_investor_flow('20261016')['partial'])
+
+
+def test_flow_slice_skips_unknown_symbols():
+    columns = market_columns(['000001', '000002'], 'KOSPI', value=-5)
+    columns['date'] = np.array('20261016')
+
+    sliced = flow_slice(columns, ['000002', '999999'])
+
+    assert list(sliced) == ['000002']
+    assert sliced['000002']['date'] == '20261016'
+    assert sliced['000002']['foreign'] == -5
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import numpy as np
+
+from market_hours import KST
+from market_snapshot import is_final, fill_change_pct
+
+
+def fetched(date, hour, minute, **extra):
+    moment = datetime.strptime(date, '%Y%m%d').replace(hour=hour, minute=minute, tzinfo=KST)
+    return {'date': np.array(date), 'fetched_at': np.array(moment.timestamp()), **extra}
+
+
+def test_is_final_after_close_settle():
+    assert not is_final(fetched('20261016', 15, 39))
+    assert is_final(fetched('20261016', 15, 40))
+
+
+def test_partial_snapshot_is_not_final():
+    assert not is_final(fetched('20261016', 18, 0, partial=np.array(True)))
+    assert is_final(fetched('20261016', 18, 0, partial=np.array(False)))
+
+
+def test_fill_change_pct_uses_previous_close():
+    snapshot = {
+        'symbol': np.array(['000001', '069500', '069600'], dtype='U12'),
+        'close': np.array([110, 105, 50]),
+        'change_pct': np.array([10.0, np.nan, np.nan]),
+    }
+    previous = {
+        'symbol': np.array(['069500', '000001'], dtype='U12'),
+        'close': np.array([100, 100]),
+    }
+    change = fill_change_pct(snapshot, previous)
+    assert change[:2].tolist() == [10.0, 5.0]
+    # 직전 종가가 없는 종목은 모름(NaN) - 0 으로 채우지 않음
+    assert np.isnan(change[2])
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from price_alerts import SortedBook, AlertIndex, process_prices, ABOVE, BELOW, REARM_GAP
+
+
+def test_sorted_book_keeps_order_and_pops_ranges():
+    book = SortedBook()
+    for key, alert_id in [(30, 'c'), (10, 'a'), (20, 'b'), (20, 'b2')]:
+        book.insert(key, alert_id)
+    assert book.keys == [10, 20, 20, 30]
+    assert book.remove(20, 'b2') and not book.remove(20, 'missing')
+    assert book.pop_prefix(1) == [(10, 'a')]
+    assert book.pop_suffix(1) == [(30, 'c')]
+    assert list(zip(book.keys, book.ids)) == [(20, 'b')]
+
+
+def test_above_alert_fires_once_and_rearms_after_gap():
+    index = AlertIndex()
+    index.upsert(1, 'A', ABOVE, 100.0, True)
+
+    assert index.evaluate({'A': 99}) == ([], [])
+    assert index.evaluate({'A': 100}) == ([(1, 100)], [])
+    # 임계값 위에 머무르거나 재무장 가격까지 내려오지 않으면 다시 발동하지 않음
+    assert index.evaluate({'A': 101}) == ([], [])
+    assert index.evaluate({'A': 100 * (1 - REARM_GAP)}) == ([], [])
+    assert index.evaluate({'A': 98}) == ([], [1])
+    assert index.evaluate({'A': 100}) == ([(1, 100)], [])
+
+
+def test_below_alert_and_unchanged_price_is_skipped():
+    index = AlertIndex()
+    index.upsert(1, 'A', BELOW, 50.0, True)
+    assert index.evaluate({'A': 50}) == ([(1, 50)], [])
+    index.upsert(2, 'A', BELOW, 40.0, True)
+    # 알림이 바뀐 종목은 같은 가격이라도 다시 평가
+    assert index.evaluate({'A': 50}) == ([], [])
+    assert index.evaluate({'A': 50}) == ([], [])
+    assert index.evaluate({'A': 39}) == ([(2, 39)], [])
+
+
+def test_matches_brute_force():
+    rng = random.Random(7)
+    index = AlertIndex()
+    state = {}
+    for alert_id in range(200):
+        direction = rng.choice((ABOVE, BELOW))
+        threshold = float(rng.randint(50, 150))
+        index.upsert(alert_id, 'A', direction, threshold, True)
+        state[alert_id] = (direction, threshold, True)
+
+    for _ in range(300):
+        price = rng.randint(40, 160)
+        expected_fired, expected_rearmed = set(), set()
+        for alert_id, (direction, threshold, armed) in state.items():
+            if armed and (price >= threshold if direction == ABOVE else price <= threshold):
+                expected_fired.add(alert_id)
+                state[alert_id] = (direction, threshold, False)
+            elif not armed and (price < threshold * (1 - REARM_GAP) if direction == ABOVE
+                                else price > threshold * (1 + REARM_GAP)):
+                expected_rearmed.add(alert_id)
+                state[alert_id] = (direction, threshold, True)
+        index.last_prices.clear()
+        fired, rearmed = index.evaluate({'A': price})
+        assert {alert_id for alert_id, _ in fired} == expected_fired
+        assert set(rearmed) == expected_rearmed
+
+
+class FailingConnection:
+    def __init__(self):
+        self.rolled_back = False
+
+    def cursor(self):
+        raise RuntimeError('database unavailable')
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def test_failed_db_write_restores_index():
+    index = AlertIndex()
+    index.upsert(1, 'A', ABOVE, 100.0, True)
+    index.upsert(2, 'A', BELOW, 50.0, False)
+    conn = FailingConnection()
+
+    with pytest.raises(RuntimeError):
+        process_prices(index, conn, {'A': 120})
+
+    assert conn.rolled_back
+    assert index.alerts[1][3] is True and index.alerts[2][3] is False
+    # 다음 주기에 같은 가격으로 다시 평가되어 발동/재무장
+    assert index.evaluate({'A': 120}) == ([(1, 120)], [2])
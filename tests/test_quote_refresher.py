@@ -0,0 +1,48 @@
+import threading
+import time
+
+import quote_refresher
+
+
+def test_refresh_fetches_concurrently(monkeypatch):
+    threads = set()
+
+    def fake_info(symbol, use_cache=True):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.05)
+        return {'success': symbol != '900003', 'error': 'no data'}
+
+    monkeypatch.setattr(quote_refresher, 'get_korean_stock_info', fake_info)
+    symbols = [f"90000{i}" for i in range(1, 9)]
+    started = time.time()
+    assert quote_refresher.refresh(symbols) == (7, 1, 0)
+    assert len(threads) > 1
+    assert time.time() - started < 0.05 * len(symbols)
+
+
+def test_refresh_skips_symbols_after_deadline(monkeypatch):
+    fetched = []
+
+    def fake_info(symbol, use_cache=True):
+        fetched.append(symbol)
+        time.sleep(0.1)
+        return {'success': True}
+
+    monkeypatch.setattr(quote_refresher, 'get_korean_stock_info', fake_info)
+    monkeypatch.setattr(quote_refresher, 'REFRESH_WORKERS', 2)
+    symbols = [f"90000{i}" for i in range(1, 9)]
+    ok, failed, skipped = quote_refresher.refresh(symbols, deadline=time.time() + 0.15)
+    assert ok + skipped == len(symbols) and failed == 0
+    assert 0 < skipped < len(symbols)
+    # 우선순위가 높은(앞쪽) 종목부터 조회
+    assert sorted(fetched) == symbols[:len(fetched)]
+
+
+def test_run_cycle_warns_when_past_ttl(monkeypatch, capsys):
+    monkeypatch.setattr(quote_refresher, 'INTRADAY_TTL', 0.01)
+    monkeypatch.setattr(quote_refresher, 'load_watched_symbols', lambda alerts: [('900001', 1)])
+    monkeypatch.setattr(quote_refresher, 'select_due', lambda watched, lead, limit: ['900001'])
+    monkeypatch.setattr(quote_refresher, 'refresh', lambda due, deadline: time.sleep(0.02) or (1, 0, 0))
+    stats = quote_refresher.run_cycle()
+    assert stats['refreshed'] == 1
+    assert 'TTL' in capsys.readouterr().err
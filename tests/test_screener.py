@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from screener import screen, ScreenerError, SCREEN_COLUMNS
+
+
+def make_columns():
+    symbols = ['000001', '000002', '000003', '069500']
+    count = len(symbols)
+    columns = {name: np.zeros(count) for name in SCREEN_COLUMNS}
+    columns.update({
+        'date': '20261016',
+        'symbol': np.array(symbols, dtype='U12'),
+        'market': np.array(['KOSPI', 'KOSDAQ', 'KOSPI', 'ETF'], dtype='U6'),
+        'price': np.array([1000.0, 2000.0, 3000.0, 4000.0]),
+        'change_pct': np.array([5.0, -2.0, 0.0, np.nan]),
+        'market_cap': np.array([4e12, 3e12, 2e12, 1e12]),
+        'per': np.array([8.0, 25.0, np.nan, np.nan]),
+    })
+    return columns
+
+
+def symbols(result):
+    return [row['symbol'] for row in result['data']]
+
+
+def test_filter_and_sort():
+    result = screen(make_columns(), "market == 'KOSPI' and change_pct >= 0", sort='-price')
+    assert symbols(result) == ['000003', '000001']
+    assert result['total'] == 2
+
+
+def test_unknown_values_match_neither_side():
+    columns = make_columns()
+    assert symbols(screen(columns, 'change_pct > 1')) == ['000001']
+    assert symbols(screen(columns, 'not change_pct > 1')) == ['000002', '000003']
+    assert symbols(screen(columns, 'change_pct != 0')) == ['000001', '000002']
+    assert symbols(screen(columns, 'per < 10')) == ['000001']
+
+
+def test_unknown_values_emit_null():
+    row = screen(make_columns(), "market == 'ETF'")['data'][0]
+    assert row['changePercent'] is None
+    assert row['per'] is None
+
+
+def test_in_and_arithmetic():
+    columns = make_columns()
+    assert symbols(screen(columns, "market in ('KOSDAQ', 'ETF')", sort='market_cap')) == ['069500', '000002']
+    assert symbols(screen(columns, 'price * 2 > 5000')) == ['000003', '069500']
+
+
+@pytest.mark.parametrize('expression', [
+    "__import__('os').system('true')",
+    'price.real > 0',
+    'unknown_column > 1',
+    'price > 0 if True else False',
+    '[x for x in price]',
+    'lambda: 1',
+    'price ** 2 > 1',
+    'price > 0 is True',
+    "market > 1",
+    'price >',
+])
+def test_rejects_disallowed_expressions(expression):
+    with pytest.raises(ScreenerError):
+        screen(make_columns(), expression)
+
+
+def test_rejects_unknown_sort_column():
+    with pytest.raises(ScreenerError):
+        screen(make_columns(), None, sort='-symbol')
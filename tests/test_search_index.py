@@ -0,0 +1,70 @@
+import pytest
+
+import search_index
+from search_index import (to_jamo, chosung_key, roman_key, single_deletes, within_one_edit,
+                          build_search_index, fuzzy_search, key_search)
+
+STOCKS = [
+    {'symbol': '005930', 'name': '삼성전자', 'market': 'KOSPI', 'search_keywords': ['삼전']},
+    {'symbol': '000660', 'name': 'SK하이닉스', 'market': 'KOSPI'},
+    {'symbol': '006400', 'name': '삼성SDI', 'market': 'KOSPI'},
+    {'symbol': '035720', 'name': '카카오', 'market': 'KOSPI'},
+]
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(search_index, 'SEARCH_INDEX_PATH', str(tmp_path / 'search_index.db'))
+    monkeypatch.setattr(search_index, 'SEARCH_RANKS_PATH', str(tmp_path / 'search_ranks.json'))
+    search_index.reload()
+    build_search_index(STOCKS)
+    yield
+    search_index.reload()
+
+
+def test_to_jamo_splits_syllables_and_keeps_other_chars():
+    assert to_jamo('삼성') == 'ㅅㅏㅁㅅㅓㅇ'
+    assert to_jamo('SK하') == 'SKㅎㅏ'
+
+
+def test_name_keys():
+    assert chosung_key('SK하이닉스') == 'ㅎㅇㄴㅅ'
+    assert roman_key('삼성전자') == 'samsunkjunja'
+
+
+def test_single_deletes_includes_term():
+    assert single_deletes('abc') == {'abc', 'bc', 'ac', 'ab'}
+
+
+@pytest.mark.parametrize('a, b, expected', [
+    ('abcd', 'abcd', True),
+    ('abcd', 'abxd', True),   # 치환
+    ('abcd', 'abd', True),    # 삭제
+    ('abd', 'abcd', True),    # 삽입
+    ('abcd', 'acbd', True),   # 인접 전치
+    ('abcd', 'badc', False),
+    ('abcd', 'ab', False),
+    ('abcd', 'xbcy', False),
+])
+def test_within_one_edit(a, b, expected):
+    assert within_one_edit(a, b) is expected
+
+
+def test_fuzzy_search_finds_one_jamo_typo(index):
+    assert [row['symbol'] for row in fuzzy_search('삼성전지')] == ['005930']
+
+
+def test_fuzzy_search_skips_exact_and_excluded(index):
+    # 정확히 같은 단어는 앞선 검색 단계에서 찾으므로 제외
+    assert fuzzy_search('삼성전자') == []
+    assert fuzzy_search('삼성전지', exclude=['005930']) == []
+
+
+def test_fuzzy_search_ignores_short_queries(index):
+    assert fuzzy_search('카') == []
+
+
+def test_key_search_by_chosung_and_roman(index):
+    assert [row['symbol'] for row in key_search('ㅅㅅㅈㅈ')] == ['005930']
+    assert {row['symbol'] for row in key_search('samsung')} == {'005930', '006400'}
+    assert key_search('samsung', market='KOSDAQ') == []
@@ -0,0 +1,59 @@
+import pytest
+
+import fetch_all_stocks
+from fetch_all_stocks import search_stocks
+
+
+def stock(symbol, name, keywords=()):
+    return {'symbol': symbol, 'name': name, 'market': 'KOSPI', 'search_keywords': list(keywords)}
+
+
+@pytest.fixture(autouse=True)
+def ranks(monkeypatch):
+    # 인기 점수: 종목코드 숫자가 클수록 인기 (후보를 보는 순서가 정해지도록)
+    monkeypatch.setattr(fetch_all_stocks, 'load_search_ranks',
+                        lambda: {f"{i:06d}": float(i) for i in range(1000)})
+    fetch_all_stocks._ranked_universes.clear()
+
+
+def test_exact_match_beats_popular_partial_matches():
+    stocks = [stock(f"{i:06d}", f"테스트{i}") for i in range(100, 120)] + [stock('000001', '테스트')]
+    results = search_stocks('테스트', stocks, limit=3)
+    assert results[0]['symbol'] == '000001'
+    # 나머지는 접두사 일치 중 인기 순
+    assert [row['symbol'] for row in results[1:]] == ['000119', '000118']
+
+
+def test_symbol_match_scores_above_name_match():
+    stocks = [stock('000500', '오백'), stock('000999', '종목000500호')]
+    assert search_stocks('000500', stocks, limit=2)[0]['symbol'] == '000500'
+
+
+def test_heap_early_exit_keeps_best_scores(monkeypatch):
+    stocks = [stock(f"{i:06d}", f"가나다{i}") for i in range(200, 500)]
+    offered = []
+    original = fetch_all_stocks.score_stock
+
+    def counting(query, normalized_query, entry):
+        offered.append(entry[0])
+        return original(query, normalized_query, entry)
+
+    monkeypatch.setattr(fetch_all_stocks, 'score_stock', counting)
+    results = search_stocks('가나다', stocks, limit=5)
+
+    # 모든 후보가 같은 최고 점수(접두사 80)이므로 인기 상위 5개에서 멈춤
+    assert [row['symbol'] for row in results] == ['000499', '000498', '000497', '000496', '000495']
+    assert len(offered) < len(stocks)
+
+
+def test_keyword_and_market_filter():
+    stocks = [stock('005930', '삼성전자', ['삼전']),
+              {**stock('069500', 'KODEX 200'), 'market': 'ETF'}]
+    assert [row['symbol'] for row in search_stocks('삼전', stocks)] == ['005930']
+    assert search_stocks('kodex', stocks, market='KOSPI') == []
+    assert [row['symbol'] for row in search_stocks('kodex', stocks, market='ETF')] == ['069500']
+
+
+def test_empty_queries():
+    assert search_stocks('', [stock('000001', 'a')]) == []
+    assert search_stocks('   ', [stock('000001', 'a')]) == []
@@ -0,0 +1,50 @@
+import threading
+
+import fetch_stock_data
+from fetch_stock_data import get_watchlist_board, QUOTE_NAMESPACE
+from shared_cache import get_shared_cache
+
+
+def fake_quote(symbol):
+    return {
+        'success': True,
+        'symbol': symbol,
+        'name': f"종목{symbol}",
+        'price': 1000,
+        'thread': threading.current_thread().name,
+        'extra_info': {},
+    }
+
+
+def test_board_misses_are_fetched_in_workers_and_cached(monkeypatch):
+    symbols = ['900001', '900002', '900003']
+    monkeypatch.setattr(fetch_stock_data, 'fetch_korean_stock_info', fake_quote)
+
+    board = get_watchlist_board([(symbol, None) for symbol in symbols])
+
+    assert [card['symbol'] for card in board['data']] == symbols
+    assert all(card['success'] for card in board['data'])
+    cached = get_shared_cache().get_many(QUOTE_NAMESPACE, symbols)
+    assert sorted(cached) == symbols
+    # 캐시에 없는 종목은 호출 스레드가 아닌 작업 스레드에서 조회됨
+    assert all(quote['thread'] != threading.current_thread().name for quote in cached.values())
+
+
+def test_shared_cache_usable_from_other_threads():
+    cache = get_shared_cache()
+    cache.set('test', 'main', {'value': 1}, 2e9)
+    errors = []
+
+    def worker():
+        try:
+            assert cache.get('test', 'main') == {'value': 1}
+            cache.set('test', 'worker', {'value': 2}, 2e9)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert errors == []
+    assert cache.get('test', 'worker') == {'value': 2}